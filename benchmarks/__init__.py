@@ -0,0 +1 @@
+# benchmark scripts package
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Infeasible cores from CP-SAT assumptions versus plain interval solves.
+
+For the first machine of each instance file, two walks are compared:
+
+* ``dfs``: the DFS enumeration with subtree pruning, as the runner does it.
+  DFS reaches a combo before all of its subsets, so a core smaller than the
+  combo could prune supersets the plain solver has to solve.
+* ``mis``: ``MisSearch`` with the same oracle; with cores, QuickXplain starts
+  from the core instead of the whole seed.
+
+Both walks use the pre-checks unless ``--no-prechecks``; only undecided combos
+reach a solver. Answers on combos visited by both variants are compared.
+Usage: python -m benchmarks.bench_cores --instances n15 n20 --max-size 6
+"""
+import argparse
+import os
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.solvers.assumptions import AssumptionModel
+from mis.strategies.combinations import dfs_order
+from mis.strategies.mis_search import MisSearch
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Assumption core benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n15', 'n20'])
+    parser.add_argument('--files', type=int, default=1, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=None)
+    parser.add_argument('--no-prechecks', action='store_true', help='every oracle call goes to the solver')
+    parser.add_argument('--walks', nargs='+', choices=['dfs', 'mis'], default=['dfs', 'mis'])
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    params = SolverParams(num_workers=1, random_seed=0)
+    solver = get_solver('interval', params)
+    print(f"{'instance':>16} {'walk':>4} {'variant':>11} {'visited':>8} {'solves':>7} {'smaller':>7} {'core/combo':>10} {'time':>8}")
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        for file in list_instances(inst_dir)[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            grid_size = min(L, W) / 10
+            keys = list(bins_info)
+            label = f"{name}/{file.split('#')[-1].split('.')[0]}"
+            for walk in args.walks:
+                answers = []
+                for variant in ('plain', 'assumptions'):
+                    model = AssumptionModel(L, W, bins_info, params) if variant == 'assumptions' else None
+                    stage = None if args.no_prechecks else Prechecks('interval', L, W, bins_info, grid_size)
+                    stats = {'solves': 0, 'smaller': 0, 'ratio': 0.0}
+                    seen = {}
+
+                    def oracle(combo):
+                        verdict = stage.check(combo) if stage is not None else None
+                        if verdict is not None:
+                            seen[tuple(combo)] = verdict[1]
+                            return verdict[1]
+                        stats['solves'] += 1
+                        if model is None:
+                            ok = solver.solve(L, W, [bins_info[k] for k in combo], grid_size)[0]
+                            seen[tuple(combo)] = ok
+                            return ok
+                        ok, _, core = model.solve(combo)
+                        seen[tuple(combo)] = ok
+                        if core is not None and len(core) < len(combo):
+                            stats['smaller'] += 1
+                            stats['ratio'] += len(core) / len(combo)
+                            return False, core
+                        return ok
+
+                    start = time.perf_counter()
+                    if walk == 'dfs':
+                        pruner = Pruner()
+                        visited = 0
+                        for combo in dfs_order(keys, max_size=args.max_size, prune=pruner.should_prune):
+                            visited += 1
+                            answer = oracle(combo)
+                            if isinstance(answer, tuple):
+                                pruner.add_failed(combo)
+                                pruner.add_failed(answer[1])
+                            elif answer is False:
+                                pruner.add_failed(combo)
+                    else:
+                        search = MisSearch(keys, oracle, max_size=args.max_size)
+                        search.run()
+                        visited = search.oracle_calls
+                    elapsed = time.perf_counter() - start
+                    answers.append(seen)
+                    ratio = f"{stats['ratio'] / stats['smaller']:.2f}" if stats['smaller'] else '-'
+                    print(f"{label:>16} {walk:>4} {variant:>11} {visited:>8} {stats['solves']:>7} {stats['smaller']:>7} "
+                          f"{ratio:>10} {elapsed:>7.2f}s", flush=True)
+                plain, cores = answers
+                if any(plain[c] is not None and cores[c] is not None and plain[c] != cores[c] for c in plain.keys() & cores.keys()):
+                    raise AssertionError(f"{label}: answers differ between plain solves and assumptions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Propagation strength and time of the disjunctive model, plain and enhanced
+(``SolverParams.enhanced_disjunctive``), against the interval model.
+
+Collects the combos that reach CP-SAT in a BFS walk with subtree pruning and
+pre-checks (first machine of each file) and solves each with every model on a
+single worker. Conflicts and branches of the infeasible combos show how much
+search the proofs need; model size is the mean constraint count. The answers
+of all models must agree.
+Usage: python -m benchmarks.bench_disjunctive --instances n15 n20 n30 --max-size 5
+"""
+import argparse
+import os
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.solvers.params import feasibility, make_cp_solver
+from mis.strategies.combinations import bfs_order
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+VARIANTS = [
+    ('interval', SolverParams(num_workers=1, random_seed=0)),
+    ('disjunctive', SolverParams(num_workers=1, random_seed=0)),
+    ('enhanced', SolverParams(num_workers=1, random_seed=0, enhanced_disjunctive=True)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Disjunctive model benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n15', 'n20', 'n30'])
+    parser.add_argument('--files', type=int, default=2, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=5)
+    parser.add_argument('--combos', type=int, default=300, help='solver combos kept per file (largest first)')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    print(f"{'suite':>6} {'model':>12} {'combos':>6} {'infeas':>6} {'constr':>7} {'time s':>7} {'infeas s':>8} "
+          f"{'conflicts':>9} {'branches':>9}")
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        reached = []
+        for file in list_instances(inst_dir)[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            grid_size = min(L, W) / 10
+            reference = get_solver('interval', VARIANTS[0][1])
+            stage = Prechecks('interval', L, W, bins_info, grid_size)
+            pruner = Pruner()
+            found = []
+            for combo in bfs_order(list(bins_info), max_size=args.max_size, prune=pruner.should_prune):
+                verdict = stage.check(combo)
+                if verdict is not None:
+                    feasible = verdict[1]
+                else:
+                    bins = [bins_info[k] for k in combo]
+                    feasible = reference.solve(L, W, bins, grid_size)[0]
+                    found.append((L, W, bins, feasible))
+                if feasible is False:
+                    pruner.add_failed(combo)
+            reached += sorted(found, key=lambda item: -len(item[2]))[:args.combos]
+
+        infeasible = sum(1 for *_, expected in reached if expected is False)
+        for label, params in VARIANTS:
+            solver = get_solver('disjunctive' if label == 'enhanced' else label, params)
+            constraints = 0
+            total = infeasible_time = 0.0
+            conflicts = branches = 0
+            for L, W, bins, expected in reached:
+                start = time.perf_counter()
+                model = solver.build(L, W, bins)[0]
+                cp_solver = make_cp_solver(params)
+                ok = feasibility(cp_solver.Solve(model))
+                elapsed = time.perf_counter() - start
+                if ok != expected:
+                    raise AssertionError(f"{name}: {label} says {ok} for {bins}")
+                constraints += len(model.Proto().constraints)
+                total += elapsed
+                if ok is False:
+                    infeasible_time += elapsed
+                    conflicts += cp_solver.NumConflicts()
+                    branches += cp_solver.NumBranches()
+            print(f"{name:>6} {label:>12} {len(reached):>6} {infeasible:>6} {constraints / max(len(reached), 1):>7.0f} "
+                  f"{total:>7.2f} {infeasible_time:>8.2f} {conflicts:>9} {branches:>9}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Combos inferred by part dominance versus solved, per instance.
+
+Walks the BFS layers with subtree pruning for the first machine of each file,
+asking in runner order: pruner, dominance (if on), pre-checks, solver. The walk
+runs once without and once with dominance; "solved" counts CP-SAT calls.
+With ``--verify`` every inferred combo is solved as well and the answers (and
+the remapped packings' bounds and overlaps) are checked.
+Usage: python -m benchmarks.bench_dominance --instances n20 n30 --max-size 5
+"""
+import argparse
+import os
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.strategies.combinations import bfs_order
+from mis.strategies.dominance import dominance_for
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+
+def _valid(L, W, bins, packing):
+    # every part inside the plate in some orientation, and no two overlapping
+    boxes = []
+    for i, (l, w) in enumerate(bins):
+        x, y = packing[i]
+        options = [(l, w), (w, l)]
+        fits = [(a, b) for a, b in options if x + a <= L + 1e-9 and y + b <= W + 1e-9]
+        if not fits:
+            return False
+        boxes.append((x, y, fits))
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            xi, yi, fi = boxes[i]
+            xj, yj, fj = boxes[j]
+            if all(xi < xj + bj - 1e-9 and xj < xi + ai - 1e-9 and yi < yj + dj - 1e-9 and yj < yi + ci - 1e-9
+                   for ai, ci in fi for bj, dj in fj):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Part dominance benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n20', 'n30'])
+    parser.add_argument('--solver', default='interval')
+    parser.add_argument('--files', type=int, default=3, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=5)
+    parser.add_argument('--verify', action='store_true', help='solve inferred combos too and compare')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    solver = get_solver(args.solver, SolverParams(num_workers=1, random_seed=0))
+    print(f"{'instance':>16} {'pairs':>5} {'visited':>8} {'solved':>7} {'time':>8} | {'visited':>8} {'inf. feas':>9} "
+          f"{'inf. infeas':>11} {'solved':>7} {'time':>8}")
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        for file in list_instances(inst_dir)[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            grid_size = min(L, W) / 10
+            keys = list(bins_info)
+            row = []
+            for use in (False, True):
+                dominance = dominance_for(args.solver, bins_info) if use else None
+                stage = Prechecks(args.solver, L, W, bins_info, grid_size)
+                pruner = Pruner()
+                visited = solved = 0
+                start = time.perf_counter()
+                for combo in bfs_order(keys, max_size=args.max_size, prune=pruner.should_prune):
+                    visited += 1
+                    bins = [bins_info[k] for k in combo]
+                    inferred = dominance.infer(combo) if dominance is not None else None
+                    if inferred is not None:
+                        feasible, packing, _ = inferred
+                        if args.verify:
+                            truth = solver.solve(L, W, bins, grid_size)[0]
+                            if truth is not None and truth != feasible:
+                                raise AssertionError(f"{file}: dominance says {feasible} for {combo}")
+                            if feasible and not _valid(L, W, bins, packing):
+                                raise AssertionError(f"{file}: remapped packing invalid for {combo}")
+                    else:
+                        verdict = stage.check(combo)
+                        if verdict is not None:
+                            _, feasible, packing = verdict
+                        else:
+                            solved += 1
+                            feasible, packing = solver.solve(L, W, bins, grid_size)
+                    if feasible is False:
+                        pruner.add_failed(combo)
+                        if dominance is not None:
+                            dominance.add_failed(combo)
+                    elif feasible and dominance is not None:
+                        dominance.add_feasible(combo, packing)
+                elapsed = time.perf_counter() - start
+                row.append((visited, solved, elapsed, dominance))
+            (v0, s0, t0, _), (v1, s1, t1, dom) = row
+            pairs = sum(bin(m).count('1') - 1 for m in dom.up)
+            label = f"{name}/{file.split('#')[-1].split('.')[0]}"
+            print(f"{label:>16} {pairs:>5} {v0:>8} {s0:>7} {t0:>7.2f}s | {v1:>8} {dom.inferred_feasible:>9} "
+                  f"{dom.inferred_infeasible:>11} {s1:>7} {t1:>7.2f}s", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Combo export throughput of ``task/export_combos.py`` per output format.
+
+json writes one indented instance file per combo, misb one batch per instance
+(built in memory), pack one bitmask row per combo streamed to a ``.mcp`` file
+(optionally one file per combo size). Reports combos/s, files and bytes, and
+for packs the time to decode every row back into keys.
+Usage: python -m benchmarks.bench_export --instances n15 --max-size 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from mis.io.reader import ComboPack
+from task.export_combos import export_combos
+
+FORMATS = [('json', False), ('misb', False), ('pack', False), ('pack', True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Combo export benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n15'])
+    parser.add_argument('--max-size', type=int, default=5)
+    parser.add_argument('--strategy', choices=['bfs', 'dfs', 'all'], default='bfs')
+    parser.add_argument('--skip-json', action='store_true', help='the json exporter is slow for large sizes')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, shard in FORMATS:
+            if fmt == 'json' and args.skip_json:
+                continue
+            label = fmt + (' (by size)' if shard else '')
+            out = os.path.join(tmp, label.replace(' ', '_'))
+            start = time.perf_counter()
+            count = export_combos(args.instances, args.strategy, args.max_size, out, fmt, shard)
+            secs = time.perf_counter() - start
+            paths = [os.path.join(d, n) for d, _, names in os.walk(out) for n in names]
+            size = sum(os.path.getsize(p) for p in paths)
+            decode = None
+            if fmt == 'pack':
+                start = time.perf_counter()
+                assert sum(1 for p in paths for _ in ComboPack(p)) == count
+                decode = time.perf_counter() - start
+            rows.append((label, count, secs, len(paths), size, decode))
+
+    print(f"Combo export of {' '.join(args.instances)} ({args.strategy}, up to {args.max_size} items)")
+    print(f"{'format':>15} {'combos':>9} {'time':>8} {'combos/s':>10} {'files':>7} {'bytes':>10} {'decode':>8}")
+    for label, count, secs, files, size, decode in rows:
+        dec = f"{decode:>7.2f}s" if decode is not None else f"{'-':>8}"
+        print(f"{label:>15} {count:>9} {secs:>7.2f}s {count / secs:>10.0f} {files:>7} {size / 2 ** 20:>8.2f}MB {dec}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Load time and disk footprint of JSON instances versus ``.misb`` batches.
+
+Two data sets: the whole ``TestInstances`` tree (one batch per folder, as
+``main.py prepare --format misb`` writes) and the combo exports of
+``task/export_combos.py`` in both formats. "On disk" counts allocated blocks,
+which is what hundreds of thousands of small files really cost.
+Usage: python -m benchmarks.bench_formats --instances n15 --max-size 5
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from main import pack_prepared
+from mis.io import reader
+from task.export_combos import export_combos
+from utils.tools import json_read
+
+
+def _footprint(root: str, suffix: str) -> Tuple[int, int, int]:
+    files = size = blocks = 0
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(suffix):
+                st = os.stat(os.path.join(dirpath, name))
+                files += 1
+                size += st.st_size
+                blocks += st.st_blocks * 512
+    return files, size, blocks
+
+
+def _load_json(root: str) -> Tuple[int, float]:
+    paths = [os.path.join(d, n) for d, _, names in os.walk(root) for n in names if n.endswith('.json')]
+    start = time.perf_counter()
+    count = sum(1 for p in paths if json_read(p) is not None)
+    return count, time.perf_counter() - start
+
+
+def _load_misb(root: str) -> Tuple[int, float]:
+    reader._BATCHES.clear()
+    paths = [os.path.join(d, n) for d, _, names in os.walk(root) for n in names if n.endswith('.misb')]
+    start = time.perf_counter()
+    count = 0
+    for p in paths:
+        for _ in reader.open_batch(p):
+            count += 1
+    return count, time.perf_counter() - start
+
+
+def _report(label: str, rows: List[Tuple[str, Tuple[int, int, int], Tuple[int, float]]]) -> None:
+    print(label)
+    print(f"{'format':>7} {'files':>8} {'instances':>10} {'bytes':>10} {'on disk':>10} {'load':>9} {'per inst':>9}")
+    for fmt, (files, size, blocks), (count, secs) in rows:
+        print(f"{fmt:>7} {files:>8} {count:>10} {size / 2 ** 20:>8.2f}MB {blocks / 2 ** 20:>8.2f}MB "
+              f"{secs:>8.3f}s {1e6 * secs / max(count, 1):>7.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Instance format benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n15'], help='folders whose combos are exported')
+    parser.add_argument('--max-size', type=int, default=5)
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    tree = os.path.join(base_dir, 'TestInstances')
+    with tempfile.TemporaryDirectory() as tmp:
+        packed = os.path.join(tmp, 'tree')
+        pack_prepared(tree, packed)
+        _report('TestInstances tree', [
+            ('json', _footprint(tree, '.json'), _load_json(tree)),
+            ('misb', _footprint(packed, '.misb'), _load_misb(packed)),
+        ])
+
+        rows = []
+        for fmt in ('json', 'misb'):
+            out = os.path.join(tmp, f'combos_{fmt}')
+            start = time.perf_counter()
+            export_combos(args.instances, 'bfs', args.max_size, out, fmt)
+            print(f"  export {fmt}: {time.perf_counter() - start:.2f}s")
+            loader = _load_json if fmt == 'json' else _load_misb
+            rows.append((fmt, _footprint(out, '.' + fmt), loader(out)))
+        _report(f"Combo exports of {' '.join(args.instances)} (bfs, up to {args.max_size} items)", rows)
+
+
+if __name__ == '__main__':
+    main()
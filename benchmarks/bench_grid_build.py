@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Grid model build time: Dot-object geometry vs. the NumPy mask geometry.
+
+Both builders must produce the same CP-SAT model proto.
+Usage: python -m benchmarks.bench_grid_build --grids 1 0.5 0.25
+"""
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from ortools.sat.python import cp_model
+
+from mis.solvers.grid import GridSolver
+from mis.utils.geometry import discretize_platform, get_inner_fit_polygon, get_Phi_jd
+
+
+def legacy_build(L: float, W: float, bins: List[Tuple[float, float]], grid_size: float) -> cp_model.CpModel:
+    # The pre-NumPy GridSolver model build, kept here as the baseline.
+    dots = discretize_platform(L, W, grid_size)
+    inner_fit_polygons = {j: get_inner_fit_polygon(dots, l, w, L, W) for j, (l, w) in enumerate(bins)}
+    model = cp_model.CpModel()
+    J = list(range(len(bins)))
+    status_list = [-1] + J
+
+    Gamma: Dict[int, set] = {}
+    for d in dots:
+        Gamma[d.ID] = set()
+        for bin_id, poly in inner_fit_polygons.items():
+            if d.ID in [p.ID for p in poly]:
+                Gamma[d.ID].add(bin_id)
+
+    gamma = {}
+    for d in dots:
+        for s in status_list:
+            gamma[d.ID, s] = model.NewBoolVar(f"gamma_d{d.ID}_s{s}")
+    for j in J:
+        model.add_exactly_one(gamma[d.ID, j] for d in dots)
+    for d in dots:
+        model.add(sum(gamma[d.ID, j] for j in J + [-1]) == 1)
+        model.add(sum(gamma[d.ID, j] for j in list(Gamma[d.ID]) + [-1]) == 1)
+
+    Phi = {}
+    for d in dots:
+        for j in J:
+            Phi[j, d.ID] = list(get_Phi_jd(dots, bins, j, d))
+    for d in dots:
+        for j in J:
+            for dd in dots:
+                if d.ID != dd.ID and dd.ID in Phi[j, d.ID]:
+                    model.AddImplication(gamma[d.ID, j], gamma[dd.ID, -1])
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Grid model build benchmark on a 10x10 plate')
+    parser.add_argument('--grids', nargs='+', type=float, default=[1.0, 0.5, 0.25])
+    parser.add_argument('--parts', type=int, default=3, help='number of items in the combination')
+    parser.add_argument('--skip-legacy-below', type=float, default=0.0,
+                        help='do not time the legacy builder for grid sizes smaller than this')
+    args = parser.parse_args()
+
+    L, W = 10.0, 10.0
+    pool = [(3.3, 6.0), (5.0, 3.0), (2.5, 2.5), (4.0, 1.5), (1.0, 2.0), (3.0, 3.0)]
+    bins = [pool[i % len(pool)] for i in range(args.parts)]
+
+    print(f"{'grid':>6} {'dots':>6} {'legacy build':>13} {'numpy build':>12} {'speedup':>8} same-proto")
+    for g in args.grids:
+        t0 = time.perf_counter()
+        model, _, X, _ = GridSolver().build(L, W, bins, g)
+        new_t = time.perf_counter() - t0
+        if g < args.skip_legacy_below:
+            print(f"{g:>6} {len(X):>6} {'-':>13} {new_t:>11.3f}s {'-':>8} -")
+            continue
+        t0 = time.perf_counter()
+        legacy = legacy_build(L, W, bins, g)
+        old_t = time.perf_counter() - t0
+        same = str(legacy.Proto()) == str(model.Proto())
+        print(f"{g:>6} {len(X):>6} {old_t:>12.3f}s {new_t:>11.3f}s {old_t / new_t:>7.1f}x {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Cross-check GridCompactSolver against GridSolver and report model size/time.
+
+Every packing returned by either model is checked for overlaps. The original
+grid model forbids only the positions overlapped by all other bins, so with
+three or more bins it can accept overlapping layouts; such disagreements are
+reported separately from genuine mismatches.
+
+Usage: python -m benchmarks.bench_grid_compact --instances n15 --grid 1 --max-size 4
+"""
+import argparse
+import itertools
+import os
+import random
+import time
+from typing import Dict, List, Tuple
+
+from mis.io.reader import read_instance
+from mis.solvers import get_solver
+
+
+def packing_overlaps(bins: List[Tuple[float, float]], packing: Dict[int, List[float]]) -> bool:
+    for i, j in itertools.combinations(range(len(bins)), 2):
+        (xi, yi), (xj, yj) = packing[i], packing[j]
+        (li, wi), (lj, wj) = bins[i], bins[j]
+        if xi < xj + lj and xj < xi + li and yi < yj + wj and yj < yi + wi:
+            return True
+    return False
+
+
+def model_size(model) -> Tuple[int, int]:
+    proto = model.Proto()
+    return len(proto.variables), len(proto.constraints)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='grid vs grid-compact cross-check')
+    parser.add_argument('--instances', default='n15', help='subfolder of TestInstances')
+    parser.add_argument('--grid', type=float, default=1.0)
+    parser.add_argument('--max-size', type=int, default=4)
+    parser.add_argument('--samples', type=int, default=20, help='random combos per instance and size')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    inst_dir = os.path.join(base_dir, 'TestInstances', args.instances)
+    rng = random.Random(args.seed)
+    solvers = {name: get_solver(name) for name in ('grid', 'grid-compact')}
+
+    totals = {name: {'build': 0.0, 'solve': 0.0, 'vars': 0, 'cons': 0} for name in solvers}
+    agree = relaxed = mismatch = checked = 0
+    for file in sorted(os.listdir(inst_dir)):
+        result = read_instance(os.path.join(inst_dir, file))
+        if result is None:
+            continue
+        _, machines_info, bins_info = result
+        _, L, W = machines_info[0]
+        keys = list(bins_info.keys())
+        for size in range(2, args.max_size + 1):
+            for _ in range(args.samples):
+                bins = [bins_info[k] for k in rng.sample(keys, size)]
+                answers = {}
+                for name, solver in solvers.items():
+                    t0 = time.perf_counter()
+                    model = solver.build(L, W, bins, args.grid)[0]
+                    t1 = time.perf_counter()
+                    ok, packing = solver.solve(L, W, bins, grid_size=args.grid)
+                    t2 = time.perf_counter()
+                    nv, nc = model_size(model)
+                    totals[name]['build'] += t1 - t0
+                    totals[name]['solve'] += t2 - t1
+                    totals[name]['vars'] += nv
+                    totals[name]['cons'] += nc
+                    answers[name] = (ok, packing)
+                checked += 1
+                (g_ok, g_pack), (c_ok, c_pack) = answers['grid'], answers['grid-compact']
+                if c_ok and packing_overlaps(bins, c_pack):
+                    raise AssertionError(f"grid-compact returned an overlapping packing for {bins}")
+                if g_ok == c_ok:
+                    agree += 1
+                elif g_ok and packing_overlaps(bins, g_pack):
+                    relaxed += 1
+                else:
+                    mismatch += 1
+                    print(f"MISMATCH {file} L={L} W={W} bins={bins}: grid={g_ok} grid-compact={c_ok}")
+
+    print(f"{checked} combos: {agree} agree, {relaxed} grid-only 'feasible' with overlapping packing, {mismatch} mismatches")
+    for name, t in totals.items():
+        print(f"{name:>12}: avg vars {t['vars'] / checked:9.0f}  avg constraints {t['cons'] / checked:9.0f}  "
+              f"build {t['build']:7.2f}s  build+solve {t['solve']:7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
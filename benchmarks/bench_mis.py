@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Oracle calls of the MIS search versus subset enumeration.
+
+For the first machine of each instance file, the enumeration walks the BFS
+layers with subtree pruning (the cheapest exhaustive mode of the runner) and
+reads the MIS off the pruner; ``MisSearch`` gets the same oracle. Both lists are
+compared. ``--plate-scale`` enlarges the plate: the enumeration has to visit
+every feasible subset (2^|MSS| per maximal feasible set), the search each
+maximal set once. Above ``--enumerate-up-to`` subsets only the search runs, next to
+the 2^n subsets it replaces; ``--time-limit`` bounds it (then "done" is no).
+Usage: python -m benchmarks.bench_mis --instances n15 n30 n40 --time-limit 600
+"""
+import argparse
+import math
+import os
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.strategies.combinations import bfs_order
+from mis.strategies.mis_search import MisSearch
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MIS search benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n15', 'n30', 'n40'])
+    parser.add_argument('--solver', default='interval')
+    parser.add_argument('--files', type=int, default=1, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=None)
+    parser.add_argument('--shrink', choices=['quickxplain', 'deletion'], default='quickxplain')
+    parser.add_argument('--no-prechecks', action='store_true', help='every oracle call goes to the solver')
+    parser.add_argument('--enumerate-up-to', type=int, default=2 ** 22, help='skip the enumeration above this many subsets')
+    parser.add_argument('--time-limit', type=float, default=None, help='seconds per MIS search')
+    parser.add_argument('--plate-scale', type=float, default=1.0,
+                        help='scale the plate: larger plates give larger maximal feasible sets')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    solver = get_solver(args.solver, SolverParams(num_workers=1, random_seed=0))
+    print(f"{'instance':>16} {'n':>3} {'subsets':>12} {'enum calls':>10} {'solver':>7} {'mis calls':>9} {'solver':>7} "
+          f"{'MIS':>6} {'MSS':>6} {'done':>5} {'enum s':>8} {'mis s':>7}")
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        for file in list_instances(inst_dir)[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            L, W = L * args.plate_scale, W * args.plate_scale
+            grid_size = min(L, W) / 10
+            keys = list(bins_info)
+            stage = None if args.no_prechecks else Prechecks(args.solver, L, W, bins_info, grid_size)
+            counts = {'solver': 0}
+
+            def oracle(combo):
+                verdict = stage.check(combo) if stage is not None else None
+                if verdict is not None:
+                    return verdict[1]
+                counts['solver'] += 1
+                return solver.solve(L, W, [bins_info[k] for k in combo], grid_size)[0]
+
+            n = len(keys)
+            top = n if args.max_size is None else min(args.max_size, n)
+            subsets = sum(math.comb(n, r) for r in range(1, top + 1))
+
+            enum_calls, enum_solver, enum_time, enum_mis = '-', '-', None, None
+            if subsets <= args.enumerate_up_to:
+                start = time.perf_counter()
+                pruner = Pruner()
+                enum_calls = 0
+                for combo in bfs_order(keys, min_size=1, max_size=top, prune=pruner.should_prune):
+                    enum_calls += 1
+                    if oracle(combo) is False:
+                        pruner.add_failed(combo)
+                enum_time = time.perf_counter() - start
+                enum_solver = counts['solver']
+                enum_mis = sorted(sorted(s, key=keys.index) for s in pruner.failed)
+
+            counts['solver'] = 0
+            start = time.perf_counter()
+            search = MisSearch(keys, oracle, max_size=args.max_size, shrink=args.shrink, time_limit=args.time_limit)
+            mis, mss = search.run()
+            mis_time = time.perf_counter() - start
+            if enum_mis is not None and sorted(mis) != enum_mis:
+                raise AssertionError(f"MIS of {file} differ from the enumeration")
+
+            label = f"{name}/{file.split('#')[-1].split('.')[0]}"
+            enum_s = f"{enum_time:>7.2f}s" if enum_time is not None else f"{'-':>8}"
+            print(f"{label:>16} {n:>3} {subsets:>12} {enum_calls:>10} {enum_solver:>7} {search.oracle_calls:>9} {counts['solver']:>7} "
+                  f"{len(mis):>6} {len(mss):>6} {'yes' if search.complete else 'no':>5} {enum_s} {mis_time:>6.2f}s", flush=True)
+
+
+if __name__ == '__main__':
+    main()
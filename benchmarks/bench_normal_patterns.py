@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Full grid vs normal-pattern candidate positions for the two grid models.
+
+Random combos of TestInstances are solved on each grid with and without
+``normal_patterns``. grid-compact must give the same answer either way; the
+grid relaxation may only turn "feasible" into "infeasible" (its normal-pattern
+answer lies between the exact one and the full-grid relaxation).
+Usage: python -m benchmarks.bench_normal_patterns --instances n15 n20 --grids 1 0.5 0.25
+"""
+import argparse
+import os
+import random
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.utils.grid_geometry import discretize_axes, normal_axes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Normal-pattern discretisation benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n15', 'n20'])
+    parser.add_argument('--grids', nargs='+', type=float, default=[1.0, 0.5, 0.25])
+    parser.add_argument('--solvers', nargs='+', default=['grid-compact', 'grid'])
+    parser.add_argument('--min-size', type=int, default=2)
+    parser.add_argument('--max-size', type=int, default=4)
+    parser.add_argument('--samples', type=int, default=5, help='random combos per instance file and size')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    rng = random.Random(args.seed)
+    combos = []
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        for file in list_instances(inst_dir):
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            keys = list(bins_info)
+            for size in range(args.min_size, args.max_size + 1):
+                for _ in range(args.samples):
+                    combos.append((L, W, [bins_info[k] for k in rng.sample(keys, size)]))
+
+    print(f"{len(combos)} combos")
+    print(f"{'solver':>12} {'grid':>5} {'dots':>8} {'normal':>8} {'full s':>8} {'normal s':>8} {'feasible':>9} "
+          f"{'diff':>4} {'undec':>5}")
+    for solver_name in args.solvers:
+        full = get_solver(solver_name, SolverParams(num_workers=1, random_seed=0))
+        normal = get_solver(solver_name, SolverParams(num_workers=1, random_seed=0, normal_patterns=True))
+        for g in args.grids:
+            dots = reduced = 0
+            times = [0.0, 0.0]
+            feasible = [0, 0]
+            differ = undecided = 0
+            for L, W, bins in combos:
+                xs, ys = discretize_axes(L, W, g)
+                nx, ny = normal_axes(L, W, bins, g)
+                dots += len(xs) * len(ys)
+                reduced += len(nx) * len(ny)
+                answers = []
+                for k, solver in enumerate((full, normal)):
+                    start = time.perf_counter()
+                    ok = solver.solve(L, W, bins, grid_size=g, timeout=args.timeout)[0]
+                    times[k] += time.perf_counter() - start
+                    feasible[k] += ok is True
+                    answers.append(ok)
+                if None in answers:
+                    undecided += 1
+                elif answers[0] != answers[1]:
+                    if solver_name != 'grid' or answers[1]:
+                        raise AssertionError(f"{solver_name} g={g}: full {answers[0]}, normal {answers[1]} for {bins}")
+                    differ += 1
+            print(f"{solver_name:>12} {g:>5} {dots / len(combos):>8.0f} {reduced / len(combos):>8.0f} {times[0]:>8.2f} "
+                  f"{times[1]:>8.2f} {feasible[0]:>4}/{feasible[1]:<4} {differ:>4} {undecided:>5}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Per-combo latency of each portfolio member alone versus the racing portfolio.
+
+Two workloads: the combos that reach CP-SAT in a BFS walk with subtree pruning
+and pre-checks on TestInstances (first machine of each file), and tight
+synthetic sets, from guillotine cuts of a square plate (feasible) and the same
+sets with one part one unit longer (infeasible). Answers must agree wherever
+both sides decided; ``undec`` counts solves stopped by the time limit.
+Usage: python -m benchmarks.bench_portfolio --instances n20 n30 --tight 20
+"""
+import argparse
+import os
+import random
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.solvers.portfolio import DEFAULT_MEMBERS, PortfolioSolver, parse_member
+from mis.strategies.combinations import bfs_order
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+
+def _guillotine(rng: random.Random, side: int, parts: int):
+    rects = [(side, side)]
+    while len(rects) < parts:
+        rects.sort(key=lambda r: -r[0] * r[1])
+        a, b = rects.pop(0)
+        if a >= b:
+            cut = rng.randint(1, a - 1)
+            rects += [(cut, b), (a - cut, b)]
+        else:
+            cut = rng.randint(1, b - 1)
+            rects += [(a, cut), (a, b - cut)]
+    return [(float(a), float(b)) for a, b in rects]
+
+
+def _suite_combos(names, files, max_size, base_dir):
+    combos = []
+    for name in names:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        for file in list_instances(inst_dir)[:files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            stage = Prechecks('interval', L, W, bins_info, min(L, W) / 10)
+            reference = get_solver('interval', SolverParams(num_workers=1, random_seed=0))
+            pruner = Pruner()
+            for combo in bfs_order(list(bins_info), max_size=max_size, prune=pruner.should_prune):
+                verdict = stage.check(combo)
+                bins = [bins_info[k] for k in combo]
+                feasible = verdict[1] if verdict is not None else reference.solve(L, W, bins)[0]
+                if verdict is None:
+                    combos.append((L, W, bins))
+                if feasible is False:
+                    pruner.add_failed(combo)
+    return combos
+
+
+def _report(label, name, times, undecided):
+    times = sorted(times)
+    p95 = times[int(0.95 * (len(times) - 1))]
+    print(f"{label:>6} {name:>20} {len(times):>6} {sum(times):>8.2f} {times[len(times) // 2]:>7.3f} {p95:>7.3f} "
+          f"{times[-1]:>7.2f} {undecided:>5}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Portfolio benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n20', 'n30'])
+    parser.add_argument('--files', type=int, default=1, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=5)
+    parser.add_argument('--tight', type=int, default=20, help='synthetic sets (each solved feasible and infeasible)')
+    parser.add_argument('--parts', type=int, default=12, help='parts per synthetic set')
+    parser.add_argument('--members', nargs='+', default=list(DEFAULT_MEMBERS))
+    parser.add_argument('--timeout', type=float, default=20.0)
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workloads = {'suite': _suite_combos(args.instances, args.files, args.max_size, base_dir)}
+    rng = random.Random(0)
+    tight = []
+    for _ in range(args.tight):
+        bins = _guillotine(rng, 20, args.parts)
+        tight.append((20.0, 20.0, bins))
+        tight.append((20.0, 20.0, [(bins[0][0] + 1, bins[0][1])] + bins[1:]))
+    workloads['tight'] = tight
+
+    base = SolverParams(random_seed=0, time_limit=args.timeout)
+    solvers = [(spec, get_solver(*parse_member(spec, base))) for spec in args.members]
+    portfolio = PortfolioSolver(base, args.members)
+    solvers.append(('portfolio', portfolio))
+    print(f"{os.cpu_count()} cores; members {', '.join(args.members)}")
+    print(f"{'load':>6} {'solver':>20} {'combos':>6} {'total s':>8} {'median':>7} {'p95':>7} {'max s':>7} {'undec':>5}")
+    for label, combos in workloads.items():
+        answers = {}
+        for name, solver in solvers:
+            times = []
+            undecided = 0
+            for index, (L, W, bins) in enumerate(combos):
+                start = time.perf_counter()
+                ok = solver.solve(L, W, bins)[0]
+                times.append(time.perf_counter() - start)
+                if ok is None:
+                    undecided += 1
+                elif answers.setdefault(index, ok) != ok:
+                    raise AssertionError(f"{name} says {ok} for {bins}")
+            _report(label, name, times, undecided)
+        print(f"{label:>6} wins: {portfolio.take_stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Share of CP-SAT calls avoided by the pre-check filters.
+
+Walks the BFS layers with subtree pruning (as the runner does) and counts which
+filter decides each combo; combos left undecided are the ones sent to CP-SAT.
+With ``--verify`` every decided combo is also solved and the answers compared.
+Usage: python -m benchmarks.bench_prechecks --instances n30 n40 --max-size 5
+"""
+import argparse
+import os
+import time
+from collections import Counter
+
+from mis.io.reader import read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.strategies.combinations import bfs_order
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-check benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n30', 'n40'])
+    parser.add_argument('--solver', default='interval')
+    parser.add_argument('--grid-size', type=float, default=None)
+    parser.add_argument('--files', type=int, default=2, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=5)
+    parser.add_argument('--verify', action='store_true', help='solve decided combos too and compare')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    solver = get_solver(args.solver, SolverParams(num_workers=1, random_seed=0))
+
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        decided: Counter = Counter()
+        total = 0
+        check_time = solve_time = 0.0
+        for file in sorted(os.listdir(inst_dir))[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            grid_size = args.grid_size or min(L, W) / 10
+            stage = Prechecks(args.solver, L, W, bins_info, grid_size)
+            pruner = Pruner()
+            for combo in bfs_order(list(bins_info), max_size=args.max_size, prune=pruner.should_prune):
+                total += 1
+                t0 = time.perf_counter()
+                verdict = stage.check(combo)
+                check_time += time.perf_counter() - t0
+                if verdict is not None and not args.verify:
+                    ok = verdict[1]
+                else:
+                    t0 = time.perf_counter()
+                    ok, _ = solver.solve(L, W, [bins_info[k] for k in combo], grid_size)
+                    solve_time += time.perf_counter() - t0
+                    if verdict is not None and verdict[1] != ok:
+                        raise AssertionError(f"{verdict[0]} disagrees with {args.solver} on {combo} in {file}")
+                decided[verdict[0] if verdict else 'solver'] += 1
+                if ok is False:
+                    pruner.add_failed(combo)
+
+        avoided = total - decided['solver']
+        print(f"{name} ({args.solver}, first {args.files} files, up to {args.max_size} items)")
+        print(f"  combos {total}, CP-SAT calls avoided {avoided} ({100 * avoided / max(total, 1):.1f}%)")
+        print("  " + ", ".join(f"{k}={v}" for k, v in decided.most_common()))
+        print(f"  pre-check time {check_time:.2f}s, solve time {solve_time:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Compare the set-trie Pruner against the original linear-scan pruner.
+
+Usage: python -m benchmarks.bench_pruning --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import time
+from typing import FrozenSet, List, Set
+
+from mis.strategies.pruning import Pruner
+
+
+class LinearPruner:
+    # The pre-trie implementation, kept here as the baseline.
+    def __init__(self) -> None:
+        self.failed: Set[FrozenSet[str]] = set()
+
+    def should_prune(self, combo: List[str]) -> bool:
+        combo_set = frozenset(combo)
+        for failed in self.failed:
+            if failed.issubset(combo_set):
+                return True
+        return False
+
+    def add_failed(self, combo: List[str]) -> None:
+        self.failed.add(frozenset(combo))
+
+
+def _random_combo(rng: random.Random, keys: List[str], lo: int, hi: int) -> List[str]:
+    return rng.sample(keys, rng.randint(lo, hi))
+
+
+def run(sizes: List[int], num_items: int, num_queries: int, seed: int) -> None:
+    keys = [f"{i}-1" for i in range(1, num_items + 1)]
+    print(f"{'failed':>8} {'minimal':>8} {'linear add':>11} {'trie add':>9} {'linear query':>13} {'trie query':>11} {'speedup':>8}")
+    for size in sizes:
+        rng = random.Random(seed)
+        failed = [_random_combo(rng, keys, 3, 7) for _ in range(size)]
+        queries = [_random_combo(rng, keys, 4, 12) for _ in range(num_queries)]
+
+        results = []
+        timings = []
+        for cls in (LinearPruner, Pruner):
+            pruner = cls()
+            t0 = time.perf_counter()
+            for combo in failed:
+                pruner.add_failed(combo)
+            t1 = time.perf_counter()
+            results.append([pruner.should_prune(q) for q in queries])
+            t2 = time.perf_counter()
+            timings.append((t1 - t0, t2 - t1, len(pruner.failed)))
+
+        if results[0] != results[1]:
+            raise AssertionError(f"pruning answers differ at {size} failed sets")
+        (lin_add, lin_q, _), (trie_add, trie_q, minimal) = timings
+        print(f"{size:>8} {minimal:>8} {lin_add:>10.3f}s {trie_add:>8.3f}s {lin_q:>12.3f}s {trie_q:>10.3f}s {lin_q / trie_q:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pruner benchmark on synthetic failure sets')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--items', type=int, default=40)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.items, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Solve time with and without symmetry breaking (``SolverParams.symmetry_breaking``).
+
+Collects the combos that reach CP-SAT in a BFS walk with subtree pruning and
+pre-checks (first machine of each file), then solves them with both settings.
+Times are reported for the infeasible combos, where the proofs have to cover
+every equivalent layout; the answers of all combos must agree.
+Usage: python -m benchmarks.bench_symmetry --instances n20 n30 --max-size 6
+"""
+import argparse
+import os
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.strategies.combinations import bfs_order
+from mis.strategies.prechecks import Prechecks
+from mis.strategies.pruning import Pruner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Symmetry breaking benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n20', 'n30'])
+    parser.add_argument('--solvers', nargs='+', default=['interval', 'disjunctive'])
+    parser.add_argument('--files', type=int, default=2, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=6)
+    parser.add_argument('--combos', type=int, default=300, help='solver combos kept per file (largest first)')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    plain = SolverParams(num_workers=1, random_seed=0)
+    broken = SolverParams(num_workers=1, random_seed=0, symmetry_breaking=True)
+    print(f"{'instance':>16} {'solver':>12} {'infeas':>6} {'plain s':>8} {'sym s':>8} {'speedup':>7} {'max plain':>9} {'max sym':>8}")
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        for file in list_instances(inst_dir)[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            grid_size = min(L, W) / 10
+            reference = get_solver('interval', plain)
+            stage = Prechecks('interval', L, W, bins_info, grid_size)
+            pruner = Pruner()
+            reached = []
+            for combo in bfs_order(list(bins_info), max_size=args.max_size, prune=pruner.should_prune):
+                verdict = stage.check(combo)
+                if verdict is not None:
+                    feasible = verdict[1]
+                else:
+                    feasible = reference.solve(L, W, [bins_info[k] for k in combo], grid_size)[0]
+                    reached.append((combo, feasible))
+                if feasible is False:
+                    pruner.add_failed(combo)
+            reached = sorted(reached, key=lambda item: -len(item[0]))[:args.combos]
+            label = f"{name}/{file.split('#')[-1].split('.')[0]}"
+            for solver_name in args.solvers:
+                times = {}
+                for key, params in (('plain', plain), ('sym', broken)):
+                    solver = get_solver(solver_name, params)
+                    total = worst = 0.0
+                    for combo, expected in reached:
+                        start = time.perf_counter()
+                        ok = solver.solve(L, W, [bins_info[k] for k in combo], grid_size)[0]
+                        elapsed = time.perf_counter() - start
+                        if ok != expected:
+                            raise AssertionError(f"{file}: {solver_name} ({key}) says {ok} for {combo}")
+                        if ok is False:
+                            total += elapsed
+                            worst = max(worst, elapsed)
+                    times[key] = (total, worst)
+                infeasible = sum(1 for _, expected in reached if expected is False)
+                (t0, w0), (t1, w1) = times['plain'], times['sym']
+                print(f"{label:>16} {solver_name:>12} {infeasible:>6} {t0:>8.2f} {t1:>8.2f} {t0 / max(t1, 1e-9):>6.2f}x "
+                      f"{w0:>9.3f} {w1:>8.3f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
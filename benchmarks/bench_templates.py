@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Per-combo model build vs solve time, rebuilding the model every time
+(``solver.build``) or fixing presence literals of a prebuilt template.
+
+Random combos of each size are drawn from the first machine of one instance
+file; both paths must give the same answers. The one-off template build is
+reported per solver.
+Usage: python -m benchmarks.bench_templates --instance n30 --sizes 2 4 6 8
+"""
+import argparse
+import os
+import random
+import time
+
+from mis.io.reader import list_instances, read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.solvers.params import feasibility, make_cp_solver
+from mis.solvers.templates import build_template
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model template benchmark')
+    parser.add_argument('--instance', default='n30')
+    parser.add_argument('--solvers', nargs='+', default=['interval', 'disjunctive', 'grid-compact'])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[2, 3, 4, 6, 8])
+    parser.add_argument('--combos', type=int, default=30, help='combos per size')
+    parser.add_argument('--grid-divisions', type=int, default=10, help='grid size = min(L, W) / this')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    inst_dir = os.path.join(base_dir, 'TestInstances', args.instance)
+    _, machines_info, bins_info = read_instance(os.path.join(inst_dir, list_instances(inst_dir)[0]))
+    _, L, W = machines_info[0]
+    grid_size = min(L, W) / args.grid_divisions
+    keys = list(bins_info)
+    rng = random.Random(0)
+    combos = {size: [rng.sample(keys, size) for _ in range(args.combos)] for size in args.sizes if size <= len(keys)}
+    params = SolverParams(num_workers=1, random_seed=0)
+
+    print(f"{'solver':>12} {'size':>4} {'build ms':>9} {'solve ms':>9} {'fix ms':>7} {'solve ms':>9} {'speedup':>7}")
+    for name in args.solvers:
+        solver = get_solver(name, params)
+        start = time.perf_counter()
+        template = build_template(name, L, W, bins_info, grid_size, params)
+        print(f"{name:>12} template built in {1000 * (time.perf_counter() - start):.1f} ms")
+        for size, batch in combos.items():
+            build = solve = fix = solve_t = 0.0
+            for combo in batch:
+                start = time.perf_counter()
+                model = solver.build(L, W, [bins_info[k] for k in combo], grid_size)[0]
+                mid = time.perf_counter()
+                before = feasibility(make_cp_solver(params).Solve(model))
+                build += mid - start
+                solve += time.perf_counter() - mid
+
+                start = time.perf_counter()
+                template._fix([template._index[k] for k in combo])
+                mid = time.perf_counter()
+                after = feasibility(make_cp_solver(params).Solve(template.model))
+                fix += mid - start
+                solve_t += time.perf_counter() - mid
+                if before != after:
+                    raise AssertionError(f"{name}: template answer differs for {combo}")
+            n = len(batch)
+            speedup = (build + solve) / (fix + solve_t)
+            print(f"{name:>12} {size:>4} {1000 * build / n:>9.2f} {1000 * solve / n:>9.2f} {1000 * fix / n:>7.3f} "
+                  f"{1000 * solve_t / n:>9.2f} {speedup:>6.2f}x", flush=True)
+
+
+if __name__ == '__main__':
+    main()
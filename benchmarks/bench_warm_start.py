@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Mean solve time per BFS layer with and without warm-start hints.
+
+Each non-pruned combo is solved twice, once cold and once hinted with the
+packing of a feasible one-item-smaller subset (as the runner does).
+Usage: python -m benchmarks.bench_warm_start --instances n20 n30 --max-size 5
+"""
+import argparse
+import os
+import time
+from typing import Dict, List
+
+from mis.io.reader import read_instance
+from mis.solvers import SolverParams, get_solver
+from mis.strategies.combinations import bfs_order
+from mis.strategies.pruning import Pruner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm-start benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n20', 'n30'])
+    parser.add_argument('--solver', default='interval')
+    parser.add_argument('--files', type=int, default=2, help='instance files per folder')
+    parser.add_argument('--max-size', type=int, default=5)
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    solver = get_solver(args.solver, SolverParams(num_workers=1, random_seed=0))
+
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        cold: Dict[int, List[float]] = {}
+        warm: Dict[int, List[float]] = {}
+        for file in sorted(os.listdir(inst_dir))[:args.files]:
+            _, machines_info, bins_info = read_instance(os.path.join(inst_dir, file))
+            _, L, W = machines_info[0]
+            pruner = Pruner()
+            feasible: Dict[str, Dict[int, List[float]]] = {}
+            for combo in bfs_order(list(bins_info), max_size=args.max_size, prune=pruner.should_prune):
+                bins = [bins_info[k] for k in combo]
+                hint = None
+                # same choice as _MachineRun.hint: drop the smallest item first
+                for drop in sorted(range(len(combo)), key=lambda i: bins[i][0] * bins[i][1]):
+                    sub = feasible.get(str(combo[:drop] + combo[drop + 1:]))
+                    if sub is not None and len(combo) > 2:
+                        hint = {(j if j < drop else j + 1): xy for j, xy in sub.items()}
+                        break
+
+                t0 = time.perf_counter()
+                ok, packing = solver.solve(L, W, bins)
+                t1 = time.perf_counter()
+                ok_warm, _ = solver.solve(L, W, bins, hint=hint)
+                t2 = time.perf_counter()
+                if ok != ok_warm:
+                    raise AssertionError(f"hinted answer differs for {combo} in {file}")
+                if hint is not None:
+                    cold.setdefault(len(combo), []).append(t1 - t0)
+                    warm.setdefault(len(combo), []).append(t2 - t1)
+                if ok:
+                    feasible[str(combo)] = packing
+                else:
+                    pruner.add_failed(combo)
+
+        print(f"{name} ({args.solver}, first {args.files} files), hinted combos only")
+        print(f"{'size':>5} {'combos':>7} {'cold mean':>10} {'warm mean':>10} {'reduction':>10}")
+        for size in sorted(cold):
+            c = sum(cold[size]) / len(cold[size])
+            w = sum(warm[size]) / len(warm[size])
+            print(f"{size:>5} {len(cold[size]):>7} {c * 1000:>8.2f}ms {w * 1000:>8.2f}ms {100 * (1 - w / c):>9.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Peak RSS and throughput of the result writers on one n20 resolution.
+
+Every combo of the first instance (up to --max-size items) gets a synthetic
+feasible entry shaped like a real one; each writer runs in a fresh process so
+its peak RSS is measured on its own.
+Usage: python -m benchmarks.bench_writer --instances n20 --max-size 8
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from mis.io.reader import read_instance
+from mis.io.streaming import RESULT_WRITERS
+from mis.strategies.combinations import bfs_order
+
+
+def _write(fmt: str, instance: str, max_size: int, out_dir: str) -> None:
+    _, machines_info, bins_info = read_instance(instance)
+    _, L, W = machines_info[0]
+    header = {"Bins Info": bins_info, "Grid Size": 1.0, "Container Dimensions": {"Length": L, "Width": W}, "Strategy": "bfs"}
+    base = os.path.join(out_dir, f"{L}x{W}-1.0")
+    start = time.perf_counter()
+    writer = RESULT_WRITERS[fmt](base, header)
+    count = 0
+    for combo in bfs_order(list(bins_info), max_size=max_size):
+        writer.result({
+            "Combination": combo,
+            "Is Feasible": True,
+            "Packing Solution": {i: [float(i), float(i)] for i in range(len(combo))},
+            "Time Taken (seconds)": 0.01,
+            "Max Resolution": 1.0,
+        })
+        count += 1
+    writer.close()
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir))
+    print(json.dumps({"records": count, "seconds": elapsed, "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                      "bytes": size}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Result writer benchmark')
+    parser.add_argument('--instances', nargs='+', default=['n20'])
+    parser.add_argument('--max-size', type=int, default=8)
+    parser.add_argument('--child', nargs=2, metavar=('FORMAT', 'INSTANCE'), help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _write(args.child[0], args.child[1], args.max_size, args.out)
+        return
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for name in args.instances:
+        inst_dir = os.path.join(base_dir, 'TestInstances', name)
+        instance = os.path.join(inst_dir, sorted(os.listdir(inst_dir))[0])
+        print(f"{name} ({os.path.basename(instance)}, combos up to {args.max_size} items)")
+        print(f"{'writer':>7} {'records':>9} {'seconds':>8} {'rec/s':>9} {'peak RSS':>10} {'on disk':>9}")
+        for fmt in RESULT_WRITERS:
+            with tempfile.TemporaryDirectory() as out:
+                res = subprocess.run([sys.executable, '-m', 'benchmarks.bench_writer', '--max-size', str(args.max_size),
+                                      '--child', fmt, instance, '--out', out],
+                                     cwd=base_dir, check=True, capture_output=True, text=True)
+                r = json.loads(res.stdout)
+            print(f"{fmt:>7} {r['records']:>9} {r['seconds']:>8.2f} {r['records'] / r['seconds']:>9.0f} "
+                  f"{r['peak_rss_mb']:>8.0f}MB {r['bytes'] / 2 ** 20:>7.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
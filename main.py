@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 import argparse
+import json
+import logging
 import os
+import tempfile
 from typing import List
 
 from mis.runner import RunConfig, run_instances
+from mis.solvers.params import SolverParams
 from utils.Logcount import log_run
 
 
@@ -13,6 +17,26 @@ def prepare_txt(input_dir: str, output_dir: str) -> None:
     convert_txt_json(input_dir, output_dir)
 
 
+def prepare(src: str, input_dir: str, output_dir: str, n_values: List[int] | None = None) -> None:
+    if src == 'txt':
+        prepare_txt(input_dir, output_dir)
+    else:
+        prepare_csv(input_dir, output_dir, n_values=n_values)
+
+
+def pack_prepared(json_root: str, output_dir: str) -> None:
+    # one .misb per directory of instance JSON files, mirroring the directory layout
+    from mis.io.binary import pack_directory
+    for dirpath, _, files in os.walk(json_root):
+        if not any(f.endswith('.json') for f in files):
+            continue
+        rel = os.path.relpath(dirpath, json_root)
+        name = os.path.basename(os.path.abspath(output_dir)) if rel == '.' else os.path.basename(rel)
+        out_path = os.path.join(output_dir, rel, f"{name}.misb")
+        count = pack_directory(dirpath, out_path)
+        print(f"Packed {count} instances into {out_path}")
+
+
 def _detect_n_values(input_base_dir: str) -> List[int]:
     n_values: List[int] = []
     if not os.path.isdir(input_base_dir):
@@ -32,7 +56,19 @@ def prepare_csv(input_base_dir: str, output_base_dir: str, n_values: List[int] |
     convert_csv_dir(input_base_dir, output_base_dir, n_values=n_values)
 
 
-def solve(strategy: str, solver: str, instances: list[str] | None, instances_dir: str | None, processes: int | None, timeout: float | None) -> None:
+def _run_number(run_id: str, code_name: str) -> int:
+    # accepts "7" or the directory name "MAIN7"
+    return int(run_id[len(code_name):] if run_id.startswith(code_name) else run_id)
+
+
+def solve(strategy: str, solver: str, instances: list[str] | None, instances_dir: str | None, processes: int | None, timeout: float | None,
+          max_comb_size: int | None = None, prune_subtrees: bool = False, schedule: str = 'file',
+          solver_params: SolverParams | None = None, warm_start: bool = True,
+          prechecks: bool = True, share_results: bool = True, result_store: str | None = None,
+          result_store_max_rows: int | None = None, output_format: str = 'json', checkpoint: bool = False,
+          resume: str | None = None, mode: str = 'enumerate', mis_shrink: str = 'quickxplain',
+          mis_time_limit: float | None = None, assumptions: bool = False, model_templates: bool = False,
+          dominance: bool = True) -> None:
     base_dir = os.path.dirname(os.path.abspath(__file__))
     default_parent = os.path.join(base_dir, 'TestInstances')
     default_output = os.path.join(base_dir, 'output')
@@ -44,12 +80,94 @@ def solve(strategy: str, solver: str, instances: list[str] | None, instances_dir
             instances = ['n15']
         instance_dirs = [os.path.join(default_parent, name) for name in instances]
 
-    cfg = RunConfig(solver=solver, strategy=strategy, code_name='MAIN', timeout=timeout, base_output=default_output)
-    num_run = log_run(code_name='MAIN')
+    cfg = RunConfig(solver=solver, strategy=strategy, code_name='MAIN', timeout=timeout, base_output=default_output,
+                    max_comb_size=max_comb_size, prune_subtrees=prune_subtrees, schedule=schedule,
+                    solver_params=solver_params, warm_start=warm_start, prechecks=prechecks,
+                    share_results=share_results, result_store=result_store, result_store_max_rows=result_store_max_rows,
+                    output_format=output_format, checkpoint=checkpoint, resume=resume is not None,
+                    mode=mode, mis_shrink=mis_shrink, mis_time_limit=mis_time_limit, assumptions=assumptions,
+                    model_templates=model_templates, dominance=dominance)
+    num_run = log_run(code_name='MAIN', resume=_run_number(resume, 'MAIN') if resume is not None else None)
     for d in instance_dirs:
         run_instances(d, num_run=num_run, config=cfg, processes=processes)
 
 
+def worker(task_dir: str, shard: str, solver: str, out: str | None, processes: int | None, timeout: float | None,
+           solver_params: SolverParams | None = None, warm_start: bool = True, prechecks: bool = True,
+           result_store: str | None = None, output_format: str = 'json', resume: bool = False,
+           assumptions: bool = False, model_templates: bool = False, dominance: bool = True) -> None:
+    from mis.io.shards import parse_shard, read_manifest
+    from mis.runner import run_shard
+    index, shards = parse_shard(shard)
+    manifest = read_manifest(task_dir)
+    out = out or default_shard_root(task_dir)
+    if solver_params is not None and solver_params.log_search:
+        # workers do not go through log_run: search logs go next to the shard output
+        os.makedirs(out, exist_ok=True)
+        logging.basicConfig(filename=os.path.join(out, f"shard{index}.log"), level=logging.INFO,
+                            format="%(asctime)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    cfg = RunConfig(solver=solver, strategy=manifest['Strategy'], code_name='shard', timeout=timeout, base_output=out,
+                    max_comb_size=manifest.get('Max Comb Size'), solver_params=solver_params, warm_start=warm_start,
+                    prechecks=prechecks, result_store=result_store, output_format=output_format, checkpoint=True, resume=resume,
+                    assumptions=assumptions, model_templates=model_templates, dominance=dominance)
+    run_shard(task_dir, index, shards, cfg, processes=processes)
+    print(os.path.join(out, f"shard{index}"))
+
+
+def merge(shard_root: str) -> None:
+    from mis.io.outputs import run_dir
+    from mis.io.shards import merge_shards, unfinished_shards
+    if not os.path.exists(os.path.join(shard_root, 'manifest.json')):
+        raise SystemExit(f"No worker output under {shard_root}")
+    missing = unfinished_shards(shard_root)
+    if missing:
+        raise SystemExit(f"Shards not finished: {', '.join(map(str, missing))}")
+    base_output = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output')
+    num_run = log_run(code_name='MAIN')
+    path = run_dir(base_output, 'MAIN', num_run)
+    machines = merge_shards(shard_root, path)
+    print(f"Merged {machines} machines into {path}")
+
+
+def default_shard_root(task_dir: str) -> str:
+    name = os.path.basename(os.path.normpath(task_dir))
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'shards', name)
+
+
+def default_result_store() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'results.sqlite')
+
+
+def default_cost_model() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'cost_model.json')
+
+
+def cost_model_command(action: str, runs: List[str], path: str) -> None:
+    from mis.io.history import iter_timings
+    from mis.solvers.cost_model import CostModel, evaluate
+    timings = [t for run in runs for t in iter_timings(run)]
+    if action == 'train':
+        model = CostModel.fit(timings)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        model.save(path)
+        print(f"Trained on {json.dumps(model.samples)} -> {path}")
+        return
+    print(json.dumps(evaluate(CostModel.load(path), timings), indent=4))
+
+
+def cache_command(action: str, path: str, max_rows: int | None = None) -> None:
+    from mis.io.result_store import ResultStore
+    if not os.path.exists(path):
+        print(f"No result store at {path}")
+        return
+    store = ResultStore(path)
+    if action == 'vacuum':
+        evicted = store.vacuum(max_rows)
+        print(f"Evicted {evicted} rows")
+    print(json.dumps(store.stats(), indent=4))
+    store.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description='MIS main entry')
     sub = parser.add_subparsers(dest='command', required=True)
@@ -59,24 +177,199 @@ def main():
     p_prep.add_argument('--in', dest='input', required=True, help='Input path (dir)')
     p_prep.add_argument('--out', dest='output', required=True, help='Output directory for JSON files')
     p_prep.add_argument('--n-values', nargs='+', type=int, default=None, help='Only for CSV: list of n values (e.g., 15 20 30)')
+    p_prep.add_argument('--format', choices=['json', 'misb'], default='json',
+                        help='misb: pack the converted instances into memory-mappable batch files')
 
     p_run = sub.add_parser('solve', help='Run feasibility solving')
     p_run.add_argument('--strategy', choices=['bfs', 'dfs', 'all'], default='bfs')
-    p_run.add_argument('--solver', choices=['grid', 'interval', 'disjunctive'], default='interval')
+    p_run.add_argument('--solver', choices=['grid', 'grid-compact', 'interval', 'disjunctive', 'portfolio', 'auto'], default='interval')
     p_run.add_argument('--instances', nargs='+', default=None, help='Subfolders under TestInstances (e.g., n15 n20)')
     p_run.add_argument('--instances-dir', default=None, help='Override TestInstances directory (absolute or relative)')
     p_run.add_argument('--processes', type=int, default=None)
-    p_run.add_argument('--timeout', type=float, default=None)
+    p_run.add_argument('--timeout', type=float, default=None, help='CP-SAT time limit per combination (seconds)')
+    p_run.add_argument('--search-workers', type=int, default=None, help='CP-SAT search workers per solve')
+    p_run.add_argument('--seed', type=int, default=None, help='CP-SAT random seed')
+    p_run.add_argument('--no-presolve', action='store_true', help='Disable CP-SAT presolve')
+    p_run.add_argument('--log-search', action='store_true', help='Capture CP-SAT search logs into the run log')
+    p_run.add_argument('--no-warm-start', action='store_true', help='Do not hint solves with packings of feasible subsets')
+    p_run.add_argument('--no-share-results', action='store_true', help='Keep results of each machine to itself (no reuse across machines/files of the same size)')
+    p_run.add_argument('--result-store', nargs='?', const=default_result_store(), default=None, metavar='PATH',
+                       help='Reuse results across runs through this SQLite file (default path output/results.sqlite)')
+    p_run.add_argument('--store-max-rows', type=int, default=None, help='Evict least recently used store rows above this count after the run')
+    p_run.add_argument('--output-format', choices=['json', 'jsonl'], default='json',
+                       help='jsonl: stream results line by line (low memory, resumable after a crash)')
+    p_run.add_argument('--resume', metavar='RUN_ID', default=None,
+                       help='Continue an interrupted run (e.g. 7 or MAIN7) with the same settings')
+    p_run.add_argument('--checkpoint', action='store_true',
+                       help='Journal results and record finished resolutions so that the run can be resumed')
+    p_run.add_argument('--no-prechecks', action='store_true', help='Send every combo to CP-SAT (no bounds / greedy packer first)')
+    p_run.add_argument('--no-dominance', action='store_true',
+                       help='Do not infer combos from recorded ones whose parts fit inside / around theirs')
+    p_run.add_argument('--max-comb-size', type=int, default=None, help='Optional: limit maximum combination size')
+    p_run.add_argument('--prune-subtrees', action='store_true',
+                       help='Skip supersets of failed combos during enumeration (they are not written to the logs)')
+    p_run.add_argument('--schedule', choices=['file', 'combo'], default='file',
+                       help='Parallelise over instance files, or over combinations within each size layer')
+    p_run.add_argument('--mode', choices=['enumerate', 'mis'], default='enumerate',
+                       help='mis: only find the minimal infeasible / maximal feasible subsets (far fewer solver calls)')
+    p_run.add_argument('--shrink', choices=['quickxplain', 'deletion'], default='quickxplain',
+                       help='mis mode: how an infeasible set is reduced to a minimal one')
+    p_run.add_argument('--mis-time-limit', type=float, default=None,
+                       help='mis mode: stop the search of a machine/resolution after this many seconds (marked incomplete)')
+    p_run.add_argument('--assumptions', action='store_true',
+                       help='interval solver: one model per machine solved under assumptions; infeasible cores are pruned')
+    p_run.add_argument('--model-templates', action='store_true',
+                       help='Build the model once per machine/resolution and fix presence literals per combo (not for grid)')
+    p_run.add_argument('--symmetry-breaking', action='store_true',
+                       help='interval/disjunctive: order identical parts, fix needless rotations, keep the largest part in one quadrant')
+    p_run.add_argument('--enhanced-disjunctive', action='store_true',
+                       help='disjunctive: add a cumulative per axis and drop pair literals for impossible side-by-side placements')
+    p_run.add_argument('--normal-patterns', action='store_true',
+                       help='grid/grid-compact: only place parts at sums of part lengths on the grid (same answers for grid-compact)')
+    p_run.add_argument('--portfolio', nargs='+', default=None, metavar='MEMBER',
+                       help='portfolio solver: members raced per combo, name[:seed=N,workers=N,symmetry,enhanced,no-presolve] '
+                            '(default interval disjunctive interval:symmetry)')
+    p_run.add_argument('--cost-model', default=default_cost_model(),
+                       help='auto solver: model from "main.py cost-model train" choosing a solver per combo')
+
+    p_cache = sub.add_parser('cache', help='Inspect or shrink the persistent result store')
+    p_cache.add_argument('action', choices=['stats', 'vacuum'])
+    p_cache.add_argument('--path', default=default_result_store())
+    p_cache.add_argument('--max-rows', type=int, default=None, help='vacuum: keep at most this many most recently used rows')
+
+    p_work = sub.add_parser('worker', help='Solve one shard of a sharded task directory (task/prepare_tasks.py --shards N)')
+    p_work.add_argument('task_dir')
+    p_work.add_argument('--shard', required=True, metavar='i/N', help='Shard to solve, 0-based (e.g. 3/8)')
+    p_work.add_argument('--solver', choices=['grid', 'grid-compact', 'interval', 'disjunctive', 'portfolio', 'auto'], default='interval')
+    p_work.add_argument('--out', default=None, help='Shard output root, shared by all workers (default output/shards/<task dir name>)')
+    p_work.add_argument('--processes', type=int, default=None)
+    p_work.add_argument('--timeout', type=float, default=None, help='CP-SAT time limit per combination (seconds)')
+    p_work.add_argument('--search-workers', type=int, default=None, help='CP-SAT search workers per solve')
+    p_work.add_argument('--seed', type=int, default=None, help='CP-SAT random seed')
+    p_work.add_argument('--no-presolve', action='store_true', help='Disable CP-SAT presolve')
+    p_work.add_argument('--log-search', action='store_true', help='Capture CP-SAT search logs into <out>/shard<i>.log')
+    p_work.add_argument('--no-warm-start', action='store_true')
+    p_work.add_argument('--no-prechecks', action='store_true')
+    p_work.add_argument('--no-dominance', action='store_true')
+    p_work.add_argument('--result-store', default=None,
+                        help='SQLite result store (off by default: WAL locking does not work on network filesystems)')
+    p_work.add_argument('--output-format', choices=['json', 'jsonl'], default='json')
+    p_work.add_argument('--resume', action='store_true', help='Continue an interrupted run of this shard')
+    p_work.add_argument('--assumptions', action='store_true',
+                        help='interval solver: one model per machine solved under assumptions; infeasible cores are pruned')
+    p_work.add_argument('--model-templates', action='store_true',
+                        help='Build the model once per machine/resolution and fix presence literals per combo (not for grid)')
+    p_work.add_argument('--symmetry-breaking', action='store_true',
+                        help='interval/disjunctive: order identical parts, fix needless rotations, keep the largest part in one quadrant')
+    p_work.add_argument('--enhanced-disjunctive', action='store_true',
+                        help='disjunctive: add a cumulative per axis and drop pair literals for impossible side-by-side placements')
+    p_work.add_argument('--normal-patterns', action='store_true',
+                        help='grid/grid-compact: only place parts at sums of part lengths on the grid (same answers for grid-compact)')
+    p_work.add_argument('--portfolio', nargs='+', default=None, metavar='MEMBER',
+                        help='portfolio solver: members raced per combo, name[:seed=N,workers=N,symmetry,enhanced,no-presolve] '
+                             '(default interval disjunctive interval:symmetry)')
+    p_work.add_argument('--cost-model', default=default_cost_model(),
+                        help='auto solver: model from "main.py cost-model train" choosing a solver per combo')
+
+    p_cost = sub.add_parser('cost-model', help='Train / evaluate the solver cost model of --solver auto from earlier runs')
+    p_cost.add_argument('action', choices=['train', 'evaluate'])
+    p_cost.add_argument('runs', nargs='+', help='Run directories (e.g. output/MAIN3 output/MAIN4), one solver each')
+    p_cost.add_argument('--model', default=default_cost_model(), help='Model file written by train, read by evaluate')
+
+    p_merge = sub.add_parser('merge', help='Combine finished worker shards into a new output run')
+    p_merge.add_argument('shard_root', help='Shard output root passed to (or chosen by) the workers')
+
+    p_conv = sub.add_parser('convert-results', help='Convert streamed .jsonl results to the .json format')
+    p_conv.add_argument('path', help='Run or machine output directory')
 
     args = parser.parse_args()
+    if getattr(args, 'assumptions', False) and args.solver != 'interval':
+        parser.error('--assumptions needs --solver interval')
+    if getattr(args, 'model_templates', False) and args.solver in ('grid', 'portfolio', 'auto'):
+        parser.error(f'--model-templates is not available for --solver {args.solver}')
+    if getattr(args, 'portfolio', None):
+        if args.solver != 'portfolio':
+            parser.error('--portfolio needs --solver portfolio')
+        from mis.solvers.portfolio import parse_member
+        for spec in args.portfolio:
+            try:
+                parse_member(spec, SolverParams())
+            except ValueError as e:
+                parser.error(str(e))
+    if getattr(args, 'solver', None) == 'auto':
+        if not os.path.exists(args.cost_model):
+            parser.error(f'No cost model at {args.cost_model}: run "main.py cost-model train" first')
+    if getattr(args, 'symmetry_breaking', False):
+        if args.solver not in ('interval', 'disjunctive'):
+            parser.error('--symmetry-breaking needs --solver interval or disjunctive')
+        if args.assumptions or args.model_templates:
+            parser.error('--symmetry-breaking applies to per-combo models, not --assumptions / --model-templates')
+    if getattr(args, 'enhanced_disjunctive', False) and args.solver != 'disjunctive':
+        parser.error('--enhanced-disjunctive needs --solver disjunctive')
+    if getattr(args, 'normal_patterns', False) and args.solver not in ('grid', 'grid-compact'):
+        parser.error('--normal-patterns needs --solver grid or grid-compact')
+    if args.command == 'solve':
+        # options of the solve subcommand only (worker has no --schedule / --mode)
+        if args.assumptions and args.schedule == 'combo':
+            parser.error('--assumptions is not used by --schedule combo (its layers see every subset first)')
+        if args.model_templates and args.schedule == 'combo':
+            parser.error('--model-templates is not used by --schedule combo (its workers solve each batch with the plain solver)')
+        if args.mode == 'mis':
+            # the MIS search writes one -mis.json per machine/resolution, sequentially
+            if args.schedule == 'combo':
+                parser.error('--mode mis runs per file: --schedule combo is not supported')
+            if args.output_format != 'json':
+                parser.error('--mode mis writes -mis.json files: --output-format jsonl is not supported')
+            if args.checkpoint:
+                parser.error('--mode mis always records finished resolutions (its -mis.json files): --checkpoint does not apply')
+        if args.store_max_rows is not None and args.result_store is None:
+            parser.error('--store-max-rows needs --result-store')
 
     if args.command == 'prepare':
-        if args.src == 'txt':
-            prepare_txt(args.input, args.output)
+        if args.format == 'misb':
+            with tempfile.TemporaryDirectory() as tmp:
+                prepare(args.src, args.input, tmp, args.n_values)
+                pack_prepared(tmp, args.output)
         else:
-            prepare_csv(args.input, args.output, n_values=args.n_values)
+            prepare(args.src, args.input, args.output, args.n_values)
     elif args.command == 'solve':
-        solve(strategy=args.strategy, solver=args.solver, instances=args.instances, instances_dir=args.instances_dir, processes=args.processes, timeout=args.timeout)
+        solve(strategy=args.strategy, solver=args.solver, instances=args.instances, instances_dir=args.instances_dir, processes=args.processes, timeout=args.timeout,
+              max_comb_size=args.max_comb_size, prune_subtrees=args.prune_subtrees, schedule=args.schedule,
+              solver_params=SolverParams(num_workers=args.search_workers, random_seed=args.seed,
+                                         presolve=False if args.no_presolve else None, log_search=args.log_search,
+                                         symmetry_breaking=args.symmetry_breaking,
+                                         enhanced_disjunctive=args.enhanced_disjunctive,
+                                         normal_patterns=args.normal_patterns,
+                                         portfolio=tuple(args.portfolio or ()),
+                                         cost_model=args.cost_model if args.solver == 'auto' else None),
+              warm_start=not args.no_warm_start, prechecks=not args.no_prechecks,
+              share_results=not args.no_share_results,
+              result_store=args.result_store, result_store_max_rows=args.store_max_rows,
+              output_format=args.output_format, checkpoint=args.checkpoint or args.resume is not None, resume=args.resume,
+              mode=args.mode, mis_shrink=args.shrink, mis_time_limit=args.mis_time_limit, assumptions=args.assumptions,
+              model_templates=args.model_templates, dominance=not args.no_dominance)
+    elif args.command == 'worker':
+        worker(args.task_dir, args.shard, args.solver, args.out, args.processes, args.timeout,
+               solver_params=SolverParams(num_workers=args.search_workers, random_seed=args.seed,
+                                          presolve=False if args.no_presolve else None, log_search=args.log_search,
+                                          symmetry_breaking=args.symmetry_breaking,
+                                          enhanced_disjunctive=args.enhanced_disjunctive,
+                                          normal_patterns=args.normal_patterns,
+                                          portfolio=tuple(args.portfolio or ()),
+                                          cost_model=args.cost_model if args.solver == 'auto' else None),
+               warm_start=not args.no_warm_start, prechecks=not args.no_prechecks,
+               result_store=args.result_store, output_format=args.output_format, resume=args.resume,
+               assumptions=args.assumptions, model_templates=args.model_templates, dominance=not args.no_dominance)
+    elif args.command == 'merge':
+        merge(args.shard_root)
+    elif args.command == 'cost-model':
+        cost_model_command(args.action, args.runs, args.model)
+    elif args.command == 'cache':
+        cache_command(args.action, args.path, args.max_rows)
+    elif args.command == 'convert-results':
+        from mis.io.streaming import convert_tree
+        for path in convert_tree(args.path):
+            print(path)
 
 
 if __name__ == '__main__':
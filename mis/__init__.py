@@ -1,6 +1,8 @@
 from .solvers import get_solver
+from .solvers.params import SolverParams
 
 __all__ = [
     'get_solver',
+    'SolverParams',
 ]
 
@@ -0,0 +1,159 @@
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# A ``.misb`` batch holds many instances as fixed-layout struct arrays that can
+# be memory-mapped (see ``mis.io.reader.InstanceBatch``):
+#
+#   magic (8 bytes) | header length (uint64) | JSON header | machines | parts | index
+#
+# Arrays start at 64-byte aligned offsets recorded in the header. Only the fields
+# the solvers read are kept: machine dimensions and the first orientation of
+# every part.
+MAGIC = b"MISB\x00\x00\x00\x01"
+ALIGN = 64
+
+# A ``.mcp`` combo pack holds the combos of one instance:
+#
+#   magic (8 bytes) | header length (uint64) | JSON header | rows
+#
+# The header carries the instance's machines and parts once (the shared parts
+# table) and the expanded keys; each row is a little-endian bitmask over the
+# keys, ``row_bytes`` wide, in enumeration order. Rows are only ever appended,
+# so the row count follows from the file size and a torn last row is ignored.
+PACK_MAGIC = b"MISC\x00\x00\x00\x01"
+
+MACHINE_DTYPE = np.dtype([
+    ('machine_id', '<i4'), ('num_machine', '<i4'), ('L', '<f8'), ('W', '<f8'), ('H', '<f8'),
+])
+PART_DTYPE = np.dtype([
+    ('part_id', '<i4'), ('num_part', '<i4'), ('num_orientation', '<i4'), ('volume', '<f8'),
+    ('l', '<f8'), ('w', '<f8'), ('h', '<f8'),
+])
+# per instance: [machine start, machine end, part start, part end)
+INDEX_DTYPE = np.dtype('<u8')
+
+
+def _machine_row(m: Dict) -> Tuple:
+    return (m.get('machine_id', 0), m.get('num_machine', 1), m.get('L', 0.0), m.get('W', 0.0), m.get('H', 0.0))
+
+
+def _part_row(p: Dict) -> Tuple:
+    # num_orientation 0 marks a part without orientations, which json_read skips
+    orientations = p.get('orientations') or []
+    o = orientations[0] if orientations else {}
+    return (p.get('part_id', 0), p.get('num_part', 1), p.get('num_orientation', 1) if orientations else 0,
+            p.get('volume', 0.0), o.get('l', 0.0), o.get('w', 0.0), o.get('h', 0.0))
+
+
+def write_batch(path: str, instances: Iterable[Tuple[str, Dict]]) -> int:
+    """Write ``(name, instance JSON)`` pairs to one ``.misb`` file; returns the count."""
+    names: List[str] = []
+    machines: List[Tuple] = []
+    parts: List[Tuple] = []
+    index: List[Tuple[int, int, int, int]] = []
+    for name, data in instances:
+        m0, p0 = len(machines), len(parts)
+        machines.extend(_machine_row(m) for m in data.get('machines', []))
+        parts.extend(_part_row(p) for p in data.get('parts', []))
+        names.append(name)
+        index.append((m0, len(machines), p0, len(parts)))
+
+    arrays = {
+        'machines': np.array(machines, dtype=MACHINE_DTYPE),
+        'parts': np.array(parts, dtype=PART_DTYPE),
+        'index': np.array(index, dtype=INDEX_DTYPE).reshape(-1, 4),
+    }
+    layout: Dict[str, Dict] = {}
+    header = {'names': names, 'arrays': layout}
+    # offsets depend on the header size, which depends on the offsets' digits:
+    # reserve room by sizing the header with generous placeholder offsets first
+    for key, arr in arrays.items():
+        layout[key] = {'offset': 10 ** 15, 'shape': list(arr.shape)}
+    head_len = len(json.dumps(header).encode())
+    offset = -(-(len(MAGIC) + 8 + head_len) // ALIGN) * ALIGN
+    for key, arr in arrays.items():
+        layout[key]['offset'] = offset
+        offset += -(-arr.nbytes // ALIGN) * ALIGN
+    head = json.dumps(header).encode().ljust(head_len)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(head)))
+        f.write(head)
+        for key, arr in arrays.items():
+            f.write(b"\0" * (layout[key]['offset'] - f.tell()))
+            f.write(arr.tobytes())
+    return len(names)
+
+
+def _aligned(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+
+def read_header(path: str, magic: bytes = MAGIC) -> Dict:
+    """JSON header of a ``.misb`` batch or (with ``PACK_MAGIC``) a ``.mcp`` pack;
+    ``data_offset`` is where the first array / row starts."""
+    with open(path, 'rb') as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError(f"{path} is not a {'.misb batch' if magic == MAGIC else '.mcp combo pack'}")
+        (size,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(size))
+    header['data_offset'] = _aligned(len(magic) + 8 + size)
+    return header
+
+
+class ComboPackWriter:
+    """Streams combos of one instance into a ``.mcp`` pack. Only a buffer of
+    encoded rows is held; it is written every ``buffer_rows`` combos."""
+
+    def __init__(self, path: str, keys: List[str], machines: List[Dict], parts: List[Dict],
+                 meta: Dict | None = None, buffer_rows: int = 65536) -> None:
+        self.path = path
+        self.pos = {k: i for i, k in enumerate(keys)}
+        self.row_bytes = max(1, -(-len(keys) // 8))
+        self.buffer_rows = buffer_rows
+        self.count = 0
+        self._rows: List[bytes] = []
+        header = dict(meta or {}, keys=list(keys), row_bytes=self.row_bytes, machines=machines, parts=parts)
+        head = json.dumps(header).encode()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._f = open(path, 'wb')
+        self._f.write(PACK_MAGIC)
+        self._f.write(struct.pack('<Q', len(head)))
+        self._f.write(head)
+        self._f.write(b"\0" * (_aligned(self._f.tell()) - self._f.tell()))
+
+    def write(self, combo: Iterable[str]) -> None:
+        mask = 0
+        for key in combo:
+            mask |= 1 << self.pos[key]
+        self._rows.append(mask.to_bytes(self.row_bytes, 'little'))
+        self.count += 1
+        if len(self._rows) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        self._f.write(b"".join(self._rows))
+        self._rows = []
+
+    def close(self) -> int:
+        """Flush and close; returns the number of combos written."""
+        self.flush()
+        self._f.close()
+        return self.count
+
+
+def pack_directory(json_dir: str, out_path: str) -> int:
+    """Pack every instance ``.json`` in ``json_dir`` (named by file stem) into ``out_path``."""
+    def instances():
+        for file in sorted(os.listdir(json_dir)):
+            if file.endswith('.json'):
+                with open(os.path.join(json_dir, file)) as f:
+                    yield os.path.splitext(file)[0], json.load(f)
+
+    return write_batch(out_path, instances())
@@ -0,0 +1,81 @@
+import json
+import os
+import re
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from .streaming import load_results
+from ..solvers.portfolio import MEMBER_SOLVERS
+
+# "{L}x{W}-{grid}" resolution logs; "-pruned" and "-mis" files do not match
+_RESULT_FILE = re.compile(r"^([\d.]+)x([\d.]+)-([\d.]+)\.jsonl?$")
+# the only Reason of an entry CP-SAT spent its time on; the others mark combos
+# decided without a solve (cache and persistent store hits, pre-checks, dominance)
+TIMEOUT_REASON = "Solver stopped at the time limit without a proof"
+
+
+class Timing(NamedTuple):
+    """One combination solved by CP-SAT in a previous run."""
+    solver: str
+    key: Tuple[str, str, float, Tuple[str, ...]]  # (instance, machine, grid, combination)
+    L: float
+    W: float
+    grid_size: float
+    bins: List[Tuple[float, float]]
+    seconds: float
+
+
+def solver_label(run_config: Dict) -> str | None:
+    """Portfolio-style spec (``interval:symmetry``) of the solver a run used, or
+    None when it cannot be picked per combo (grid models, portfolio, auto) or its
+    timings are not per-combo solves of one model."""
+    solver = run_config.get('solver', '')
+    if solver not in MEMBER_SOLVERS:
+        return None
+    if run_config.get('assumptions') or run_config.get('model_templates') or run_config.get('mode') == 'mis':
+        return None
+    params = run_config.get('solver_params') or {}
+    options = []
+    if params.get('symmetry_breaking'):
+        options.append('symmetry')
+    if params.get('enhanced_disjunctive'):
+        options.append('enhanced')
+    if params.get('presolve') is False:
+        options.append('no-presolve')
+    return f"{solver}:{','.join(options)}" if options else solver
+
+
+def iter_timings(run_path: str) -> Iterator[Timing]:
+    """Combos of a run directory (``output/MAIN7``) decided or timed out in CP-SAT.
+
+    Entries with any other ``Reason`` are skipped: hits of the feasibility cache
+    and of the persistent result store (``--result-store``), pre-check decisions
+    and dominance inferences are not solves, and their ``Time Taken`` is 0 or a
+    pre-check's time."""
+    with open(os.path.join(run_path, "run_config.json")) as f:
+        label = solver_label(json.load(f))
+    if label is None:
+        return
+    for instance in sorted(os.listdir(run_path)):
+        inst_dir = os.path.join(run_path, instance)
+        if not os.path.isdir(inst_dir):
+            continue
+        for machine in sorted(os.listdir(inst_dir)):
+            mdir = os.path.join(inst_dir, machine)
+            if not os.path.isdir(mdir):
+                continue
+            # a converted .jsonl log sits next to its .json copy: read each once
+            stems = {os.path.splitext(name)[0]: _RESULT_FILE.match(name) for name in os.listdir(mdir)}
+            for stem, match in sorted(stems.items()):
+                if match is None:
+                    continue
+                header, results, _ = load_results(os.path.join(mdir, stem))
+                bins_info = header["Bins Info"]
+                L, W, grid_size = (float(v) for v in match.groups())
+                for entry in results:
+                    if "Time Taken (seconds)" not in entry:
+                        continue
+                    if entry.get("Reason", TIMEOUT_REASON) != TIMEOUT_REASON:
+                        continue
+                    combo = tuple(entry["Combination"])
+                    yield Timing(label, (instance, machine, grid_size, combo), L, W, grid_size,
+                                 [tuple(bins_info[k]) for k in combo], float(entry["Time Taken (seconds)"]))
@@ -7,6 +7,12 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+def run_dir(base_output: str, code_name: str, num_run: int) -> str:
+    path = os.path.join(base_output, f"{code_name}{num_run}")
+    ensure_dir(path)
+    return path
+
+
 def machine_dir(base_output: str, code_name: str, num_run: int, instance_basename: str, machine_id: int) -> str:
     path = os.path.join(base_output, f"{code_name}{num_run}", instance_basename, str(machine_id))
     ensure_dir(path)
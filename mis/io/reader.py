@@ -1,8 +1,141 @@
-from typing import Dict, List, Tuple
+import os
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
 
 from utils.tools import json_read
+from .binary import INDEX_DTYPE, MACHINE_DTYPE, PACK_MAGIC, PART_DTYPE, read_header
 
+Instance = Tuple[int, List[Tuple[int, float, float]], Dict[str, Tuple[float, float]]]
 
-def read_instance(json_path: str) -> Tuple[int, List[Tuple[int, float, float]], Dict[str, Tuple[float, float]]]:
-    return json_read(json_path)
+# "batch.misb#name" addresses one instance inside a batch file
+BATCH_SEP = '#'
+
+
+class InstanceBatch:
+    """Memory-mapped ``.misb`` batch; instances are decoded on access only."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        header = read_header(path)
+        self.names: List[str] = header['names']
+        self._pos = {name: i for i, name in enumerate(self.names)}
+        arrays = header['arrays']
+
+        def mapped(key: str, dtype: np.dtype) -> np.ndarray:
+            shape = tuple(arrays[key]['shape'])
+            if 0 in shape:
+                return np.zeros(shape, dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode='r', offset=arrays[key]['offset'], shape=shape)
+
+        self.machines = mapped('machines', MACHINE_DTYPE)
+        self.parts = mapped('parts', PART_DTYPE)
+        self.index = mapped('index', INDEX_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Tuple[str, Instance]]:
+        for i, name in enumerate(self.names):
+            yield name, self.instance(i)
+
+    def instance(self, i: int | str) -> Instance:
+        """Same tuple as ``read_instance`` for a JSON file."""
+        if isinstance(i, str):
+            i = self._pos[i]
+        m0, m1, p0, p1 = self.index[i].tolist()
+        # tolist() on the struct slices is much faster than per-field access
+        machines_info = [(machine_id, L, W) for machine_id, _, L, W, _ in self.machines[m0:m1].tolist()]
+        # expand num_part copies as "<part_id>-<k>", like json_read
+        counts: Dict[int, int] = {}
+        bins_info: Dict[str, Tuple[float, float]] = {}
+        for pid, num_part, num_orientation, _, l, w, _ in self.parts[p0:p1].tolist():
+            for _ in range(num_part):
+                counts[pid] = counts.get(pid, 0) + 1
+                if num_orientation:
+                    bins_info[f"{pid}-{counts[pid]}"] = (l, w)
+        return len(machines_info), machines_info, bins_info
+
+
+class ComboPack:
+    """Memory-mapped ``.mcp`` combo pack (see ``mis.io.binary.ComboPackWriter``).
+
+    ``masks`` decodes a range of rows at once; ``combo`` and ``instance`` give
+    one combo as keys or as the ``read_instance`` tuple restricted to it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.header = read_header(path, PACK_MAGIC)
+        self.keys: List[str] = self.header['keys']
+        row_bytes = self.header['row_bytes']
+        offset = self.header['data_offset']
+        count = (os.path.getsize(path) - offset) // row_bytes
+        if count:
+            self.rows = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(count, row_bytes))
+        else:
+            self.rows = np.zeros((0, row_bytes), dtype=np.uint8)
+        self.machines_info = [(m.get('machine_id'), m.get('L'), m.get('W')) for m in self.header['machines']]
+        # same "<part_id>-<k>" expansion as json_read
+        self.bins_info: Dict[str, Tuple[float, float]] = {}
+        for part in self.header['parts']:
+            o = (part.get('orientations') or [{}])[0]
+            for k in range(1, int(part.get('num_part', 1)) + 1):
+                self.bins_info[f"{part.get('part_id')}-{k}"] = (o.get('l'), o.get('w'))
+
+    def __len__(self) -> int:
+        return len(self.rows)
 
+    def masks(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Boolean (rows, keys) membership matrix of rows ``start:stop``."""
+        bits = np.unpackbits(np.asarray(self.rows[start:stop]), axis=1, bitorder='little')
+        return bits[:, :len(self.keys)].astype(bool)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        keys = np.asarray(self.keys, dtype=object)
+        for start in range(0, len(self), 65536):
+            for row in self.masks(start, start + 65536):
+                yield keys[row].tolist()
+
+    def combo(self, i: int) -> List[str]:
+        return [k for k, bit in zip(self.keys, self.masks(i, i + 1)[0]) if bit]
+
+    def instance(self, i: int) -> Instance:
+        bins_info = {k: self.bins_info[k] for k in self.combo(i)}
+        return len(self.machines_info), self.machines_info, bins_info
+
+
+_BATCHES: Dict[str, InstanceBatch] = {}
+
+
+def open_batch(path: str) -> InstanceBatch:
+    """Batch reader for ``path``, mapped once per process."""
+    key = os.path.abspath(path)
+    if key not in _BATCHES:
+        _BATCHES[key] = InstanceBatch(path)
+    return _BATCHES[key]
+
+
+def list_instances(folder: str) -> List[str]:
+    """Instance entries of ``folder``: JSON file names and ``batch.misb#name``."""
+    entries: List[str] = []
+    for file in sorted(os.listdir(folder)):
+        if file.endswith('.json'):
+            entries.append(file)
+        elif file.endswith('.misb'):
+            entries.extend(f"{file}{BATCH_SEP}{name}" for name in open_batch(os.path.join(folder, file)).names)
+    return entries
+
+
+def instance_name(entry: str) -> str:
+    """Output directory name of an instance entry."""
+    if BATCH_SEP in entry:
+        return entry.split(BATCH_SEP, 1)[1]
+    return entry.split('.')[0]
+
+
+def read_instance(json_path: str) -> Instance:
+    if BATCH_SEP in json_path:
+        batch, name = json_path.split(BATCH_SEP, 1)
+        return open_batch(batch).instance(name)
+    return json_read(json_path)
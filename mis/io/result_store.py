@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Tuple
+
+# One row per (plate, shape signature, model kind, grid). Continuous models
+# store grid 0: their answers do not depend on the resolution.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    plate TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    grid REAL NOT NULL,
+    feasible INTEGER NOT NULL,
+    packing TEXT,
+    solver TEXT,
+    instance TEXT,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (plate, signature, kind, grid)
+);
+CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at);
+"""
+
+Fact = Tuple[str, float | None, bool, List[List[float]] | None]
+
+
+def plate_key(L: float, W: float) -> str:
+    return f"{float(L)!r}x{float(W)!r}"
+
+
+def signature_key(signature: Tuple[Tuple[float, float], ...]) -> str:
+    """Content address of a shape signature."""
+    text = json.dumps([[float(l), float(w)] for l, w in signature])
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def instance_hash(machine: Tuple[int, float, float], bins_info: Dict[str, Tuple[float, float]]) -> str:
+    text = json.dumps({"machine": list(machine), "bins": bins_info}, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class ResultStore:
+    """SQLite file of solved combinations shared by runs and pool workers.
+
+    Every process opens its own connection; WAL mode lets readers proceed
+    while another process writes. Inserts and last-use updates are buffered
+    and written in one transaction by ``flush``. Rows beyond ``max_rows`` are
+    evicted least recently used first by ``evict``.
+    """
+
+    def __init__(self, path: str, max_rows: int | None = None) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=60.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._pending: List[Tuple] = []
+        self._used: Dict[Tuple[str, str], float] = {}
+
+    def facts(self, plate: str, signature: str) -> List[Fact]:
+        rows = self.conn.execute(
+            "SELECT kind, grid, feasible, packing FROM results WHERE plate = ? AND signature = ?",
+            (plate, signature),
+        ).fetchall()
+        if rows:
+            self._used[plate, signature] = time.time()
+        return [
+            (kind, grid if grid else None, bool(feasible), json.loads(packing) if packing else None)
+            for kind, grid, feasible, packing in rows
+        ]
+
+    def add(self, plate: str, signature: str, kind: str, grid: float | None, feasible: bool,
+            packing: List[List[float]] | None, solver: str, instance: str) -> None:
+        self._pending.append((plate, signature, kind, grid or 0.0, int(feasible),
+                              json.dumps(packing) if packing else None, solver, instance, time.time()))
+        if len(self._pending) >= 1000:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending and not self._used:
+            return
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self.conn.executemany(
+                "UPDATE results SET used_at = ? WHERE plate = ? AND signature = ?",
+                [(t, plate, signature) for (plate, signature), t in self._used.items()],
+            )
+        self._pending = []
+        self._used = {}
+
+    def evict(self, max_rows: int | None = None) -> int:
+        """Drop the least recently used rows above ``max_rows``; returns how many."""
+        limit = self.max_rows if max_rows is None else max_rows
+        self.flush()
+        if limit is None:
+            return 0
+        with self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (limit,),
+            )
+        return cur.rowcount
+
+    def vacuum(self, max_rows: int | None = None) -> int:
+        evicted = self.evict(max_rows)
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.execute("VACUUM")
+        return evicted
+
+    def stats(self) -> Dict:
+        self.flush()
+        rows, feasible, plates, signatures = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(feasible), 0), COUNT(DISTINCT plate), COUNT(DISTINCT signature) FROM results"
+        ).fetchone()
+        by_kind = dict(self.conn.execute("SELECT kind, COUNT(*) FROM results GROUP BY kind").fetchall())
+        size = sum(os.path.getsize(p) for p in (self.path, self.path + '-wal') if os.path.exists(p))
+        return {
+            "Path": self.path,
+            "Rows": rows,
+            "Feasible": feasible,
+            "Infeasible": rows - feasible,
+            "Plates": plates,
+            "Signatures": signatures,
+            "Rows by Kind": by_kind,
+            "Size (MB)": round(size / 2 ** 20, 2),
+        }
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+class PlateFacts:
+    """The facts of one plate size in a ``ResultStore``, as used by
+    ``FeasibilityCache``; new facts are tagged with their solver and instance."""
+
+    def __init__(self, store: ResultStore, L: float, W: float, solver: str, instance: str) -> None:
+        self.store = store
+        self.plate = plate_key(L, W)
+        self.solver = solver
+        self.instance = instance
+
+    def facts(self, signature: Tuple[Tuple[float, float], ...]) -> List[Fact]:
+        return self.store.facts(self.plate, signature_key(signature))
+
+    def add(self, signature: Tuple[Tuple[float, float], ...], kind: str, grid: float | None, feasible: bool,
+            packing: List[List[float]] | None) -> None:
+        self.store.add(self.plate, signature_key(signature), kind, grid, feasible, packing, self.solver, self.instance)
+
+
+# keyed by pid as well: a connection must not be used across a fork
+_OPEN_STORES: Dict[Tuple[int, str], ResultStore] = {}
+
+
+def open_store(path: str) -> ResultStore:
+    """Connection to ``path`` shared by everything in this process."""
+    key = (os.getpid(), os.path.abspath(path))
+    store = _OPEN_STORES.get(key)
+    if store is None:
+        store = _OPEN_STORES[key] = ResultStore(path)
+    return store
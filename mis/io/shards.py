@@ -0,0 +1,192 @@
+import json
+import os
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+from .outputs import ensure_dir, save_json
+from .streaming import load_results
+from ..strategies.combinations import order_key
+
+# A sharded task directory (task/prepare_tasks.py --shards N):
+#
+#   manifest.json                  strategy, instances dir, shard count, task counts
+#   shard-00000-of-00004.jsonl     one task per line, same dict as the JSON array format
+#
+# Every task goes to the shard given by a CRC of (instance, machine, combo), so
+# the split is the same on every machine. Within a shard the tasks keep the
+# enumeration order and are grouped by (instance, machine).
+MANIFEST = "manifest.json"
+
+Group = Tuple[str, int, float, float, int, int]
+
+
+def shard_name(shard: int, shards: int) -> str:
+    return f"shard-{shard:05d}-of-{shards:05d}.jsonl"
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """``"i/N"`` -> (i, N), with 0 <= i < N."""
+    match = re.fullmatch(r"(\d+)/(\d+)", text.strip())
+    if match is None or not int(match[1]) < int(match[2]):
+        raise ValueError(f"Expected a shard as i/N with 0 <= i < N, got {text!r}")
+    return int(match[1]), int(match[2])
+
+
+def shard_of(instance: str, machine_id: int, combo: List[str], shards: int) -> int:
+    # crc32 rather than hash(): str hashes are salted per process
+    return zlib.crc32(f"{instance}|{machine_id}|{','.join(combo)}".encode()) % shards
+
+
+class TaskShardWriter:
+    """Streams tasks into ``shards`` line-delimited files under ``task_dir``."""
+
+    def __init__(self, task_dir: str, shards: int, manifest: Dict) -> None:
+        ensure_dir(task_dir)
+        self.task_dir = task_dir
+        self.shards = shards
+        self.manifest = dict(manifest, Shards=shards)
+        self.counts = [0] * shards
+        self._files = [open(os.path.join(task_dir, shard_name(i, shards)), 'w') for i in range(shards)]
+
+    def write(self, task: Dict) -> None:
+        i = shard_of(task['instance'], task['machine_id'], task['combination'], self.shards)
+        self._files[i].write(json.dumps(task) + "\n")
+        self.counts[i] += 1
+
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+        save_json(os.path.join(self.task_dir, MANIFEST), dict(self.manifest, Tasks=self.counts))
+
+
+def read_manifest(task_dir: str) -> Dict:
+    with open(os.path.join(task_dir, MANIFEST)) as f:
+        return json.load(f)
+
+
+def shard_groups(path: str) -> List[Group]:
+    """(instance, machine_id, L, W, byte offset, task count) of every run of
+    consecutive tasks for the same instance and machine."""
+    groups: List[List] = []
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            task = json.loads(line)
+            key = (task['instance'], task['machine_id'])
+            if not groups or tuple(groups[-1][:2]) != key:
+                groups.append([task['instance'], task['machine_id'], task['L'], task['W'], offset, 0])
+            groups[-1][5] += 1
+            offset += len(line)
+    return [tuple(g) for g in groups]
+
+
+def group_combos(path: str, offset: int, count: int) -> Iterator[List[str]]:
+    """The combinations of one group, read again from disk on every call."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for _ in range(count):
+            yield json.loads(f.readline())['combination']
+
+
+def _add_counts(total: Dict, counts: Dict) -> Dict:
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            _add_counts(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def _result_bases(mdir: str) -> List[str]:
+    """``{L}x{W}-{grid}`` of every results file in a machine directory."""
+    names = set()
+    for name in os.listdir(mdir):
+        match = re.fullmatch(r"([\d.]+x[\d.]+-[\d.e+-]+)\.jsonl?", name)
+        if match:
+            names.add(match[1])
+    return sorted(names)
+
+
+def unfinished_shards(shard_root: str) -> List[int]:
+    """Shards under ``shard_root`` whose worker has not written ``shard.json``."""
+    shards = read_manifest(shard_root)["Shards"]
+    return [i for i in range(shards) if not os.path.exists(os.path.join(shard_root, f"shard{i}", "shard.json"))]
+
+
+def merge_shards(shard_root: str, run_path: str) -> int:
+    """Combine the worker outputs ``shard_root/shard{i}`` into the standard
+    layout under ``run_path``; returns the number of machines merged.
+
+    Results are put back in enumeration order. A combo answered by the pruner
+    in one shard may have been solved in a single-node run, since the failed
+    subset can sit in another shard; the feasibility is the same.
+    """
+    manifest = read_manifest(shard_root)
+    shards = manifest["Shards"]
+    missing = unfinished_shards(shard_root)
+    if missing:
+        raise ValueError(f"Shards not finished: {', '.join(map(str, missing))}")
+
+    machines: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for i in range(shards):
+        sdir = os.path.join(shard_root, f"shard{i}")
+        for inst in sorted(os.listdir(sdir)):
+            if not os.path.isdir(os.path.join(sdir, inst)):
+                continue
+            for machine in sorted(os.listdir(os.path.join(sdir, inst))):
+                if os.path.isdir(os.path.join(sdir, inst, machine)):
+                    machines[inst, machine].append(os.path.join(sdir, inst, machine))
+
+    for (inst, machine), mdirs in machines.items():
+        out = os.path.join(run_path, inst, machine)
+        ensure_dir(out)
+        previous_log: Dict = {}
+        cache_stats: Dict = {}
+        progress: Dict = {}
+        for mdir in mdirs:
+            with open(os.path.join(mdir, "previous_log.json")) as f:
+                previous_log.update(json.load(f))
+            with open(os.path.join(mdir, "cache_stats.json")) as f:
+                _add_counts(cache_stats, json.load(f))
+            if not progress and os.path.exists(os.path.join(mdir, "progress.json")):
+                with open(os.path.join(mdir, "progress.json")) as f:
+                    progress = json.load(f)
+
+        bases = {mdir: _result_bases(mdir) for mdir in mdirs}
+        for base in sorted({b for names in bases.values() for b in names}):
+            header: Dict = {}
+            results: List[Dict] = []
+            pruned: List[Dict] = []
+            for mdir in mdirs:
+                if base not in bases[mdir]:
+                    continue
+                head, res, pr = load_results(os.path.join(mdir, base))
+                header = header or head
+                results.extend(res)
+                pruned.extend(pr)
+            key = order_key(list(header["Bins Info"]), manifest["Strategy"])
+            results.sort(key=lambda r: key(r["Combination"]))
+            pruned.sort(key=lambda r: key(r["Combination"]))
+            header.pop("Strategy", None)
+            save_json(os.path.join(out, base + ".json"), dict(header, Results=results))
+            save_json(os.path.join(out, base + "-pruned.json"), pruned)
+
+        save_json(os.path.join(out, "previous_log.json"), previous_log)
+        save_json(os.path.join(out, "cache_stats.json"), cache_stats)
+        if progress:
+            save_json(os.path.join(out, "progress.json"), progress)
+
+    totals: Dict = {}
+    for i in range(shards):
+        path = os.path.join(shard_root, f"shard{i}", "dedup_stats.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                _add_counts(totals, json.load(f))
+    totals["Machines"] = len(machines)
+    save_json(os.path.join(run_path, "dedup_stats.json"), totals)
+    with open(os.path.join(shard_root, "shard0", "run_config.json")) as f:
+        run_config = json.load(f)
+    save_json(os.path.join(run_path, "run_config.json"), dict(run_config, shards=shards))
+    return len(machines)
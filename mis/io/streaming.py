@@ -0,0 +1,213 @@
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from .outputs import save_json
+from ..strategies.combinations import order_key
+
+SortKey = Callable[[List[str]], tuple]
+
+
+class JsonResultWriter:
+    """The original writer: keeps a resolution in memory and dumps
+    ``{L}x{W}-{grid}.json`` / ``-pruned.json`` when it is closed.
+
+    With ``journal`` every entry is also streamed to ``{L}x{W}-{grid}.journal.jsonl``
+    (removed once the ``.json`` is written), which is what ``resume`` replays.
+    """
+
+    def __init__(self, path: str, header: Dict, resume: bool = False, journal: bool = False) -> None:
+        self.path = path
+        self.resolution_log = dict(header, Results=[])
+        self.resolution_log.pop("Strategy", None)
+        self.pruned_log: List[Dict] = []
+        self.journal = JsonlResultWriter(path + ".journal", header, resume=resume) if journal else None
+        if self.journal is not None:
+            self.pruned_log = [_pruned_entry(e) for e in self.journal.done.values() if _is_pruned(e)]
+
+    def replay(self, combo: List[str]) -> Dict | None:
+        entry = self.journal.replay(combo) if self.journal is not None else None
+        if entry is not None:
+            self.resolution_log["Results"].append(entry)
+        return entry
+
+    def result(self, entry: Dict) -> None:
+        self.resolution_log["Results"].append(entry)
+        if self.journal is not None:
+            self.journal.result(entry)
+
+    def pruned(self, entry: Dict) -> None:
+        self.pruned_log.append(entry)
+        if self.journal is not None:
+            self.journal.pruned(entry)
+
+    def close(self, sort_key: SortKey | None = None) -> None:
+        if sort_key is not None:
+            self.resolution_log["Results"].sort(key=lambda r: sort_key(r["Combination"]))
+            self.pruned_log.sort(key=lambda r: sort_key(r["Combination"]))
+        save_json(self.path + ".json", self.resolution_log)
+        save_json(self.path + "-pruned.json", self.pruned_log)
+        if self.journal is not None:
+            self.journal.close()
+            os.remove(self.path + ".journal.jsonl")
+            os.remove(self.path + ".journal-pruned.jsonl")
+
+
+class JsonlResultWriter:
+    """Append-only ``{L}x{W}-{grid}.jsonl`` / ``-pruned.jsonl``: a header line,
+    then one line per combo, flushed every ``flush_every`` lines or
+    ``flush_seconds``. Nothing is kept in memory.
+
+    With ``resume`` and existing files (a crashed or interrupted run), every
+    complete line is loaded for ``replay`` and a torn last line is cut off, so
+    the run continues after the last flushed combo. Lines come in completion order;
+    ``jsonl_to_json`` restores the enumeration order.
+    """
+
+    def __init__(self, path: str, header: Dict, resume: bool = False, flush_every: int = 256, flush_seconds: float = 5.0) -> None:
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.done: Dict[str, Dict] = {}
+        results = path + ".jsonl"
+        pruned = path + "-pruned.jsonl"
+        lines = _read_lines(results, truncate=True) if resume else []
+        if lines:
+            self._results = open(results, 'a')
+            # the pruned file may lag behind the results file: rebuild it
+            self._pruned = open(pruned, 'w')
+            for entry in lines[1:]:
+                self.done[str(entry["Combination"])] = entry
+                if _is_pruned(entry):
+                    self.pruned(_pruned_entry(entry))
+        else:
+            # no complete header yet: start over
+            self._results = open(results, 'w')
+            self._results.write(json.dumps(header) + "\n")
+            self._results.flush()
+            self._pruned = open(pruned, 'w')
+        self._unflushed = 0
+        self._last_flush = time.time()
+
+    def replay(self, combo: List[str]) -> Dict | None:
+        """The entry written for ``combo`` before a restart, if any."""
+        return self.done.pop(str(combo), None) if self.done else None
+
+    def _written(self) -> None:
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.time() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def result(self, entry: Dict) -> None:
+        self._results.write(json.dumps(entry) + "\n")
+        self._written()
+
+    def pruned(self, entry: Dict) -> None:
+        self._pruned.write(json.dumps(entry) + "\n")
+
+    def flush(self) -> None:
+        self._pruned.flush()
+        self._results.flush()
+        self._unflushed = 0
+        self._last_flush = time.time()
+
+    def close(self, sort_key: SortKey | None = None) -> None:
+        self.flush()
+        self._results.close()
+        self._pruned.close()
+
+
+def _is_pruned(entry: Dict) -> bool:
+    return str(entry.get("Reason", "")).startswith("Pruned")
+
+
+def _pruned_entry(entry: Dict) -> Dict:
+    return {"Combination": entry["Combination"], "Reason": entry["Reason"]}
+
+
+RESULT_WRITERS = {
+    'json': JsonResultWriter,
+    'jsonl': JsonlResultWriter,
+}
+
+
+def open_writer(output_format: str, path: str, header: Dict, resume: bool = False, checkpoint: bool = True):
+    if output_format == 'jsonl':
+        return JsonlResultWriter(path, header, resume=resume)
+    return JsonResultWriter(path, header, resume=resume, journal=checkpoint)
+
+
+def iter_results(path: str) -> Iterator[Dict]:
+    """Entries of a finished resolution, from ``path.jsonl`` or ``path.json``."""
+    if os.path.exists(path + ".jsonl"):
+        with open(path + ".jsonl") as f:
+            next(f, None)
+            for line in f:
+                if line.endswith("\n"):
+                    yield json.loads(line)
+    elif os.path.exists(path + ".json"):
+        with open(path + ".json") as f:
+            yield from json.load(f)["Results"]
+
+
+def load_results(path: str) -> Tuple[Dict, List[Dict], List[Dict]]:
+    """Header, results and pruned entries of a finished resolution in either format."""
+    if os.path.exists(path + ".jsonl"):
+        lines = _read_lines(path + ".jsonl")
+        return lines[0], lines[1:], _read_lines(path + "-pruned.jsonl")
+    with open(path + ".json") as f:
+        results = json.load(f)
+    pruned = []
+    if os.path.exists(path + "-pruned.json"):
+        with open(path + "-pruned.json") as f:
+            pruned = json.load(f)
+    return results, results.pop("Results"), pruned
+
+
+def _read_lines(path: str, truncate: bool = False) -> List[Dict]:
+    """Complete JSON lines of ``path``; with ``truncate`` a torn tail is removed."""
+    if not os.path.exists(path):
+        return []
+    entries: List[Dict] = []
+    good = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+            good += len(line)
+    if truncate and good < os.path.getsize(path):
+        with open(path, 'r+b') as f:
+            f.truncate(good)
+    return entries
+
+
+def jsonl_to_json(path: str) -> str:
+    """Convert one ``{L}x{W}-{grid}.jsonl`` (and its pruned file) to the
+    ``.json`` format, in enumeration order; returns the new results path."""
+    base = path[:-len(".jsonl")]
+    lines = _read_lines(path)
+    header, results = lines[0], lines[1:]
+    strategy = header.pop("Strategy", None)
+    pruned = _read_lines(base + "-pruned.jsonl")
+    if strategy is not None:
+        key = order_key(list(header["Bins Info"]), strategy)
+        results.sort(key=lambda r: key(r["Combination"]))
+        pruned.sort(key=lambda r: key(r["Combination"]))
+    save_json(base + ".json", dict(header, Results=results))
+    save_json(base + "-pruned.json", pruned)
+    return base + ".json"
+
+
+def convert_tree(root: str) -> List[str]:
+    """Convert every results ``.jsonl`` file below ``root``."""
+    converted = []
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            if name.endswith(".jsonl") and not name.endswith("-pruned.jsonl") and ".journal" not in name:
+                converted.append(jsonl_to_json(os.path.join(dirpath, name)))
+    return converted
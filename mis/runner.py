@@ -1,16 +1,30 @@
 import itertools
 import json
 import os
+import queue
 import time
-from dataclasses import dataclass
+from collections import Counter, OrderedDict, deque
+from dataclasses import asdict, dataclass, replace
 from multiprocessing import Pool
-from typing import Dict, List, Tuple, Iterable
+from typing import Callable, Deque, Dict, List, Set, Tuple, Iterable, Iterator
 
 from .solvers import get_solver
-from .strategies.combinations import all_subsets, dfs_order, bfs_order
+from .solvers.assumptions import AssumptionModel
+from .solvers.params import SolverParams
+from .solvers.templates import build_template, template_depends_on_grid
+from .strategies.combinations import PruneFn, all_subsets, apriori_join, dfs_order, bfs_order, order_key
 from .strategies.pruning import Pruner
-from .io.reader import read_instance
-from .io.outputs import machine_dir, load_previous_log, save_json
+from .strategies.canonical import Signature, shape_signature
+from .strategies.dominance import dominance_for
+from .strategies.feasibility import FeasibilityCache
+from .strategies.prechecks import Prechecks, prechecks_depend_on_grid
+from .strategies.mis_search import MisSearch
+from .io.reader import instance_name, list_instances, read_instance
+from .io.history import TIMEOUT_REASON
+from .io.outputs import machine_dir, run_dir, load_previous_log, save_json
+from .io.streaming import iter_results, open_writer
+from .io.result_store import PlateFacts, ResultStore, instance_hash, open_store
+from .io.shards import Group, group_combos, read_manifest, shard_groups, shard_name
 from utils.tools import calculate_resolution
 
 
@@ -21,103 +35,843 @@ class RunConfig:
     base_output: str = '../output'
     code_name: str = 'RUN'
     timeout: float | None = None
+    max_comb_size: int | None = None
+    # skip whole superset subtrees of failed combos instead of logging each as pruned
+    prune_subtrees: bool = False
+    # 'file': one pool task per instance file; 'combo': layer-wise work queue over combinations
+    schedule: str = 'file'
+    solver_params: SolverParams | None = None
+    # hint CP-SAT with the packing of a feasible one-item-smaller subset
+    warm_start: bool = True
+    # decide trivial combos with bounds / a greedy packer before calling CP-SAT
+    prechecks: bool = True
+    # infer combos from recorded ones whose parts fit inside / around theirs
+    # (mis.strategies.dominance); not for the grid relaxation
+    dominance: bool = True
+    # share shape-keyed results between machines / files with the same (L, W)
+    share_results: bool = True
+    # SQLite file of results reused across runs (None: off) and its LRU row limit
+    result_store: str | None = None
+    result_store_max_rows: int | None = None
+    # 'json': dump each resolution at its end; 'jsonl': stream lines (resumable)
+    output_format: str = 'json'
+    # journal results while solving and record finished resolutions, so that an
+    # interrupted run can be continued with resume=True in the same run directory
+    checkpoint: bool = False
+    resume: bool = False
+    # 'enumerate': check every combination; 'mis': search the minimal infeasible /
+    # maximal feasible subsets directly (MisSearch), shrinking with mis_shrink
+    mode: str = 'enumerate'
+    mis_shrink: str = 'quickxplain'
+    # per machine and resolution; the result is then marked incomplete
+    mis_time_limit: float | None = None
+    # interval solver only: check combos under assumptions on one model per machine
+    # (AssumptionModel); the core of an infeasible combo goes to the pruner and
+    # cache. Not for the combo schedule, whose layers see every subset first.
+    assumptions: bool = False
+    # build each solver model once per machine (and resolution for grid-compact)
+    # and solve combos by fixing presence literals (mis.solvers.templates);
+    # the grid model depends on the whole combo and is always rebuilt.
+    # Not for the combo schedule, whose workers solve batches with the plain solver.
+    model_templates: bool = False
 
 
-def _combinations(keys: List[str], strategy: str) -> Iterable[List[str]]:
+def _combinations(keys: List[str], strategy: str, max_size: int | None = None, prune: PruneFn | None = None) -> Iterable[List[str]]:
     s = strategy.lower()
     if s == 'dfs':
-        return dfs_order(keys)
-    if s == 'bfs':
-        return bfs_order(keys)
-    return all_subsets(keys)
+        return dfs_order(keys, max_size=max_size, prune=prune)
+    if s == 'bfs' or prune is not None:
+        return bfs_order(keys, max_size=max_size, prune=prune)
+    return all_subsets(keys, max_size=max_size)
 
 
-def _process_file(file_name: str, num_run: int, input_folder: str, config: RunConfig) -> None:
-    if not file_name.endswith('.json'):
-        return
+# Shape-keyed feasibility facts per plate size, shared by every machine and file
+# handled in this process (the combo scheduler handles all of them in the parent).
+_SHARED_FACTS: "OrderedDict[Tuple[float, float], Dict]" = OrderedDict()
+_SHARED_PLATES = 8
+
+
+def _shared_facts(L: float, W: float) -> Dict:
+    store = _SHARED_FACTS.pop((L, W), None)
+    if store is None:
+        store = {}
+    _SHARED_FACTS[L, W] = store
+    while len(_SHARED_FACTS) > _SHARED_PLATES:
+        _SHARED_FACTS.popitem(last=False)
+    return store
+
+
+_CACHE_REASONS = {
+    'resolution': "Inferred from cached result at another resolution",
+    'shape': "Inferred from cached result of a combination with identical shapes",
+    'store': "Inferred from the persistent result store",
+}
+_DOMINANCE_REASONS = {
+    True: "Inferred by part dominance from feasible combination {}",
+    False: "Inferred by part dominance from infeasible combination {}",
+}
+
+
+def _load_json(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+class _MachineRun:
+    """Per (instance, machine) bookkeeping shared by the file- and combo-level
+    schedulers: previous_log reuse, pruning, the feasibility cache and logs."""
+
+    def __init__(self, file_name: str, machine: Tuple[int, float, float], bins_info: Dict[str, Tuple[float, float]], num_run: int, config: RunConfig) -> None:
+        self.config = config
+        self.bins_info = bins_info
+        self.keys = list(bins_info.keys())
+        self.L = machine[1]
+        self.W = machine[2]
+        self.mdir = machine_dir(config.base_output, config.code_name, num_run, instance_name(file_name), machine[0])
+        self.previous_log, _ = load_previous_log(self.mdir)
+        store = _shared_facts(self.L, self.W) if config.share_results else None
+        persistent = None
+        if config.result_store:
+            persistent = PlateFacts(open_store(config.result_store), self.L, self.W, config.solver, instance_hash(machine, bins_info))
+        self.cache = FeasibilityCache(config.solver, store, owner=self.mdir, persistent=persistent, params=config.solver_params)
+        self.solver_calls = 0
+        self.dominance_inferred = 0
+        self.smaller_cores = 0
+        self.model = AssumptionModel(self.L, self.W, bins_info, config.solver_params) if config.assumptions else None
+        self.template = None
+        self.prechecks: Prechecks | None = None
+        self.cache_stats: Dict[str, Dict] = {}
+        self.resolutions = calculate_resolution(self.L, self.W)
+        progress = _load_json(os.path.join(self.mdir, "progress.json")) if config.resume else {}
+        self.completed: List[float] = progress.get("Completed Resolutions", [])
+        self.finished: bool = progress.get("Finished", False)
+        # counts of the resolutions finished before the run was interrupted
+        self.resumed_stats: Dict[str, int] = {k: v for k, v in progress.get("Dedup Stats", {}).items() if k != "Machines"}
+        if config.resume:
+            self.cache_stats = _load_json(os.path.join(self.mdir, "cache_stats.json"))
+
+    def begin(self, grid_size: float) -> None:
+        self.grid_size = grid_size
+        header = {
+            "Bins Info": self.bins_info,
+            "Grid Size": grid_size,
+            "Container Dimensions": {"Length": self.L, "Width": self.W},
+            "Strategy": self.config.strategy,
+        }
+        self.writer = open_writer(self.config.output_format, os.path.join(self.mdir, f"{self.L}x{self.W}-{grid_size}"), header,
+                                  resume=self.config.resume, checkpoint=self.config.checkpoint)
+        self.pruner = Pruner()
+        self.dominance = dominance_for(self.config.solver, self.bins_info) if self.config.dominance else None
+        if self.config.prechecks and (self.prechecks is None or prechecks_depend_on_grid(self.config.solver)):
+            self.prechecks = Prechecks(self.config.solver, self.L, self.W, self.bins_info, grid_size)
+        elif self.prechecks is not None:
+            # decisions are reported per resolution
+            self.prechecks.counts = dict.fromkeys(self.prechecks.counts, 0)
+        if self.config.model_templates and (self.template is None or template_depends_on_grid(self.config.solver)):
+            self.template = build_template(self.config.solver, self.L, self.W, self.bins_info, grid_size, self.config.solver_params)
+
+    def skip(self, grid_size: float) -> bool:
+        """True if ``grid_size`` was finished before the run was resumed; its
+        solved results are fed to the cache again for the later resolutions."""
+        if grid_size not in self.completed:
+            return False
+        self.grid_size = grid_size
+        self.pruner = Pruner()
+        self.dominance = dominance_for(self.config.solver, self.bins_info) if self.config.dominance else None
+        for entry in iter_results(os.path.join(self.mdir, f"{self.L}x{self.W}-{grid_size}")):
+            self._replay(entry["Combination"], entry)
+        return True
+
+    def bins(self, combo: List[str]) -> List[Tuple[float, float]]:
+        return [self.bins_info[k] for k in combo]
+
+    def hint(self, combo: List[str]) -> Dict[int, List[float]] | None:
+        """Packing of a feasible subset missing one item, remapped to ``combo``.
+
+        Dropping the smallest item first keeps the hard-to-place ones in the hint.
+        """
+        if not self.config.warm_start or len(combo) < 3:
+            return None
+        order = sorted(range(len(combo)), key=lambda i: self.bins_info[combo[i]][0] * self.bins_info[combo[i]][1])
+        for drop in order:
+            entry = self.previous_log.get(str(combo[:drop] + combo[drop + 1:]))
+            if entry and entry.get("Is Feasible") and entry.get("Packing Solution"):
+                # keys are ints in memory but strings once reloaded from JSON
+                return {
+                    (j if j < drop else j + 1): list(xy)
+                    for j, xy in ((int(k), v) for k, v in entry["Packing Solution"].items())
+                }
+        return None
+
+    def precheck(self, combo: List[str]) -> bool:
+        """Log ``combo`` if it can be answered without solving and return True."""
+        combo_key = str(combo)
+
+        # written before an interrupted run stopped: restore its effects only
+        entry = self.writer.replay(combo)
+        if entry is not None:
+            self._replay(combo, entry)
+            return True
+
+        # reuse existing successful results
+        if combo_key in self.previous_log and self.previous_log[combo_key].get("Is Feasible"):
+            self.writer.result({
+                "Combination": list(combo),
+                "Is Feasible": True,
+                "Packing Solution": self.previous_log[combo_key]["Packing Solution"],
+                "Max Resolution": self.previous_log[combo_key]["Max Resolution"]
+            })
+            if self.dominance is not None:
+                self.dominance.add_feasible(combo, self.previous_log[combo_key]["Packing Solution"])
+            return True
+
+        if self.pruner.should_prune(combo):
+            self.writer.pruned({
+                "Combination": list(combo),
+                "Reason": "Pruned due to failed sub-combination"
+            })
+            self.writer.result({
+                "Combination": list(combo),
+                "Is Feasible": False,
+                "Packing Solution": None,
+                "Reason": "Pruned due to failed sub-combination"
+            })
+            return True
+
+        cached = self.cache.lookup(combo, self.bins(combo), self.grid_size)
+        if cached is None:
+            return self._infer_dominance(combo) or self._run_prechecks(combo)
+        IsFeasible, PackingSol, source = cached
+        self.writer.result({
+            "Combination": list(combo),
+            "Is Feasible": IsFeasible,
+            "Packing Solution": PackingSol,
+            "Time Taken (seconds)": 0.0,
+            "Max Resolution": self.grid_size if IsFeasible else None,
+            "Reason": _CACHE_REASONS[source]
+        })
+        self._learn(combo, IsFeasible, PackingSol)
+        return True
+
+    def _infer_dominance(self, combo: List[str]) -> bool:
+        if self.dominance is None:
+            return False
+        inferred = self.dominance.infer(combo)
+        if inferred is None:
+            return False
+        IsFeasible, PackingSol, known = inferred
+        self.dominance_inferred += 1
+        self.cache.record(combo, self.bins(combo), self.grid_size, IsFeasible, PackingSol)
+        self.writer.result({
+            "Combination": list(combo),
+            "Is Feasible": IsFeasible,
+            "Packing Solution": PackingSol,
+            "Time Taken (seconds)": 0.0,
+            "Max Resolution": self.grid_size if IsFeasible else None,
+            "Reason": _DOMINANCE_REASONS[IsFeasible].format(known)
+        })
+        self._learn(combo, IsFeasible, PackingSol)
+        return True
+
+    def _run_prechecks(self, combo: List[str]) -> bool:
+        if self.prechecks is None:
+            return False
+        start = time.time()
+        verdict = self.prechecks.check(combo)
+        if verdict is None:
+            return False
+        name, IsFeasible, PackingSol = verdict
+        self.cache.record(combo, self.bins(combo), self.grid_size, IsFeasible, PackingSol)
+        self.writer.result({
+            "Combination": list(combo),
+            "Is Feasible": IsFeasible,
+            "Packing Solution": PackingSol,
+            "Time Taken (seconds)": time.time() - start,
+            "Max Resolution": self.grid_size if IsFeasible else None,
+            "Reason": f"Decided by pre-check: {name}"
+        })
+        self._learn(combo, IsFeasible, PackingSol)
+        return True
+
+    def record(self, combo: List[str], IsFeasible: bool | None, PackingSol: Dict[int, List[float]], elapsed: float,
+               core: List[str] | None = None) -> None:
+        self.solver_calls += 1
+        if IsFeasible is None:
+            # undecided within the time limit: log it, but learn nothing from it
+            self.writer.result({
+                "Combination": list(combo),
+                "Is Feasible": None,
+                "Packing Solution": None,
+                "Time Taken (seconds)": elapsed,
+                "Max Resolution": None,
+                "Reason": TIMEOUT_REASON
+            })
+            return
+        self.cache.record(combo, self.bins(combo), self.grid_size, IsFeasible, PackingSol)
+        self.writer.result({
+            "Combination": list(combo),
+            "Is Feasible": IsFeasible,
+            "Packing Solution": PackingSol,
+            "Time Taken (seconds)": elapsed,
+            "Max Resolution": self.grid_size if IsFeasible else None
+        })
+        self._learn(combo, IsFeasible, PackingSol)
+        if core is not None and len(core) < len(combo):
+            # proven infeasible as well: its supersets are pruned from now on
+            self.smaller_cores += 1
+            self.cache.record(core, self.bins(core), self.grid_size, False, {})
+            self.pruner.add_failed(core)
+            if self.dominance is not None:
+                self.dominance.add_failed(core)
+
+    def _replay(self, combo: List[str], entry: Dict) -> None:
+        IsFeasible = entry.get("Is Feasible")
+        if IsFeasible is None or str(entry.get("Reason", "")).startswith("Pruned"):
+            return
+        if IsFeasible and entry.get("Max Resolution") != self.grid_size:
+            # reused from previous_log, which is only saved when the machine finishes
+            self.previous_log.setdefault(str(combo), {
+                "Is Feasible": True,
+                "Packing Solution": entry["Packing Solution"],
+                "Max Resolution": entry["Max Resolution"]
+            })
+            return
+        PackingSol = {int(k): v for k, v in entry["Packing Solution"].items()} if IsFeasible else None
+        self.cache.record(combo, self.bins(combo), self.grid_size, IsFeasible, PackingSol)
+        self._learn(combo, IsFeasible, PackingSol)
+
+    def _learn(self, combo: List[str], IsFeasible: bool, PackingSol: Dict[int, List[float]] | None) -> None:
+        if not IsFeasible:
+            self.pruner.add_failed(combo)
+            if self.dominance is not None:
+                self.dominance.add_failed(combo)
+        else:
+            self.previous_log[str(combo)] = {
+                "Is Feasible": True,
+                "Packing Solution": PackingSol,
+                "Max Resolution": self.grid_size
+            }
+            if self.dominance is not None:
+                self.dominance.add_feasible(combo, PackingSol)
+
+    def end(self, sort_key=None) -> None:
+        self.writer.close(sort_key)
+        stats: Dict = self.cache.stats()
+        if self.prechecks is not None:
+            stats["Pre-check Decisions"] = dict(self.prechecks.counts)
+        if self.dominance is not None:
+            stats["Dominance Inferred"] = {"Feasible": self.dominance.inferred_feasible,
+                                           "Infeasible": self.dominance.inferred_infeasible}
+        self.cache_stats[str(self.grid_size)] = stats
+        if self.cache.persistent is not None:
+            self.cache.persistent.store.flush()
+        if self.config.checkpoint:
+            self.completed.append(self.grid_size)
+            self._save_progress()
+
+    def _save_progress(self) -> None:
+        save_json(os.path.join(self.mdir, "previous_log.json"), self.previous_log)
+        save_json(os.path.join(self.mdir, "cache_stats.json"), self.cache_stats)
+        if self.config.checkpoint:
+            save_json(os.path.join(self.mdir, "progress.json"), {
+                "Completed Resolutions": self.completed,
+                "Finished": self.finished,
+                "Dedup Stats": self.dedup_stats()
+            })
+
+    def finish(self) -> None:
+        self.finished = True
+        self._save_progress()
+
+    def dedup_stats(self) -> Dict[str, int]:
+        stats = Counter({
+            "Machines": 1,
+            "Lookups": self.cache.hits + self.cache.misses,
+            "Hits": self.cache.hits,
+            "Duplicate-Shape Hits": self.cache.shape_hits,
+            "Persistent Hits": self.cache.store_hits,
+            "Solver Calls": self.solver_calls,
+            "Dominance Inferred": self.dominance_inferred,
+            "Smaller Cores": self.smaller_cores,
+        })
+        stats.update(self.resumed_stats)
+        return dict(stats)
+
+
+def _process_file(file_name: str, num_run: int, input_folder: str, config: RunConfig) -> Counter:
+    totals: Counter = Counter()
     input_json_path = os.path.join(input_folder, file_name)
     result = read_instance(input_json_path)
     if result is None:
-        return
+        return totals
     machines_count, machines_info, bins_info = result
 
-    solver = get_solver(config.solver)
+    solver = get_solver(config.solver, config.solver_params)
 
     for machine in machines_info:
-        L = machine[1]
-        W = machine[2]
-
-        mdir = machine_dir(config.base_output, config.code_name, num_run, file_name.split('.')[0], machine[0])
-        previous_log, log_path = load_previous_log(mdir)
-
-        resolutions = calculate_resolution(L, W)
-        for grid_size in resolutions:
-            resolution_log = {
-                "Bins Info": bins_info,
-                "Grid Size": grid_size,
-                "Container Dimensions": {"Length": L, "Width": W},
-                "Results": []
-            }
-            pruned_log: List[Dict] = []
-            pruner = Pruner()
-
-            keys = list(bins_info.keys())
-            for combo in _combinations(keys, config.strategy):
-                combo_key = str(combo)
-
-                # reuse existing successful results
-                if combo_key in previous_log and previous_log[combo_key].get("Is Feasible"):
-                    resolution_log["Results"].append({
-                        "Combination": list(combo),
-                        "Is Feasible": True,
-                        "Packing Solution": previous_log[combo_key]["Packing Solution"],
-                        "Max Resolution": previous_log[combo_key]["Max Resolution"]
-                    })
-                    continue
+        if config.mode == 'mis':
+            totals.update(_search_machine(file_name, machine, bins_info, num_run, config, solver))
+            continue
+        run = _MachineRun(file_name, machine, bins_info, num_run, config)
+        if run.finished:
+            totals.update(run.dedup_stats())
+            continue
+        # run.begin replaces the pruner for every resolution
+        _solve_machine(run, solver, lambda: _combinations(run.keys, config.strategy, config.max_comb_size,
+                                                          run.pruner.should_prune if config.prune_subtrees else None))
+        totals.update(run.dedup_stats())
+    return totals
+
+
+def _solve_machine(run: _MachineRun, solver, combos: Callable[[], Iterable[List[str]]]) -> None:
+    """Sequential loop over the resolutions of one machine; ``combos`` is called
+    again for every resolution, after ``run.begin``."""
+    for grid_size in run.resolutions:
+        if run.skip(grid_size):
+            continue
+        run.begin(grid_size)
+        for combo in combos():
+            if run.precheck(combo):
+                continue
+            start = time.time()
+            core = None
+            if run.model is not None:
+                IsFeasible, PackingSol, core = run.model.solve(combo, timeout=run.config.timeout, hint=run.hint(combo))
+            elif run.template is not None:
+                IsFeasible, PackingSol = run.template.solve(combo, timeout=run.config.timeout, hint=run.hint(combo))
+            else:
+                IsFeasible, PackingSol = solver.solve(run.L, run.W, run.bins(combo), grid_size=grid_size, timeout=run.config.timeout,
+                                                      hint=run.hint(combo))
+            elapsed = time.time() - start
+            run.record(combo, IsFeasible, PackingSol, elapsed, core)
+        run.end()
+    run.finish()
+    _save_solver_stats(run.mdir, _take_solver_stats(solver), run.config.solver)
+
+
+def _take_solver_stats(solver) -> Dict:
+    """The counts of a portfolio / auto solver (``take_stats``) since the
+    last call; empty for the other solvers."""
+    take_stats = getattr(solver, 'take_stats', None)
+    return take_stats() if take_stats is not None else {}
+
+
+def _add_solver_stats(total: Dict, stats: Dict) -> None:
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            counts = Counter(total.get(key, {}))
+            counts.update(value)
+            total[key] = dict(counts)
+        else:
+            total[key] = total.get(key, 0) + value
 
-                if pruner.should_prune(combo):
-                    pruned_log.append({
-                        "Combination": list(combo),
-                        "Reason": "Pruned due to failed sub-combination"
-                    })
-                    resolution_log["Results"].append({
-                        "Combination": list(combo),
-                        "Is Feasible": False,
-                        "Packing Solution": None,
-                        "Reason": "Pruned due to failed sub-combination"
-                    })
-                    continue
 
-                start = time.time()
-                IsFeasible, PackingSol = solver.solve(L, W, [bins_info[k] for k in combo], grid_size=grid_size, timeout=config.timeout)
-                elapsed = time.time() - start
+def _save_solver_stats(mdir: str, stats: Dict, name: str) -> None:
+    """Add ``stats`` (``_take_solver_stats``) to the machine's ``{name}_stats.json``."""
+    if not stats:
+        return
+    path = os.path.join(mdir, f"{name}_stats.json")
+    saved = _load_json(path)
+    _add_solver_stats(saved, stats)
+    save_json(path, saved)
+
+
+# counters of a -mis.json file that go into dedup_stats.json
+_MIS_COUNTS = ("Oracle Calls", "Cache Hits", "Dominance Inferred", "Pre-check Decisions", "Solver Calls", "Smaller Cores")
+
+
+def _search_machine(file_name: str, machine: Tuple[int, float, float], bins_info: Dict[str, Tuple[float, float]], num_run: int,
+                    config: RunConfig, solver) -> Counter:
+    """``mode='mis'``: one ``{L}x{W}-{grid}-mis.json`` per resolution with the
+    minimal infeasible and maximal feasible subsets instead of a log of every
+    combination. The solver is only the oracle behind the cache and pre-checks."""
+    _, L, W = machine
+    mdir = machine_dir(config.base_output, config.code_name, num_run, instance_name(file_name), machine[0])
+    store = _shared_facts(L, W) if config.share_results else None
+    persistent = None
+    if config.result_store:
+        persistent = PlateFacts(open_store(config.result_store), L, W, config.solver, instance_hash(machine, bins_info))
+    cache = FeasibilityCache(config.solver, store, owner=mdir, persistent=persistent, params=config.solver_params)
+    model = AssumptionModel(L, W, bins_info, config.solver_params) if config.assumptions else None
+    template = None
+    prechecks = None
+    totals: Counter = Counter(Machines=1)
+    for grid_size in calculate_resolution(L, W):
+        path = os.path.join(mdir, f"{L}x{W}-{grid_size}-mis.json")
+        if config.resume and os.path.exists(path):
+            saved = _load_json(path)
+            totals.update({k: saved[k] for k in _MIS_COUNTS if k in saved})
+            continue
+        if config.prechecks and (prechecks is None or prechecks_depend_on_grid(config.solver)):
+            prechecks = Prechecks(config.solver, L, W, bins_info, grid_size)
+        if config.model_templates and (template is None or template_depends_on_grid(config.solver)):
+            template = build_template(config.solver, L, W, bins_info, grid_size, config.solver_params)
+        dominance = dominance_for(config.solver, bins_info) if config.dominance else None
+        calls = Counter()
+
+        def learn(combo: List[str], IsFeasible: bool, PackingSol: Dict[int, List[float]] | None) -> None:
+            if dominance is None:
+                return
+            if IsFeasible:
+                dominance.add_feasible(combo, PackingSol)
+            else:
+                dominance.add_failed(combo)
+
+        def oracle(combo: List[str]) -> bool | None | Tuple[bool, List[str]]:
+            bins = [bins_info[k] for k in combo]
+            cached = cache.lookup(combo, bins, grid_size)
+            if cached is not None:
+                calls["Cache Hits"] += 1
+                return cached[0]
+            inferred = dominance.infer(combo) if dominance is not None else None
+            if inferred is not None:
+                calls["Dominance Inferred"] += 1
+                IsFeasible, PackingSol, _ = inferred
+                cache.record(combo, bins, grid_size, IsFeasible, PackingSol)
+                learn(combo, IsFeasible, PackingSol)
+                return IsFeasible
+            verdict = prechecks.check(combo) if prechecks is not None else None
+            if verdict is not None:
+                calls["Pre-check Decisions"] += 1
+                _, IsFeasible, PackingSol = verdict
+            elif model is not None:
+                calls["Solver Calls"] += 1
+                IsFeasible, PackingSol, core = model.solve(combo, timeout=config.timeout)
+                if core is not None and len(core) < len(combo):
+                    calls["Smaller Cores"] += 1
+                    cache.record(combo, bins, grid_size, False, {})
+                    cache.record(core, [bins_info[k] for k in core], grid_size, False, {})
+                    learn(core, False, None)
+                    return False, core
+            elif template is not None:
+                calls["Solver Calls"] += 1
+                IsFeasible, PackingSol = template.solve(combo, timeout=config.timeout)
+            else:
+                calls["Solver Calls"] += 1
+                IsFeasible, PackingSol = solver.solve(L, W, bins, grid_size=grid_size, timeout=config.timeout)
+            if IsFeasible is not None:
+                cache.record(combo, bins, grid_size, IsFeasible, PackingSol)
+                learn(combo, IsFeasible, PackingSol)
+            return IsFeasible
+
+        start = time.time()
+        search = MisSearch(list(bins_info), oracle, max_size=config.max_comb_size, shrink=config.mis_shrink,
+                           time_limit=config.mis_time_limit)
+        mis, mss = search.run()
+        save_json(path, {
+            "Bins Info": bins_info,
+            "Grid Size": grid_size,
+            "Container Dimensions": {"Length": L, "Width": W},
+            "Max Comb Size": config.max_comb_size,
+            "Complete": search.complete,
+            "Minimal Infeasible Subsets": mis,
+            "Maximal Feasible Subsets": mss,
+            "Oracle Calls": search.oracle_calls,
+            "Inferred": search.inferred,
+            "Undecided": search.undecided,
+            "Time Taken (seconds)": time.time() - start,
+            **calls,
+        })
+        totals.update({"Oracle Calls": search.oracle_calls, **calls})
+    if persistent is not None:
+        persistent.store.flush()
+    _save_solver_stats(mdir, _take_solver_stats(solver), config.solver)
+    return totals
+
+
+class _LayeredJob:
+    """Walks one (instance, machine) through its resolutions one combination-size
+    layer at a time. Combos in the same layer never contain each other, so each
+    layer can be solved concurrently against the pruning state of the layers
+    before it, giving the same answers as the sequential loop.
+
+    Layers are streamed: only the unread rest of the layer, the combos in
+    flight and (with ``prune_subtrees``) the survivors of the layer are held."""
+
+    def __init__(self, run: _MachineRun, config: RunConfig) -> None:
+        self.run = run
+        self.config = config
+        n = len(run.keys)
+        self.top = n if config.max_comb_size is None else min(config.max_comb_size, n)
+        self.sort_key = order_key(run.keys, config.strategy)
+        self.res_idx = -1
+        self.size = self.top
+        # unread rest of the current layer, None once it is exhausted
+        self.layer: Iterator[Tuple[int, ...]] | None = None
+        # prune_subtrees: combos of the layer not pruned so far (apriori_join input)
+        self.survivors: List[Tuple[int, ...]] = []
+        self.seen: Set[Signature] = set()
+        self.pending = 0
+        # combos sharing a shape signature with one being solved in this layer
+        self.deferred: List[List[str]] = []
+        # portfolio / auto counts of the batches solved so far (_solve_batch)
+        self.solver_stats: Dict = {}
+
+    @property
+    def streaming(self) -> bool:
+        return self.layer is not None
+
+    def _next_layer(self) -> bool:
+        """Open the next layer, ending / beginning resolutions on the way;
+        False once the job is done."""
+        run = self.run
+        while self.size >= self.top:
+            if self.res_idx >= 0:
+                run.end(self.sort_key)
+            self.res_idx += 1
+            while self.res_idx < len(run.resolutions) and run.skip(run.resolutions[self.res_idx]):
+                self.res_idx += 1
+            if self.res_idx >= len(run.resolutions):
+                run.finish()
+                return False
+            run.begin(run.resolutions[self.res_idx])
+            # no layer at all when the size cap is below pairs
+            self.size = 1
+        self.size += 1
+        if self.size > 2 and self.config.prune_subtrees:
+            survivors = [idx for idx in self.survivors if not run.pruner.should_prune([run.keys[i] for i in idx])]
+            self.layer = apriori_join(survivors)
+        else:
+            self.layer = itertools.combinations(range(len(run.keys)), self.size)
+        self.survivors = []
+        self.seen = set()
+        return True
+
+    def advance(self, limit: int) -> List[List[str]] | None:
+        """Up to ``limit`` combos that need solving, read from the current layer
+        (or the next one once every result of this one is recorded). Empty while
+        only results are outstanding; None once the job is done."""
+        run = self.run
+        todo: List[List[str]] = []
+        while len(todo) < limit:
+            if self.layer is None:
+                if self.pending or todo:
+                    break
+                if self.deferred:
+                    # normally answered by the cache now; left over only after a timeout
+                    todo = [combo for combo in self.deferred if not run.precheck(combo)]
+                    self.deferred = []
+                    if todo:
+                        break
+                if not self._next_layer():
+                    return None
+                continue
+            idx = next(self.layer, None)
+            if idx is None:
+                self.layer = None
+                continue
+            combo = [run.keys[i] for i in idx]
+            if self.config.prune_subtrees and not run.pruner.should_prune(combo):
+                self.survivors.append(idx)
+            # deferred before the pre-check, so that each combo is looked up once
+            signature, _ = shape_signature(run.bins(combo))
+            if signature in self.seen:
+                self.deferred.append(combo)
+                continue
+            if run.precheck(combo):
+                continue
+            self.seen.add(signature)
+            todo.append(combo)
+        self.pending += len(todo)
+        return todo
+
+
+_WORKER_SOLVERS: Dict[Tuple[str, SolverParams | None], object] = {}
+
+
+def _solve_batch(solver_name: str, params: SolverParams | None, L: float, W: float, grid_size: float, timeout: float | None,
+                 batch: List[Tuple[List[str], List[Tuple[float, float]], Dict[int, List[float]] | None]]
+                 ) -> Tuple[List[Tuple[List[str], bool | None, Dict[int, List[float]], float]], Dict]:
+    """Solve a batch in a pool worker; also returns the solver's ``take_stats``
+    counts of the batch, which the scheduler adds up per machine."""
+    solver = _WORKER_SOLVERS.get((solver_name, params))
+    if solver is None:
+        solver = _WORKER_SOLVERS[solver_name, params] = get_solver(solver_name, params)
+    out = []
+    for combo, bins, hint in batch:
+        start = time.time()
+        IsFeasible, PackingSol = solver.solve(L, W, bins, grid_size=grid_size, timeout=timeout, hint=hint)
+        out.append((combo, IsFeasible, PackingSol, time.time() - start))
+    return out, _take_solver_stats(solver)
+
+
+# combos per task sent to the pool
+_BATCH = 32
 
-                resolution_log["Results"].append({
-                    "Combination": list(combo),
-                    "Is Feasible": IsFeasible,
-                    "Packing Solution": PackingSol,
-                    "Time Taken (seconds)": elapsed,
-                    "Max Resolution": grid_size if IsFeasible else None
-                })
 
-                if not IsFeasible:
-                    pruner.add_failed(combo)
+def _run_combo_scheduler(files: List[str], num_run: int, input_folder: str, config: RunConfig, processes: int | None) -> Counter:
+    totals: Counter = Counter()
+    procs = processes or os.cpu_count() or 1
+    target = 2 * procs
+
+    def jobs() -> Iterator[_LayeredJob]:
+        for file_name in files:
+            result = read_instance(os.path.join(input_folder, file_name))
+            if result is None:
+                continue
+            _, machines_info, bins_info = result
+            for machine in machines_info:
+                run = _MachineRun(file_name, machine, bins_info, num_run, config)
+                if run.finished:
+                    totals.update(run.dedup_stats())
                 else:
-                    previous_log[combo_key] = {
-                        "Is Feasible": True,
-                        "Packing Solution": PackingSol,
-                        "Max Resolution": grid_size
-                    }
+                    yield _LayeredJob(run, config)
+
+    waiting = jobs()
+    # jobs with unread combos in their current layer
+    active: Deque[_LayeredJob] = deque()
+    ready: Deque[Tuple[_LayeredJob, List[List[str]]]] = deque()
+    done: queue.Queue = queue.Queue()
+    inflight = 0
+
+    def schedule(job: _LayeredJob) -> None:
+        todo = job.advance(4 * procs * _BATCH)
+        if todo is None:
+            totals.update(job.run.dedup_stats())
+            _save_solver_stats(job.run.mdir, job.solver_stats, config.solver)
+            return
+        chunk = max(1, min(_BATCH, -(-len(todo) // (4 * procs))))
+        for i in range(0, len(todo), chunk):
+            ready.append((job, todo[i:i + chunk]))
+        if job.streaming:
+            active.append(job)
+
+    with Pool(processes=processes) as pool:
+        while True:
+            while inflight < target:
+                if not ready:
+                    job = active.popleft() if active else next(waiting, None)
+                    if job is None:
+                        break
+                    schedule(job)
+                    continue
+                job, batch = ready.popleft()
+                run = job.run
+                pool.apply_async(
+                    _solve_batch,
+                    (config.solver, config.solver_params, run.L, run.W, run.grid_size, config.timeout, [(c, run.bins(c), run.hint(c)) for c in batch]),
+                    callback=lambda res, job=job: done.put((job, res)),
+                    error_callback=lambda exc: done.put((None, exc)),
+                )
+                inflight += 1
+            if inflight == 0:
+                break
+            job, res = done.get()
+            if job is None:
+                raise res
+            inflight -= 1
+            results, stats = res
+            for combo, IsFeasible, PackingSol, elapsed in results:
+                job.run.record(combo, IsFeasible, PackingSol, elapsed)
+            _add_solver_stats(job.solver_stats, stats)
+            job.pending -= len(results)
+            # a streaming job is already queued in ``active``
+            if job.pending == 0 and not job.streaming:
+                schedule(job)
+    return totals
 
-            save_json(os.path.join(mdir, f"{L}x{W}-{grid_size}.json"), resolution_log)
-            save_json(os.path.join(mdir, f"{L}x{W}-{grid_size}-pruned.json"), pruned_log)
 
-        save_json(os.path.join(mdir, "previous_log.json"), previous_log)
+# settings a resumed run must share with the run it continues
+_RESUME_FIELDS = ('solver', 'strategy', 'max_comb_size', 'prune_subtrees', 'output_format', 'mode')
+# solver_params fields that change answers (the others only change timings)
+_RESUME_PARAMS = ('normal_patterns',)
+
+
+def _share_cores(config: RunConfig, processes: int | None) -> RunConfig:
+    """``config`` with the pool size in its solver params, so that portfolio / auto
+    members split the cores between the processes instead of each taking them all."""
+    params = config.solver_params or SolverParams()
+    return replace(config, solver_params=replace(params, processes=processes or os.cpu_count() or 1))
+
+
+def _check_run_config(config: RunConfig, num_run: int) -> None:
+    path = os.path.join(run_dir(config.base_output, config.code_name, num_run), "run_config.json")
+    saved = _load_json(path)
+    if config.resume and saved:
+        if not saved.get('checkpoint', True) and saved.get('mode') != 'mis':
+            raise ValueError(f"Cannot resume {config.code_name}{num_run}: it was run without checkpoints")
+        changed = [f for f in _RESUME_FIELDS if f in saved and saved[f] != getattr(config, f)]
+        if 'solver_params' in saved:
+            params = asdict(config.solver_params or SolverParams())
+            saved_params = {**asdict(SolverParams()), **(saved['solver_params'] or {})}
+            changed += [f"solver_params.{f}" for f in _RESUME_PARAMS if saved_params[f] != params[f]]
+        if changed:
+            raise ValueError(f"Cannot resume {config.code_name}{num_run} with different settings: {', '.join(changed)}")
+        return
+    save_json(path, {k: v for k, v in asdict(config).items() if k != 'resume'})
+
+
+def _sum_dedup_stats(root: str) -> None:
+    """``dedup_stats.json``: the counts of every instance folder of the run."""
+    totals: Counter = Counter()
+    for name in sorted(os.listdir(root)):
+        if name.startswith("dedup_stats-") and name.endswith(".json"):
+            totals.update(_load_json(os.path.join(root, name)))
+    save_json(os.path.join(root, "dedup_stats.json"), dict(totals))
 
 
 def run_instances(input_folder: str, num_run: int, config: RunConfig, processes: int | None = None) -> None:
-    files = [f for f in os.listdir(input_folder) if f.endswith('.json')]
-    tasks = [(f, num_run, input_folder, config) for f in files]
-    with Pool(processes=processes) as pool:
-        pool.starmap(_process_file, tasks)
+    config = _share_cores(config, processes)
+    _check_run_config(config, num_run)
+    files = list_instances(input_folder)
+    # the MIS search is sequential per machine: it always runs per file
+    if config.schedule == 'combo' and config.mode != 'mis':
+        totals = _run_combo_scheduler(files, num_run, input_folder, config, processes)
+    else:
+        tasks = [(f, num_run, input_folder, config) for f in files]
+        with Pool(processes=processes) as pool:
+            totals = Counter()
+            for counts in pool.starmap(_process_file, tasks):
+                totals.update(counts)
+    root = run_dir(config.base_output, config.code_name, num_run)
+    # one file per instance folder (solve --instances n15 n20 calls this per folder)
+    stats_path = os.path.join(root, f"dedup_stats-{os.path.basename(os.path.normpath(input_folder))}.json")
+    save_json(stats_path, dict(totals))
+    _sum_dedup_stats(root)
+    if config.result_store and config.result_store_max_rows is not None:
+        store = ResultStore(config.result_store)
+        store.evict(config.result_store_max_rows)
+        store.close()
+
+
+def _process_group(task_path: str, group: Group, instances_dir: str, shard: int, config: RunConfig) -> Counter:
+    entry, machine_id, L, W, offset, count = group
+    result = read_instance(os.path.join(instances_dir, entry))
+    if result is None:
+        return Counter()
+    _, _, bins_info = result
+    run = _MachineRun(entry, (machine_id, L, W), bins_info, shard, config)
+    if run.finished:
+        return Counter(run.dedup_stats())
+    _solve_machine(run, get_solver(config.solver, config.solver_params), lambda: group_combos(task_path, offset, count))
+    return Counter(run.dedup_stats())
+
+
+def run_shard(task_dir: str, shard: int, shards: int, config: RunConfig, processes: int | None = None) -> None:
+    """Solve shard ``shard`` of ``shards`` of a sharded task directory into
+    ``{config.base_output}/{config.code_name}{shard}``, in the usual per-machine layout.
 
+    ``config.strategy`` must be the one the tasks were enumerated with; pruning
+    only sees failed subsets from the same shard. ``merge_shards`` joins the
+    shard directories once every worker wrote its ``shard.json``.
+    """
+    manifest = read_manifest(task_dir)
+    if manifest["Shards"] != shards:
+        raise ValueError(f"{task_dir} has {manifest['Shards']} shards, not {shards}")
+    if manifest["Strategy"] != config.strategy:
+        raise ValueError(f"{task_dir} was enumerated with strategy {manifest['Strategy']}, not {config.strategy}")
+    config = _share_cores(config, processes)
+    _check_run_config(config, shard)
+    root = run_dir(config.base_output, config.code_name, shard)
+    save_json(os.path.join(config.base_output, "manifest.json"), manifest)
+
+    task_path = os.path.join(task_dir, shard_name(shard, shards))
+    tasks = [(task_path, group, manifest["Instances Dir"], shard, config) for group in shard_groups(task_path)]
+    totals: Counter = Counter()
+    with Pool(processes=processes) as pool:
+        for counts in pool.starmap(_process_group, tasks):
+            totals.update(counts)
+    save_json(os.path.join(root, "dedup_stats.json"), dict(totals))
+    save_json(os.path.join(root, "shard.json"), {"Shard": shard, "Shards": shards, "Tasks": manifest["Tasks"][shard]})
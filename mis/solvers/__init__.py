@@ -1,21 +1,36 @@
 from typing import Protocol, Dict, Any, Tuple, List
 
+from .params import SolverParams
+
 
 class Solver(Protocol):
-    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None) -> Tuple[bool, Dict[int, List[float]]]:
+    # Returns (True, packing), (False, {}) or (None, {}) when the time limit hit first.
+    # ``hint`` maps bin indices to known [x, y] positions (e.g. a packing of a
+    # feasible subset) and is passed to CP-SAT as a solution hint.
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
         ...
 
 
-def get_solver(name: str):
+def get_solver(name: str, params: SolverParams | None = None):
     name = str(name).lower()
     if name == 'grid':
         from .grid import GridSolver
-        return GridSolver()
+        return GridSolver(params)
+    if name == 'grid-compact':
+        from .grid_compact import GridCompactSolver
+        return GridCompactSolver(params)
     if name == 'interval':
         from .interval import IntervalSolver
-        return IntervalSolver()
+        return IntervalSolver(params)
     if name == 'disjunctive':
         from .disjunctive import DisjunctiveSolver
-        return DisjunctiveSolver()
+        return DisjunctiveSolver(params)
+    if name == 'portfolio':
+        from .portfolio import PortfolioSolver
+        return PortfolioSolver(params)
+    if name == 'auto':
+        from .auto import AutoSolver
+        return AutoSolver(params)
     raise ValueError(f"Unknown solver: {name}")
 
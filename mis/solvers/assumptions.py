@@ -0,0 +1,51 @@
+from typing import Dict, List, Tuple
+
+from ortools.sat.python import cp_model
+
+from .params import feasibility, make_cp_solver
+from .templates import IntervalTemplate
+
+
+class AssumptionModel(IntervalTemplate):
+    """The interval template solved under assumptions instead of fixed literals.
+
+    A combination is checked by solving under the assumptions "present" for its
+    parts and "absent" for the rest. When that is infeasible,
+    ``SufficientAssumptionsForInfeasibility`` names the parts that cannot be
+    packed together: an infeasible core, often smaller than the combo.
+
+    The interval model has no grid, so one model serves every resolution.
+    CP-SAT keeps every part in the presolved model and searches with a single
+    worker under assumptions, so a call is slower than ``IntervalSolver.solve``
+    on the combo alone; the cores are what it buys.
+    """
+
+    def solve(self, combo: List[str], timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]], List[str] | None]:
+        """(True, packing, None), (False, {}, core) or (None, {}, None); packing
+        and ``hint`` are indexed by position in ``combo`` like ``Solver.solve``."""
+        chosen = [self._index[k] for k in combo]
+        inside = set(chosen)
+        model = self.model
+        model.ClearAssumptions()
+        model.ClearHints()
+        model.AddAssumptions([self.present[i] for i in chosen])
+        model.AddAssumptions([self.present[i].Not() for i in range(len(self.keys)) if i not in inside])
+        for j, (x_val, y_val) in (hint or {}).items():
+            self._hint(chosen[j], x_val, y_val)
+
+        solver = make_cp_solver(self.params, timeout)
+        # the area bound speeds up the infeasible proofs; the default single-worker
+        # search is very slow at finding packings with the absent rectangles
+        solver.parameters.use_area_energetic_reasoning_in_no_overlap_2d = True
+        solver.parameters.search_branching = cp_model.PORTFOLIO_SEARCH
+        status = solver.Solve(model)
+        ok = feasibility(status)
+        if ok is None:
+            return None, {}, None
+        if not ok:
+            # only "present" literals matter: absent parts never make a plate infeasible
+            core = {int(lit) for lit in solver.SufficientAssumptionsForInfeasibility()}
+            found = [k for k, i in zip(combo, chosen) if self.present[i].Index() in core]
+            return False, {}, found or list(combo)
+        return True, {j: self._position(solver, i) for j, i in enumerate(chosen)}, None
@@ -0,0 +1,36 @@
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .cost_model import CostModel, combo_features
+from .params import SolverParams
+from .portfolio import parse_member
+
+
+class AutoSolver:
+    """Dispatches each combo to the solver a ``CostModel`` (trained on earlier
+    runs, ``main.py cost-model train``) predicts to be fastest. Its solvers are
+    portfolio-style specs, so only the exact continuous models are allowed.
+
+    ``take_stats`` returns and resets how often each solver was chosen.
+    """
+
+    def __init__(self, params: SolverParams | None = None) -> None:
+        from . import get_solver
+
+        self.params = params or SolverParams()
+        if not self.params.cost_model:
+            raise ValueError("The auto solver needs a cost model (--cost-model)")
+        self.model = CostModel.load(self.params.cost_model)
+        self.solvers = {spec: get_solver(*parse_member(spec, self.params)) for spec in self.model.weights}
+        self.choices: Counter = Counter()
+
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        spec, _ = self.model.choose(combo_features(L, W, bins, grid_size))
+        self.choices[spec] += 1
+        return self.solvers[spec].solve(L, W, bins, grid_size=grid_size, timeout=timeout, hint=hint)
+
+    def take_stats(self) -> Dict:
+        stats = {"Choices": {spec: self.choices[spec] for spec in self.solvers}}
+        self.choices = Counter()
+        return stats
@@ -0,0 +1,107 @@
+import json
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+FEATURES = ('bias', 'size', 'area', 'area^2', 'longest', 'widest', 'identical', 'grid')
+
+
+def combo_features(L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None) -> List[float]:
+    """Features of ``FEATURES``: combo size, area ratio, the longest / widest
+    side relative to the plate, share of parts with a twin, and resolution."""
+    area = sum(l * w for l, w in bins) / (L * W)
+    longest = max(max(l, w) for l, w in bins) / max(L, W)
+    widest = max(min(l, w) for l, w in bins) / min(L, W)
+    shapes = [tuple(sorted(b)) for b in bins]
+    identical = sum(1 for s in shapes if shapes.count(s) > 1) / len(bins)
+    grid = grid_size / min(L, W) if grid_size else 0.0
+    return [1.0, float(len(bins)), area, area * area, longest, widest, identical, grid]
+
+
+class CostModel:
+    """Per-solver ridge regression of log solve time on ``combo_features``.
+    ``choose`` is the solver with the smallest predicted time."""
+
+    def __init__(self, weights: Dict[str, List[float]], samples: Dict[str, int] | None = None) -> None:
+        self.weights = {solver: np.asarray(w, dtype=float) for solver, w in weights.items()}
+        self.samples = samples or {}
+
+    @classmethod
+    def fit(cls, timings: Iterable, ridge: float = 1e-3) -> 'CostModel':
+        """``timings``: ``mis.io.history.Timing`` records of one or more solvers."""
+        rows: Dict[str, List[List[float]]] = defaultdict(list)
+        targets: Dict[str, List[float]] = defaultdict(list)
+        for t in timings:
+            rows[t.solver].append(combo_features(t.L, t.W, t.bins, t.grid_size))
+            targets[t.solver].append(math.log(max(t.seconds, 1e-4)))
+        weights = {}
+        for solver, X in rows.items():
+            X = np.asarray(X)
+            y = np.asarray(targets[solver])
+            penalty = ridge * np.eye(X.shape[1])
+            penalty[0, 0] = 0.0
+            weights[solver] = np.linalg.solve(X.T @ X + penalty, X.T @ y).tolist()
+        return cls(weights, {solver: len(y) for solver, y in targets.items()})
+
+    def predict(self, features: List[float]) -> Dict[str, float]:
+        """Predicted seconds per solver."""
+        x = np.asarray(features)
+        return {solver: float(np.exp(x @ w)) for solver, w in self.weights.items()}
+
+    def choose(self, features: List[float]) -> Tuple[str, float]:
+        predicted = self.predict(features)
+        solver = min(predicted, key=predicted.get)
+        return solver, predicted[solver]
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump({"Features": list(FEATURES), "Samples": self.samples,
+                       "Weights": {solver: w.tolist() for solver, w in self.weights.items()}}, f, indent=4)
+
+    @classmethod
+    def load(cls, path: str) -> 'CostModel':
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("Features") != list(FEATURES):
+            raise ValueError(f"{path} was trained on other features: {data.get('Features')}")
+        return cls(data["Weights"], data.get("Samples"))
+
+
+def evaluate(model: CostModel, timings: Iterable) -> Dict:
+    """Replay combos timed for every solver of ``model``: actual total per solver,
+    and predicted vs actual total of the model's choices (plus the best possible)."""
+    by_combo: Dict[Tuple, Dict[str, float]] = defaultdict(dict)
+    shapes: Dict[Tuple, Tuple] = {}
+    for t in timings:
+        if t.solver in model.weights:
+            by_combo[t.key][t.solver] = t.seconds
+            shapes[t.key] = (t.L, t.W, t.bins, t.grid_size)
+    solvers = sorted(model.weights)
+    totals = dict.fromkeys(solvers, 0.0)
+    chosen = defaultdict(int)
+    predicted = actual = best = 0.0
+    hits = combos = 0
+    for key, seconds in by_combo.items():
+        if len(seconds) < len(solvers):
+            continue
+        combos += 1
+        for solver in solvers:
+            totals[solver] += seconds[solver]
+        choice, guess = model.choose(combo_features(*shapes[key]))
+        chosen[choice] += 1
+        predicted += guess
+        actual += seconds[choice]
+        fastest = min(seconds.values())
+        best += fastest
+        hits += seconds[choice] == fastest
+    return {
+        "Combos": combos,
+        "Actual Total by Solver": totals,
+        "Auto Choices": dict(chosen),
+        "Auto Predicted Total": predicted,
+        "Auto Actual Total": actual,
+        "Best Possible Total": best,
+        "Fastest Chosen": hits,
+    }
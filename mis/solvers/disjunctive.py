@@ -2,11 +2,66 @@ from typing import Dict, List, Tuple
 
 from ortools.sat.python import cp_model
 
+from .params import SolverParams, feasibility, make_cp_solver
+from .symmetry import add_symmetry_breaking
 from ..utils.scaling import compute_scale_factor
 
 
+def can_be_apart(a: Tuple[int, int], b: Tuple[int, int], L_i: int, W_i: int) -> Tuple[bool, bool]:
+    """Whether parts a and b fit on the plate side by side along x, and along y,
+    in some orientations. A separation that is impossible needs no literal."""
+    def orientations(d: Tuple[int, int]) -> List[Tuple[int, int]]:
+        return [(w, h) for w, h in {d, d[::-1]} if w <= L_i and h <= W_i]
+
+    pairs = [(p, q) for p in orientations(a) for q in orientations(b)]
+    return any(p[0] + q[0] <= L_i for p, q in pairs), any(p[1] + q[1] <= W_i for p, q in pairs)
+
+
+def add_separations(model: cp_model.CpModel, i: int, j: int, x: List[cp_model.IntVar], y: List[cp_model.IntVar],
+                    w_eff: List[cp_model.IntVar], h_eff: List[cp_model.IntVar],
+                    x_apart: bool = True, y_apart: bool = True) -> List[cp_model.IntVar]:
+    """Reified left/right/above/below relations of parts i < j; one must hold."""
+    options: List[cp_model.IntVar] = []
+    if x_apart:
+        left = model.NewBoolVar(f"left_{i}_{j}")
+        right = model.NewBoolVar(f"right_{i}_{j}")
+        model.Add(x[i] + w_eff[i] <= x[j]).OnlyEnforceIf(left)
+        model.Add(x[j] + w_eff[j] <= x[i]).OnlyEnforceIf(right)
+        options += [left, right]
+    if y_apart:
+        above = model.NewBoolVar(f"above_{i}_{j}")
+        below = model.NewBoolVar(f"below_{i}_{j}")
+        model.Add(y[i] + h_eff[i] <= y[j]).OnlyEnforceIf(above)
+        model.Add(y[j] + h_eff[j] <= y[i]).OnlyEnforceIf(below)
+        options += [above, below]
+    return options
+
+
+def add_axis_cumulatives(model: cp_model.CpModel, L_i: int, W_i: int, dims: List[Tuple[int, int]],
+                         x: List[cp_model.IntVar], y: List[cp_model.IntVar], w_eff: List[cp_model.IntVar], h_eff: List[cp_model.IntVar],
+                         present: List[cp_model.IntVar] | None = None) -> None:
+    """Redundant cumulatives: the parts crossing any vertical line are at most W
+    high in total, and those crossing any horizontal line at most L wide."""
+    x_intervals: List[cp_model.IntervalVar] = []
+    y_intervals: List[cp_model.IntervalVar] = []
+    for j, (w, h) in enumerate(dims):
+        x_end = model.NewIntVar(0, L_i + max(w, h), f"cx_end_{j}")
+        y_end = model.NewIntVar(0, W_i + max(w, h), f"cy_end_{j}")
+        if present is None:
+            x_intervals.append(model.NewIntervalVar(x[j], w_eff[j], x_end, f"cx_{j}"))
+            y_intervals.append(model.NewIntervalVar(y[j], h_eff[j], y_end, f"cy_{j}"))
+        else:
+            x_intervals.append(model.NewOptionalIntervalVar(x[j], w_eff[j], x_end, present[j], f"cx_{j}"))
+            y_intervals.append(model.NewOptionalIntervalVar(y[j], h_eff[j], y_end, present[j], f"cy_{j}"))
+    model.AddCumulative(x_intervals, h_eff, W_i)
+    model.AddCumulative(y_intervals, w_eff, L_i)
+
+
 class DisjunctiveSolver:
-    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None) -> Tuple[bool, Dict[int, List[float]]]:
+    def __init__(self, params: SolverParams | None = None) -> None:
+        self.params = params
+
+    def build(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None):
         all_numbers: List[float] = [L, W]
         for l_i, w_i in bins:
             all_numbers.extend([l_i, w_i])
@@ -47,31 +102,36 @@ class DisjunctiveSolver:
             model.Add(x_j + w_eff_j <= L_i)
             model.Add(y_j + h_eff_j <= W_i)
 
+        enhanced = self.params is not None and self.params.enhanced_disjunctive
         for i in range(n):
             for j in range(i + 1, n):
-                left = model.NewBoolVar(f"left_{i}_{j}")
-                right = model.NewBoolVar(f"right_{i}_{j}")
-                above = model.NewBoolVar(f"above_{i}_{j}")
-                below = model.NewBoolVar(f"below_{i}_{j}")
+                x_apart, y_apart = can_be_apart(bins_i[i], bins_i[j], L_i, W_i) if enhanced else (True, True)
+                model.AddBoolOr(add_separations(model, i, j, x, y, w_eff, h_eff, x_apart, y_apart))
+        if enhanced:
+            add_axis_cumulatives(model, L_i, W_i, bins_i, x, y, w_eff, h_eff)
 
-                model.Add(x[i] + w_eff[i] <= x[j]).OnlyEnforceIf(left)
-                model.Add(x[j] + w_eff[j] <= x[i]).OnlyEnforceIf(right)
-                model.Add(y[i] + h_eff[i] <= y[j]).OnlyEnforceIf(above)
-                model.Add(y[j] + h_eff[j] <= y[i]).OnlyEnforceIf(below)
+        if self.params is not None and self.params.symmetry_breaking:
+            add_symmetry_breaking(model, L_i, W_i, bins_i, x, y, r, w_eff, h_eff)
 
-                model.AddBoolOr([left, right, above, below])
+        return model, x, y, scale
 
-        solver = cp_model.CpSolver()
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        model, x, y, scale = self.build(L, W, bins, grid_size)
+        for j, (x_val, y_val) in (hint or {}).items():
+            model.AddHint(x[j], int(round(x_val * scale)))
+            model.AddHint(y[j], int(round(y_val * scale)))
+
+        solver = make_cp_solver(self.params, timeout)
         status = solver.Solve(model)
 
         packing: Dict[int, List[float]] = {}
-        ok = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        ok = feasibility(status)
         if ok:
             inv_scale = 1.0 / float(scale)
-            for j in range(n):
+            for j in range(len(bins)):
                 x_val = solver.Value(x[j]) * inv_scale
                 y_val = solver.Value(y[j]) * inv_scale
                 packing[j] = [x_val, y_val]
 
         return ok, packing
-
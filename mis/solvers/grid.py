@@ -1,22 +1,35 @@
 from typing import Dict, List, Tuple
 
+import numpy as np
 from ortools.sat.python import cp_model
 
-from ..utils.geometry import (
-    discretize_platform,
-    get_inner_fit_polygon,
-    get_Phi_jd,
+from .params import SolverParams, feasibility, make_cp_solver
+from ..utils.grid_geometry import (
+    discretize_axes,
+    dot_coordinates,
+    inner_fit_masks,
+    normal_axes,
+    phi_masks,
 )
 
 
 class GridSolver:
-    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None) -> Tuple[bool, Dict[int, List[float]]]:
+    def __init__(self, params: SolverParams | None = None) -> None:
+        self.params = params
+
+    def build(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None):
         if grid_size is None:
             grid_size = 1.0
 
-        # Discretize platform and compute inner-fit polygons
-        dots = discretize_platform(L, W, grid_size)
-        inner_fit_polygons = {j: get_inner_fit_polygon(dots, l, w, L, W) for j, (l, w) in enumerate(bins)}
+        # Discretize platform and compute inner-fit regions as masks
+        if self.params is not None and self.params.normal_patterns:
+            xs, ys = normal_axes(L, W, bins, grid_size)
+        else:
+            xs, ys = discretize_axes(L, W, grid_size)
+        X, Y = dot_coordinates(xs, ys)
+        ny = len(ys)
+        dots = range(len(X))
+        fits = inner_fit_masks(xs, ys, bins, L, W)
 
         # model
         model = cp_model.CpModel()
@@ -24,49 +37,55 @@ class GridSolver:
         status_list = [-1] + J
 
         # Gamma map
-        Gamma: Dict[int, set] = {}
-        for d in dots:
-            Gamma[d.ID] = set()
-            for bin_id, poly in inner_fit_polygons.items():
-                if d.ID in [p.ID for p in poly]:
-                    Gamma[d.ID].add(bin_id)
+        Gamma: Dict[int, List[int]] = {d: np.flatnonzero(fits[:, d]).tolist() for d in dots}
 
         gamma: Dict[Tuple[int, int], cp_model.IntVar] = {}
         for d in dots:
             for s in status_list:
-                gamma[d.ID, s] = model.NewBoolVar(f"gamma_d{d.ID}_s{s}")
+                gamma[d, s] = model.NewBoolVar(f"gamma_d{d}_s{s}")
 
         # each bin exactly one dot
         for j in J:
-            model.add_exactly_one(gamma[d.ID, j] for d in dots)
+            model.add_exactly_one(gamma[d, j] for d in dots)
 
         # each dot one assignment from valid set or -1
         for d in dots:
-            model.add(sum(gamma[d.ID, j] for j in J + [-1]) == 1)
-            model.add(sum(gamma[d.ID, j] for j in list(Gamma[d.ID]) + [-1]) == 1)
+            model.add(sum(gamma[d, j] for j in J + [-1]) == 1)
+            model.add(sum(gamma[d, j] for j in Gamma[d] + [-1]) == 1)
 
         # Phi implications
-        Phi = {}
+        phi = [phi_masks(xs, ys, bins, j) for j in J]
         for d in dots:
+            a, b = divmod(d, ny)
             for j in J:
-                Phi[j, d.ID] = list(get_Phi_jd(dots, bins, j, d))
-
-        for d in dots:
-            for j in J:
-                for dd in dots:
-                    if d.ID != dd.ID and dd.ID in Phi[j, d.ID]:
-                        model.AddImplication(gamma[d.ID, j], gamma[dd.ID, -1])
-
-        solver = cp_model.CpSolver()
+                mx, my = phi[j]
+                cols_x = np.flatnonzero(mx[a])
+                cols_y = np.flatnonzero(my[b])
+                for dd in (cols_x[:, None] * ny + cols_y[None, :]).ravel().tolist():
+                    if dd != d:
+                        model.AddImplication(gamma[d, j], gamma[dd, -1])
+
+        return model, gamma, X, Y
+
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        model, gamma, X, Y = self.build(L, W, bins, grid_size)
+        if hint:
+            dot_at = {(round(float(x), 9), round(float(y), 9)): d for d, (x, y) in enumerate(zip(X, Y))}
+            for j, (x_val, y_val) in hint.items():
+                d = dot_at.get((round(x_val, 9), round(y_val, 9)))
+                if d is not None:
+                    model.AddHint(gamma[d, j], 1)
+
+        solver = make_cp_solver(self.params, timeout)
         status = solver.Solve(model)
 
         packing: Dict[int, List[float]] = {}
-        ok = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        ok = feasibility(status)
         if ok:
-            for d in dots:
-                for s in status_list:
-                    if solver.Value(gamma[d.ID, s]) == 1 and s >= 0:
-                        packing[s] = [d.x, d.y]
+            for d in range(len(X)):
+                for s in range(len(bins)):
+                    if solver.Value(gamma[d, s]) == 1:
+                        packing[s] = [float(X[d]), float(Y[d])]
 
         return ok, packing
-
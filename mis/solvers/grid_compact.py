@@ -0,0 +1,103 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .params import SolverParams, feasibility, make_cp_solver
+from ..utils.grid_geometry import discretize_axes, normal_axes
+
+
+def _axis_cover(coords: np.ndarray, size: float, limit: float) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Feasible start indices along one axis and, for every cell, the starts
+    whose extent covers it. Items start on grid points, so one covering cell
+    ``[c, c + g)`` means the item spans ``c <= cell < c + size``.
+
+    With normal patterns the cells are the candidate starts only: two placed
+    rectangles overlap iff both cover the point at their larger x and larger y,
+    and those are candidate starts."""
+    fit = np.flatnonzero(coords + size <= limit)
+    cells = coords[coords < limit]
+    starts = coords[fit]
+    covers = (starts[:, None] <= cells[None, :]) & (cells[None, :] < starts[:, None] + size)
+    return fit, [fit[covers[:, a]] for a in range(len(cells))]
+
+
+class GridCompactSolver:
+    """Grid placement model with one Bool per (bin, inner-fit dot) and an
+    ``AtMostOne`` per grid cell over the placements covering it.
+
+    Dots and packings follow ``GridSolver`` (same grid, no rotation), but
+    non-overlap is exact for every pair of bins rather than derived from the
+    intersection of all no-fit regions.
+    """
+
+    def __init__(self, params: SolverParams | None = None) -> None:
+        self.params = params
+
+    def build(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None):
+        if grid_size is None:
+            grid_size = 1.0
+
+        if self.params is not None and self.params.normal_patterns:
+            xs, ys = normal_axes(L, W, bins, grid_size)
+        else:
+            xs, ys = discretize_axes(L, W, grid_size)
+        ny = len(ys)
+        model = cp_model.CpModel()
+
+        place: Dict[Tuple[int, int], cp_model.IntVar] = {}
+        cover_x: List[List[np.ndarray]] = []
+        cover_y: List[List[np.ndarray]] = []
+        for j, (l, w) in enumerate(bins):
+            fit_x, cx = _axis_cover(xs, l, L)
+            fit_y, cy = _axis_cover(ys, w, W)
+            cover_x.append(cx)
+            cover_y.append(cy)
+            choices = []
+            for a in fit_x.tolist():
+                for b in fit_y.tolist():
+                    d = a * ny + b
+                    place[j, d] = model.NewBoolVar(f"p_j{j}_d{d}")
+                    choices.append(place[j, d])
+            # a bin without any inner-fit dot leaves the model infeasible
+            model.add_exactly_one(choices)
+
+        n_cells_x = len(cover_x[0]) if bins else 0
+        n_cells_y = len(cover_y[0]) if bins else 0
+        for a in range(n_cells_x):
+            for b in range(n_cells_y):
+                terms = [
+                    place[j, sx * ny + sy]
+                    for j in range(len(bins))
+                    for sx in cover_x[j][a].tolist()
+                    for sy in cover_y[j][b].tolist()
+                ]
+                if len(terms) > 1:
+                    model.AddAtMostOne(terms)
+
+        return model, place, xs, ys
+
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        model, place, xs, ys = self.build(L, W, bins, grid_size)
+        ny = len(ys)
+        if hint:
+            ix = {round(float(v), 9): a for a, v in enumerate(xs)}
+            iy = {round(float(v), 9): b for b, v in enumerate(ys)}
+            for j, (x_val, y_val) in hint.items():
+                a, b = ix.get(round(x_val, 9)), iy.get(round(y_val, 9))
+                if a is not None and b is not None and (j, a * ny + b) in place:
+                    model.AddHint(place[j, a * ny + b], 1)
+
+        solver = make_cp_solver(self.params, timeout)
+        status = solver.Solve(model)
+
+        packing: Dict[int, List[float]] = {}
+        ok = feasibility(status)
+        if ok:
+            for (j, d), var in place.items():
+                if solver.Value(var) == 1:
+                    a, b = divmod(d, ny)
+                    packing[j] = [float(xs[a]), float(ys[b])]
+
+        return ok, packing
@@ -2,11 +2,16 @@ from typing import Dict, List, Tuple
 
 from ortools.sat.python import cp_model
 
+from .params import SolverParams, feasibility, make_cp_solver
+from .symmetry import add_symmetry_breaking
 from ..utils.scaling import compute_scale_factor
 
 
 class IntervalSolver:
-    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None) -> Tuple[bool, Dict[int, List[float]]]:
+    def __init__(self, params: SolverParams | None = None) -> None:
+        self.params = params
+
+    def build(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None):
         all_numbers: List[float] = [L, W]
         for l_i, w_i in bins:
             all_numbers.extend([l_i, w_i])
@@ -64,15 +69,26 @@ class IntervalSolver:
             y_intervals.append(y_iv)
 
         model.AddNoOverlap2D(x_intervals, y_intervals)
+        if self.params is not None and self.params.symmetry_breaking:
+            add_symmetry_breaking(model, L_i, W_i, bins_i, x_starts, y_starts, rot_vars, w_eff_vars, h_eff_vars)
+
+        return model, x_starts, y_starts, scale
+
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        model, x_starts, y_starts, scale = self.build(L, W, bins, grid_size)
+        for i, (x_val, y_val) in (hint or {}).items():
+            model.AddHint(x_starts[i], int(round(x_val * scale)))
+            model.AddHint(y_starts[i], int(round(y_val * scale)))
 
-        solver = cp_model.CpSolver()
+        solver = make_cp_solver(self.params, timeout)
         status = solver.Solve(model)
 
         packing: Dict[int, List[float]] = {}
-        ok = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        ok = feasibility(status)
         if ok:
             inv_scale = 1.0 / float(scale)
-            for i in range(num_bins):
+            for i in range(len(bins)):
                 x_val = solver.Value(x_starts[i]) * inv_scale
                 y_val = solver.Value(y_starts[i]) * inv_scale
                 packing[i] = [x_val, y_val]
@@ -0,0 +1,74 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Tuple
+
+# ortools is imported lazily so that SolverParams can be used in configs
+# without pulling in the solver stack.
+logger = logging.getLogger('mis.solvers')
+# a racing portfolio sets ``register`` in its member threads to see (and stop)
+# every CpSolver they create
+_watch = threading.local()
+
+
+@dataclass(frozen=True)
+class SolverParams:
+    """CP-SAT parameters shared by every solver. ``None`` keeps the CP-SAT default."""
+    time_limit: float | None = None
+    num_workers: int | None = None
+    random_seed: int | None = None
+    presolve: bool | None = None
+    log_search: bool = False
+    # interval / disjunctive: add symmetry-breaking constraints (mis.solvers.symmetry)
+    symmetry_breaking: bool = False
+    # disjunctive: redundant cumulative per axis, no literals for impossible separations
+    enhanced_disjunctive: bool = False
+    # grid / grid-compact: place parts only at normal patterns (mis.utils.grid_geometry.normal_axes)
+    normal_patterns: bool = False
+    # portfolio: member specs (mis.solvers.portfolio), empty for the defaults
+    portfolio: Tuple[str, ...] = ()
+    # auto: cost model file (mis.solvers.cost_model) that picks a solver per combo
+    cost_model: str | None = None
+    # portfolio / auto: solver processes sharing the cores (set by the runner's pool)
+    processes: int = 1
+
+
+def make_cp_solver(params: SolverParams | None, timeout: float | None = None):
+    # ``timeout`` is the per-call override passed to ``solve``
+    from ortools.sat.python import cp_model
+
+    params = params or SolverParams()
+    solver = cp_model.CpSolver()
+    time_limit = timeout if timeout is not None else params.time_limit
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = float(time_limit)
+    if params.num_workers is not None:
+        solver.parameters.num_workers = int(params.num_workers)
+    if params.random_seed is not None:
+        solver.parameters.random_seed = int(params.random_seed)
+    if params.presolve is not None:
+        solver.parameters.cp_model_presolve = bool(params.presolve)
+    if params.log_search:
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = logger.info
+    register = getattr(_watch, 'register', None)
+    if register is not None:
+        register(solver)
+    return solver
+
+
+def feasibility(status: int) -> bool | None:
+    """Tri-state answer: True/False when CP-SAT proved it, None when it stopped
+    early (time limit) without deciding. An invalid model raises ValueError
+    rather than passing for a timeout."""
+    from ortools.sat import cp_model_pb2
+    from ortools.sat.python import cp_model
+
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return True
+    if status == cp_model.INFEASIBLE:
+        return False
+    if status == cp_model.UNKNOWN:
+        return None
+    raise ValueError(f"CP-SAT returned {cp_model_pb2.CpSolverStatus.Name(status)}")
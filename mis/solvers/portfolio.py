@@ -0,0 +1,123 @@
+import os
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import replace
+from typing import Dict, List, Sequence, Tuple
+
+from . import params as _params
+from .params import SolverParams
+
+DEFAULT_MEMBERS = ('interval', 'disjunctive', 'interval:symmetry')
+# only exact models with the same answers: the grid models depend on the
+# resolution (and ``grid`` is a relaxation), so the winner would change results
+MEMBER_SOLVERS = ('interval', 'disjunctive')
+
+
+def parse_member(spec: str, base: SolverParams, share: int = 1) -> Tuple[str, SolverParams]:
+    """``name[:option,...]`` -> (solver name, its params). Options: ``seed=N``,
+    ``workers=N``, ``symmetry``, ``enhanced`` (disjunctive), ``no-presolve``.
+    Without ``workers`` a member gets ``base.num_workers`` or 1/``share`` of the
+    cores left to each of the ``base.processes`` pool processes."""
+    name, _, options = spec.partition(':')
+    name = name.strip().lower()
+    if name not in MEMBER_SOLVERS:
+        raise ValueError(f"Portfolio member must be one of {', '.join(MEMBER_SOLVERS)}: {spec}")
+    workers = base.num_workers or max(1, (os.cpu_count() or 1) // (share * base.processes))
+    changes = dict(num_workers=workers, portfolio=())
+    for option in filter(None, (o.strip() for o in options.split(','))):
+        key, _, value = option.partition('=')
+        if key == 'seed' and value:
+            changes['random_seed'] = int(value)
+        elif key == 'workers' and value:
+            changes['num_workers'] = int(value)
+        elif key == 'symmetry':
+            changes['symmetry_breaking'] = True
+        elif key == 'enhanced' and name == 'disjunctive':
+            changes['enhanced_disjunctive'] = True
+        elif key == 'no-presolve':
+            changes['presolve'] = False
+        else:
+            raise ValueError(f"Unknown portfolio option '{option}' in {spec}")
+    return name, replace(base, **changes)
+
+
+class _Race:
+    """CpSolvers created by the members of one combo's race."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._solvers: List = []
+        self.cancelled = False
+
+    def register(self, solver) -> None:
+        with self._lock:
+            if self.cancelled:
+                solver.parameters.max_time_in_seconds = 0.0
+            else:
+                self._solvers.append(solver)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            for solver in self._solvers:
+                # a member that has not started yet sees the limit, a running one the stop
+                solver.parameters.max_time_in_seconds = 0.0
+                solver.StopSearch()
+
+    def run(self, member, *args, **kwargs):
+        _params._watch.register = self.register
+        try:
+            return member.solve(*args, **kwargs)
+        finally:
+            _params._watch.register = None
+
+
+class PortfolioSolver:
+    """Races several solvers (models, seeds or CP-SAT settings) on each combo in
+    threads; the first proved answer is returned and the other members are
+    stopped. Members are ``SolverParams.portfolio`` specs (``parse_member``).
+
+    ``wins`` counts the combos each member decided first; ``take_stats``
+    returns and resets them together with the undecided count.
+    """
+
+    def __init__(self, params: SolverParams | None = None, members: Sequence[str] | None = None) -> None:
+        from . import get_solver
+
+        self.params = params or SolverParams()
+        specs = list(members or self.params.portfolio or DEFAULT_MEMBERS)
+        self.members = [(spec, get_solver(*parse_member(spec, self.params, len(specs)))) for spec in specs]
+        self.wins: Counter = Counter()
+        self.undecided = 0
+        self._pool = ThreadPoolExecutor(max_workers=len(self.members), thread_name_prefix='portfolio')
+
+    def solve(self, L: float, W: float, bins: List[Tuple[float, float]], grid_size: float | None = None, timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        race = _Race()
+        pending = {self._pool.submit(race.run, member, L, W, bins, grid_size=grid_size, timeout=timeout, hint=hint): spec
+                   for spec, member in self.members}
+        answer: Tuple[bool | None, Dict[int, List[float]]] = (None, {})
+        try:
+            while pending and answer[0] is None:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = pending.pop(future)
+                    ok, packing = future.result()
+                    if ok is not None and answer[0] is None:
+                        answer = (ok, packing)
+                        self.wins[spec] += 1
+        finally:
+            race.cancel()
+            # the stopped members return within milliseconds; wait so that they
+            # do not compete with the next combo
+            wait(pending)
+        if answer[0] is None:
+            self.undecided += 1
+        return answer
+
+    def take_stats(self) -> Dict:
+        stats = {"Wins": {spec: self.wins[spec] for spec, _ in self.members}, "Undecided": self.undecided}
+        self.wins = Counter()
+        self.undecided = 0
+        return stats
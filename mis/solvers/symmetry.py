@@ -0,0 +1,38 @@
+from typing import Dict, List, Tuple
+
+from ortools.sat.python import cp_model
+
+
+def add_symmetry_breaking(model: cp_model.CpModel, L_i: int, W_i: int, dims: List[Tuple[int, int]],
+                          x: List[cp_model.IntVar], y: List[cp_model.IntVar], r: List[cp_model.IntVar],
+                          w_eff: List[cp_model.IntVar], h_eff: List[cp_model.IntVar]) -> None:
+    """Constraints that only remove layouts equivalent to remaining ones, so the
+    answer is unchanged (scaled integer model of ``IntervalSolver`` /
+    ``DisjunctiveSolver``).
+
+    - rotation of a square part, or of a part that fits the plate one way only, is fixed
+    - identical parts (same sides, any orientation) are placed in (x, y) order
+    - the largest part without an identical copy has its centre in the lower-left
+      quadrant (mirroring the layout); on a square plate it is also unrotated
+      (transposing the layout)
+    """
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, (w, h) in enumerate(dims):
+        if w == h or h > L_i or w > W_i:
+            model.Add(r[i] == 0)
+        elif w > L_i or h > W_i:
+            model.Add(r[i] == 1)
+        groups.setdefault((min(w, h), max(w, h)), []).append(i)
+
+    for members in groups.values():
+        for i, j in zip(members, members[1:]):
+            model.Add(x[i] * (W_i + 1) + y[i] <= x[j] * (W_i + 1) + y[j])
+
+    unique = [members[0] for members in groups.values() if len(members) == 1]
+    if not unique:
+        return
+    k = max(unique, key=lambda i: dims[i][0] * dims[i][1])
+    model.Add(2 * x[k] + w_eff[k] <= L_i)
+    model.Add(2 * y[k] + h_eff[k] <= W_i)
+    if L_i == W_i:
+        model.Add(r[k] == 0)
@@ -0,0 +1,220 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from .params import SolverParams, feasibility, make_cp_solver
+from ..utils.grid_geometry import discretize_axes, normal_axes
+from ..utils.scaling import compute_scale_factor
+
+
+class ModelTemplate(ABC):
+    """A solver's model of *all* parts of an instance on one plate, built once.
+
+    Every part has a presence literal; a combination is solved by fixing the
+    literals of its parts to 1 and of the others to 0, and CP-SAT's presolve
+    removes the absent parts. The per-combo cost is setting those bounds
+    instead of building a model, and the answers are those of ``solve`` on the
+    combo alone. ``solve`` takes and returns combo positions like ``Solver.solve``.
+    """
+
+    def __init__(self, bins_info: Dict[str, Tuple[float, float]], params: SolverParams | None = None) -> None:
+        self.params = params
+        self.keys = list(bins_info)
+        self._index = {k: i for i, k in enumerate(self.keys)}
+        self.model = cp_model.CpModel()
+        self.present = [self.model.NewBoolVar(f"p_{i}") for i in range(len(self.keys))]
+
+    @abstractmethod
+    def _hint(self, i: int, x_val: float, y_val: float) -> None:
+        """Hint part ``i`` at combo position ``(x_val, y_val)``."""
+
+    @abstractmethod
+    def _position(self, solver: cp_model.CpSolver, i: int) -> List[float]:
+        """Combo position of part ``i`` in the solution of ``solver``."""
+
+    def _fix(self, chosen: List[int]) -> None:
+        inside = set(chosen)
+        variables = self.model.Proto().variables
+        for i, p in enumerate(self.present):
+            # a Bool's domain is the single interval [lo, hi]
+            domain = variables[p.Index()].domain
+            domain[0] = domain[1] = 1 if i in inside else 0
+
+    def solve(self, combo: List[str], timeout: float | None = None,
+              hint: Dict[int, List[float]] | None = None) -> Tuple[bool | None, Dict[int, List[float]]]:
+        chosen = [self._index[k] for k in combo]
+        self._fix(chosen)
+        self.model.ClearHints()
+        for j, (x_val, y_val) in (hint or {}).items():
+            self._hint(chosen[j], x_val, y_val)
+
+        solver = make_cp_solver(self.params, timeout)
+        status = solver.Solve(self.model)
+        ok = feasibility(status)
+        packing: Dict[int, List[float]] = {}
+        if ok:
+            packing = {j: self._position(solver, i) for j, i in enumerate(chosen)}
+        return ok, packing
+
+
+class _ScaledTemplate(ModelTemplate):
+    """Integer model: one scale factor for the plate and every part."""
+
+    def __init__(self, L: float, W: float, bins_info: Dict[str, Tuple[float, float]], params: SolverParams | None = None) -> None:
+        super().__init__(bins_info, params)
+        all_numbers: List[float] = [L, W]
+        for l_i, w_i in bins_info.values():
+            all_numbers.extend([l_i, w_i])
+        self.scale = compute_scale_factor(all_numbers)
+        self.L_i = int(round(L * self.scale))
+        self.W_i = int(round(W * self.scale))
+        self.dims = [(int(round(l * self.scale)), int(round(w * self.scale))) for l, w in bins_info.values()]
+        self.x: List[cp_model.IntVar] = []
+        self.y: List[cp_model.IntVar] = []
+        self.w_eff: List[cp_model.IntVar] = []
+        self.h_eff: List[cp_model.IntVar] = []
+        model = self.model
+        for i, (w, h) in enumerate(self.dims):
+            p = self.present[i]
+            r = model.NewBoolVar(f"r_{i}")
+            w_eff = model.NewIntVar(min(w, h), max(w, h), f"w_eff_{i}")
+            h_eff = model.NewIntVar(min(w, h), max(w, h), f"h_eff_{i}")
+            model.Add(w_eff == w).OnlyEnforceIf(r.Not())
+            model.Add(h_eff == h).OnlyEnforceIf(r.Not())
+            model.Add(w_eff == h).OnlyEnforceIf(r)
+            model.Add(h_eff == w).OnlyEnforceIf(r)
+            # an absent part may lie outside the plate: a part that never fits
+            # must not make every combination infeasible
+            x = model.NewIntVar(0, self.L_i, f"x_{i}")
+            y = model.NewIntVar(0, self.W_i, f"y_{i}")
+            model.Add(x + w_eff <= self.L_i).OnlyEnforceIf(p)
+            model.Add(y + h_eff <= self.W_i).OnlyEnforceIf(p)
+            self.x.append(x)
+            self.y.append(y)
+            self.w_eff.append(w_eff)
+            self.h_eff.append(h_eff)
+
+    def _hint(self, i: int, x_val: float, y_val: float) -> None:
+        self.model.AddHint(self.x[i], int(round(x_val * self.scale)))
+        self.model.AddHint(self.y[i], int(round(y_val * self.scale)))
+
+    def _position(self, solver: cp_model.CpSolver, i: int) -> List[float]:
+        inv_scale = 1.0 / float(self.scale)
+        return [solver.Value(self.x[i]) * inv_scale, solver.Value(self.y[i]) * inv_scale]
+
+
+class IntervalTemplate(_ScaledTemplate):
+    """``IntervalSolver`` with optional intervals in the ``AddNoOverlap2D``."""
+
+    def __init__(self, L: float, W: float, bins_info: Dict[str, Tuple[float, float]], params: SolverParams | None = None) -> None:
+        super().__init__(L, W, bins_info, params)
+        model = self.model
+        x_intervals: List[cp_model.IntervalVar] = []
+        y_intervals: List[cp_model.IntervalVar] = []
+        for i, (w, h) in enumerate(self.dims):
+            x_end = model.NewIntVar(0, self.L_i + max(w, h), f"x_end_{i}")
+            y_end = model.NewIntVar(0, self.W_i + max(w, h), f"y_end_{i}")
+            x_intervals.append(model.NewOptionalIntervalVar(self.x[i], self.w_eff[i], x_end, self.present[i], f"x_iv_{i}"))
+            y_intervals.append(model.NewOptionalIntervalVar(self.y[i], self.h_eff[i], y_end, self.present[i], f"y_iv_{i}"))
+        model.AddNoOverlap2D(x_intervals, y_intervals)
+
+
+class DisjunctiveTemplate(_ScaledTemplate):
+    """``DisjunctiveSolver`` with each pair's disjunction enforced only when
+    both parts are present (and optional intervals in the enhanced cumulatives)."""
+
+    def __init__(self, L: float, W: float, bins_info: Dict[str, Tuple[float, float]], params: SolverParams | None = None) -> None:
+        super().__init__(L, W, bins_info, params)
+        from .disjunctive import add_axis_cumulatives, add_separations, can_be_apart
+
+        model = self.model
+        x, y, w_eff, h_eff = self.x, self.y, self.w_eff, self.h_eff
+        enhanced = params is not None and params.enhanced_disjunctive
+        n = len(self.dims)
+        for i in range(n):
+            for j in range(i + 1, n):
+                x_apart, y_apart = can_be_apart(self.dims[i], self.dims[j], self.L_i, self.W_i) if enhanced else (True, True)
+                options = add_separations(model, i, j, x, y, w_eff, h_eff, x_apart, y_apart)
+                model.AddBoolOr(options).OnlyEnforceIf([self.present[i], self.present[j]])
+        if enhanced:
+            add_axis_cumulatives(model, self.L_i, self.W_i, self.dims, x, y, w_eff, h_eff, self.present)
+
+
+class GridCompactTemplate(ModelTemplate):
+    """``GridCompactSolver`` for one resolution: an absent part takes no
+    placement, so the cell ``AtMostOne`` constraints hold for every combo."""
+
+    def __init__(self, L: float, W: float, bins_info: Dict[str, Tuple[float, float]], grid_size: float | None = None,
+                 params: SolverParams | None = None) -> None:
+        from .grid_compact import _axis_cover
+
+        super().__init__(bins_info, params)
+        if grid_size is None:
+            grid_size = 1.0
+        if params is not None and params.normal_patterns:
+            # patterns of all parts cover those of every combo
+            self.xs, self.ys = normal_axes(L, W, list(bins_info.values()), grid_size)
+        else:
+            self.xs, self.ys = discretize_axes(L, W, grid_size)
+        ny = len(self.ys)
+        model = self.model
+        self.place: List[Dict[int, cp_model.IntVar]] = []
+        cover_x: List[List[np.ndarray]] = []
+        cover_y: List[List[np.ndarray]] = []
+        for j, (l, w) in enumerate(bins_info.values()):
+            fit_x, cx = _axis_cover(self.xs, l, L)
+            fit_y, cy = _axis_cover(self.ys, w, W)
+            cover_x.append(cx)
+            cover_y.append(cy)
+            place = {a * ny + b: model.NewBoolVar(f"p_j{j}_d{a * ny + b}") for a in fit_x.tolist() for b in fit_y.tolist()}
+            # no inner-fit dot: the part can only be absent
+            model.Add(sum(place.values()) == self.present[j])
+            self.place.append(place)
+
+        n_cells_x = len(cover_x[0]) if cover_x else 0
+        n_cells_y = len(cover_y[0]) if cover_y else 0
+        for a in range(n_cells_x):
+            for b in range(n_cells_y):
+                terms = [
+                    self.place[j][sx * ny + sy]
+                    for j in range(len(self.place))
+                    for sx in cover_x[j][a].tolist()
+                    for sy in cover_y[j][b].tolist()
+                ]
+                if len(terms) > 1:
+                    model.AddAtMostOne(terms)
+
+    def _hint(self, i: int, x_val: float, y_val: float) -> None:
+        ny = len(self.ys)
+        a = np.flatnonzero(np.isclose(self.xs, x_val, rtol=0, atol=1e-9))
+        b = np.flatnonzero(np.isclose(self.ys, y_val, rtol=0, atol=1e-9))
+        if len(a) and len(b) and int(a[0]) * ny + int(b[0]) in self.place[i]:
+            self.model.AddHint(self.place[i][int(a[0]) * ny + int(b[0])], 1)
+
+    def _position(self, solver: cp_model.CpSolver, i: int) -> List[float]:
+        ny = len(self.ys)
+        for d, var in self.place[i].items():
+            if solver.Value(var) == 1:
+                a, b = divmod(d, ny)
+                return [float(self.xs[a]), float(self.ys[b])]
+        return []
+
+
+def build_template(solver: str, L: float, W: float, bins_info: Dict[str, Tuple[float, float]], grid_size: float | None = None,
+                   params: SolverParams | None = None) -> ModelTemplate | None:
+    """Template for ``solver``, or None when its model depends on the whole
+    combination (``grid``: the no-fit regions use the smallest other part)."""
+    name = str(solver).lower()
+    if name == 'interval':
+        return IntervalTemplate(L, W, bins_info, params)
+    if name == 'disjunctive':
+        return DisjunctiveTemplate(L, W, bins_info, params)
+    if name == 'grid-compact':
+        return GridCompactTemplate(L, W, bins_info, grid_size, params)
+    return None
+
+
+def template_depends_on_grid(solver: str) -> bool:
+    return str(solver).lower() == 'grid-compact'
@@ -0,0 +1,20 @@
+from typing import List, Tuple
+
+Shape = Tuple[float, float]
+Signature = Tuple[Shape, ...]
+
+
+def shape_signature(bins: List[Tuple[float, float]]) -> Tuple[Signature, List[int]]:
+    """Sorted multiset of the ``(l, w)`` shapes of a combination and the slot of
+    each item in it. Combinations with equal signatures are the same packing
+    problem up to relabelling the items, e.g. copies ``"3-1"`` and ``"3-2"``.
+
+    Shapes keep their orientation so that facts stay comparable between the
+    rotating and non-rotating models.
+    """
+    shapes = [(b[0], b[1]) for b in bins]
+    order = sorted(range(len(shapes)), key=shapes.__getitem__)
+    slots = [0] * len(shapes)
+    for s, i in enumerate(order):
+        slots[i] = s
+    return tuple(shapes[i] for i in order), slots
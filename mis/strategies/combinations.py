@@ -1,35 +1,101 @@
 import itertools
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple
 
+# Called with a (partial) combination; returning True means it is known to be
+# infeasible, so the enumerator skips it together with all of its supersets.
+PruneFn = Callable[[List[str]], bool]
 
-def all_subsets(keys: List[str]) -> Iterable[List[str]]:
-    for r in range(2, len(keys) + 1):
+
+def all_subsets(keys: List[str], min_size: int = 2, max_size: int | None = None) -> Iterable[List[str]]:
+    top = len(keys) if max_size is None else min(max_size, len(keys))
+    for r in range(max(min_size, 1), top + 1):
         for combo in itertools.combinations(keys, r):
             yield list(combo)
 
 
-def dfs_order(keys: List[str]) -> Iterable[List[str]]:
+def dfs_order(keys: List[str], min_size: int = 2, max_size: int | None = None, prune: PruneFn | None = None) -> Iterator[List[str]]:
     keys = list(keys)
-    result: List[List[str]] = []
+    n = len(keys)
+    cap = n if max_size is None else max_size
+    current: List[str] = []
 
-    def rec(idx: int, current: List[str]):
-        if idx == len(keys):
-            if len(current) >= 2:
-                result.append(list(current))
+    def rec(idx: int) -> Iterator[List[str]]:
+        if len(current) + (n - idx) < min_size:
+            return
+        if idx == n:
+            if len(current) >= min_size:
+                yield list(current)
+            return
+        yield from rec(idx + 1)
+        if len(current) >= cap:
             return
-        rec(idx + 1, current)
         current.append(keys[idx])
-        rec(idx + 1, current)
+        # Every set in the include-subtree is a superset of ``current``.
+        if prune is None or not prune(current):
+            yield from rec(idx + 1)
         current.pop()
 
-    rec(0, [])
-    for combo in result:
-        yield combo
+    return rec(0)
 
 
-def bfs_order(keys: List[str]) -> Iterable[List[str]]:
+def bfs_order(keys: List[str], min_size: int = 2, max_size: int | None = None, prune: PruneFn | None = None) -> Iterator[List[str]]:
     keys = list(keys)
-    for r in range(2, len(keys) + 1):
-        for combo in itertools.combinations(keys, r):
-            yield list(combo)
+    n = len(keys)
+    top = n if max_size is None else min(max_size, n)
+    first = max(min_size, 1)
+    if first > top:
+        return
+    if prune is None:
+        for r in range(first, top + 1):
+            for combo in itertools.combinations(keys, r):
+                yield list(combo)
+        return
+
+    # Apriori-style layering: a (k+1)-combo is only generated when every one of
+    # its k-subsets survived the previous layer, so supersets of failed sets are
+    # never materialised. Only the surviving frontier is held in memory.
+    survivors: List[Tuple[int, ...]] = []
+    for idx in itertools.combinations(range(n), first):
+        combo = [keys[i] for i in idx]
+        yield combo
+        if not prune(combo):
+            survivors.append(idx)
+
+    for _ in range(first + 1, top + 1):
+        if not survivors:
+            return
+        next_survivors: List[Tuple[int, ...]] = []
+        for cand in apriori_join(survivors):
+            combo = [keys[i] for i in cand]
+            yield combo
+            if not prune(combo):
+                next_survivors.append(cand)
+        survivors = next_survivors
+
+
+def apriori_join(survivors: List[Tuple[int, ...]]) -> Iterator[Tuple[int, ...]]:
+    # ``survivors`` are same-size sorted index tuples in lexicographic order; the
+    # candidates come out in lexicographic order as well.
+    alive: Set[Tuple[int, ...]] = set(survivors)
+    groups: Dict[Tuple[int, ...], List[int]] = {}
+    for idx in survivors:
+        groups.setdefault(idx[:-1], []).append(idx[-1])
+
+    for prefix, tails in groups.items():
+        for a_pos, a in enumerate(tails):
+            for b in tails[a_pos + 1:]:
+                cand = prefix + (a, b)
+                if any(cand[:i] + cand[i + 1:] not in alive for i in range(len(prefix))):
+                    continue
+                yield cand
+
 
+def order_key(keys: List[str], strategy: str) -> Callable[[List[str]], Tuple[int, ...]]:
+    """Sort key reproducing the enumeration order of ``strategy`` over ``keys``."""
+    pos = {k: i for i, k in enumerate(keys)}
+    n = len(keys)
+    if strategy.lower() == 'dfs':
+        # exclude-before-include with keys[0] decided first == ascending bitmask
+        # with keys[0] as the most significant bit
+        return lambda combo: (sum(1 << (n - 1 - pos[k]) for k in combo),)
+    return lambda combo: (len(combo),) + tuple(sorted(pos[k] for k in combo))
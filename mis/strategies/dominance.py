@@ -0,0 +1,128 @@
+from typing import Dict, List, Tuple
+
+from .feasibility import model_kind
+
+
+def _fits(a: Tuple[float, float], b: Tuple[float, float], rotation: bool) -> bool:
+    if a[0] <= b[0] and a[1] <= b[1]:
+        return True
+    return rotation and a[0] <= b[1] and a[1] <= b[0]
+
+
+class Dominance:
+    """Part-dominance order of one instance: ``a <= b`` when part a fits inside
+    part b (also rotated, for models that rotate).
+
+    Replacing parts of an infeasible set by parts they fit inside keeps it
+    infeasible, and a packing of a feasible set also packs every set whose parts
+    fit inside distinct parts of it, each placed where its larger part was.
+    ``infer`` looks for such a known set with a bipartite matching; the known
+    sets are kept small by dropping failed supersets / feasible subsets.
+
+    Packings only hold positions, so the rule needs placements that keep a part
+    inside the footprint of the one it replaces: true for the continuous models
+    (either orientation) and the compact grid (no rotation, same grid point).
+    The original grid model is a relaxation without this property.
+    """
+
+    def __init__(self, bins_info: Dict[str, Tuple[float, float]], rotation: bool = True) -> None:
+        self.keys = list(bins_info)
+        self._index = {k: i for i, k in enumerate(self.keys)}
+        dims = list(bins_info.values())
+        n = len(dims)
+        # up[i]: bitmask of the parts that i fits inside, i itself included
+        self.up = [0] * n
+        for i in range(n):
+            for j in range(n):
+                if _fits(dims[i], dims[j], rotation):
+                    self.up[i] |= 1 << j
+        self._failed: List[Tuple[int, List[int]]] = []
+        self._feasible: List[Tuple[int, List[int], List[List[float]]]] = []
+        self.inferred_feasible = 0
+        self.inferred_infeasible = 0
+
+    def _items(self, combo: List[str]) -> Tuple[int, List[int]]:
+        items = [self._index[k] for k in combo]
+        mask = 0
+        for i in items:
+            mask |= 1 << i
+        return mask, items
+
+    def _match(self, items: List[int], targets: int) -> Dict[int, int] | None:
+        """Distinct target part around every item (Kuhn's augmenting paths), as {item: target}."""
+        owner: Dict[int, int] = {}
+
+        def augment(i: int, seen: set) -> bool:
+            options = self.up[i] & targets
+            while options:
+                t = (options & -options).bit_length() - 1
+                options &= options - 1
+                if t in seen:
+                    continue
+                seen.add(t)
+                if t not in owner or augment(owner[t], seen):
+                    owner[t] = i
+                    return True
+            return False
+
+        for i in items:
+            if not augment(i, set()):
+                return None
+        return {i: t for t, i in owner.items()}
+
+    def _failed_below(self, mask: int, items: List[int]) -> List[int] | None:
+        size = len(items)
+        for f_mask, f_items in self._failed:
+            if len(f_items) <= size and all(self.up[f] & mask for f in f_items) and self._match(f_items, mask) is not None:
+                return f_items
+        return None
+
+    def _feasible_above(self, mask: int, items: List[int]) -> Tuple[Dict[int, List[float]], List[int]] | None:
+        size = len(items)
+        for c_mask, c_items, positions in self._feasible:
+            if len(c_items) >= size and all(self.up[i] & c_mask for i in items):
+                matched = self._match(items, c_mask)
+                if matched is not None:
+                    slot = {c: s for s, c in enumerate(c_items)}
+                    return {j: list(positions[slot[matched[i]]]) for j, i in enumerate(items)}, c_items
+        return None
+
+    def infer(self, combo: List[str]) -> Tuple[bool, Dict[int, List[float]] | None, List[str]] | None:
+        """``(feasible, packing, known combo)`` when implied by a recorded set, else None."""
+        mask, items = self._items(combo)
+        failed = self._failed_below(mask, items)
+        if failed is not None:
+            self.inferred_infeasible += 1
+            return False, None, [self.keys[i] for i in failed]
+        above = self._feasible_above(mask, items)
+        if above is not None:
+            self.inferred_feasible += 1
+            return True, above[0], [self.keys[i] for i in above[1]]
+        return None
+
+    def add_failed(self, combo: List[str]) -> None:
+        mask, items = self._items(combo)
+        if self._failed_below(mask, items) is not None:
+            return
+        # plain supersets are implied by the new set
+        self._failed = [entry for entry in self._failed if entry[0] & mask != mask]
+        self._failed.append((mask, items))
+
+    def add_feasible(self, combo: List[str], packing: Dict[int, List[float]]) -> None:
+        mask, items = self._items(combo)
+        if self._feasible_above(mask, items) is not None:
+            return
+        self._feasible = [entry for entry in self._feasible if entry[0] & ~mask]
+        # packings reloaded from JSON have string keys
+        positions = [list(packing[j] if j in packing else packing[str(j)]) for j in range(len(items))]
+        self._feasible.append((mask, items, positions))
+
+
+def dominance_for(solver: str, bins_info: Dict[str, Tuple[float, float]]) -> Dominance | None:
+    """Dominance order matching ``solver``'s placement rules, None for the grid relaxation."""
+    kind = model_kind(solver)
+    if kind == 'continuous':
+        return Dominance(bins_info, rotation=True)
+    if kind == 'grid-compact':
+        return Dominance(bins_info, rotation=False)
+    return None
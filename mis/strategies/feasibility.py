@@ -0,0 +1,148 @@
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from .canonical import Signature, shape_signature
+
+# Feasibility facts are only transferable between models with a known relation:
+# the compact grid model places items unrotated and non-overlapping on grid
+# points, so any of its packings is also a packing for the continuous (rotating)
+# models, and a combination that is infeasible in the continuous model is
+# infeasible on every such grid. The original grid model only forbids positions
+# overlapped by *all* other bins, which is a relaxation for three or more bins,
+# so its facts are never transferred to or from other models. Restricted to
+# normal patterns the compact model keeps its answers, but the relaxation gets
+# tighter by a different amount on every grid ('grid-normal': same grid only).
+_MODEL_KIND = {
+    'grid': 'grid',
+    'grid-compact': 'grid-compact',
+    'interval': 'continuous',
+    'disjunctive': 'continuous',
+    # race / pick interval and disjunctive solvers (mis.solvers.portfolio, .auto)
+    'portfolio': 'continuous',
+    'auto': 'continuous',
+}
+_GRID_KINDS = ('grid', 'grid-compact', 'grid-normal')
+# origin of facts loaded from a persistent store
+_STORED: Tuple[str, FrozenSet[str]] = ('', frozenset())
+
+
+def model_kind(solver: str, params=None) -> str:
+    kind = _MODEL_KIND.get(str(solver).lower(), str(solver).lower())
+    if kind == 'grid' and params is not None and params.normal_patterns:
+        return 'grid-normal'
+    return kind
+
+
+def _divides(fine: float, coarse: float) -> bool:
+    ratio = coarse / fine
+    return round(ratio) >= 1 and abs(ratio - round(ratio)) < 1e-9
+
+
+class FeasibilityCache:
+    """Store of solved combinations for one plate size that answers later
+    lookups at other resolutions (and for other models) whenever the answer is
+    implied.
+
+    For the grid model, a packing found at grid ``g`` is valid at every grid that
+    divides ``g``; an infeasibility proof at ``g`` holds at every multiple of ``g``.
+    Continuous models ignore the grid size entirely.
+
+    Facts are keyed by shape signature, so combinations made of the same
+    rectangles share them. Passing the same ``store`` to the caches of several
+    machines with the same ``(L, W)`` shares facts between them as well;
+    ``owner`` tells those machines apart in the duplicate-shape counter.
+    ``persistent`` (a ``mis.io.result_store.PlateFacts``) is consulted once per
+    signature on a miss and receives every recorded fact. ``params`` (the
+    solver's ``SolverParams``) matters only for ``normal_patterns``.
+    """
+
+    def __init__(self, solver: str, store: Dict | None = None, owner: str = '', persistent=None, params=None) -> None:
+        self.kind = model_kind(solver, params)
+        self.owner = owner
+        self.persistent = persistent
+        self._loaded: Set[Signature] = set()
+        # signature -> [(kind, grid_size, feasible, packing by signature slot, (owner, combo))]
+        self._facts: Dict[Signature, List[Tuple[str, float | None, bool, List[List[float]] | None, Tuple[str, FrozenSet[str]]]]] = \
+            {} if store is None else store
+        self.hits = 0
+        self.misses = 0
+        self.feasible_hits = 0
+        self.infeasible_hits = 0
+        self.shape_hits = 0
+        self.store_hits = 0
+
+    def _implies(self, kind: str, grid: float | None, feasible: bool, grid_size: float | None) -> bool:
+        if kind == 'continuous':
+            return self.kind == 'continuous' or (not feasible and self.kind == 'grid-compact')
+        if kind == 'grid-compact' and self.kind == 'continuous':
+            return feasible
+        if kind != self.kind:
+            return False
+        if kind not in _GRID_KINDS:
+            return True
+        if grid is None or grid_size is None:
+            return False
+        if kind == 'grid-normal':
+            return abs(grid - grid_size) < 1e-9
+        return _divides(grid_size, grid) if feasible else _divides(grid, grid_size)
+
+    def _load(self, signature: Signature) -> None:
+        self._loaded.add(signature)
+        facts = self._facts.get(signature, [])
+        known = {fact[:3] for fact in facts}
+        for kind, grid, feasible, packing in self.persistent.facts(signature):
+            if (kind, grid, feasible) not in known:
+                facts.append((kind, grid, feasible, packing, _STORED))
+        if facts:
+            self._facts[signature] = facts
+
+    def lookup(self, combo: List[str], bins: List[Tuple[float, float]], grid_size: float | None) -> Tuple[bool, Dict[int, List[float]] | None, str] | None:
+        """``(feasible, packing, source)`` or None on a miss. ``source`` is
+        ``'store'`` for facts from the persistent store, ``'shape'`` for facts
+        recorded for another combination or machine, else ``'resolution'``."""
+        signature, slots = shape_signature(bins)
+        if self.persistent is not None and signature not in self._loaded:
+            self._load(signature)
+        for kind, grid, feasible, packing, origin in self._facts.get(signature, ()):
+            if self._implies(kind, grid, feasible, grid_size):
+                self.hits += 1
+                if origin == _STORED:
+                    source = 'store'
+                    self.store_hits += 1
+                elif origin != (self.owner, frozenset(combo)):
+                    source = 'shape'
+                    self.shape_hits += 1
+                else:
+                    source = 'resolution'
+                if feasible:
+                    self.feasible_hits += 1
+                    return True, {i: list(packing[s]) for i, s in enumerate(slots)}, source
+                self.infeasible_hits += 1
+                return False, None, source
+        self.misses += 1
+        return None
+
+    def record(self, combo: List[str], bins: List[Tuple[float, float]], grid_size: float | None, feasible: bool,
+               packing: Dict[int, List[float]] | None = None) -> None:
+        if feasible and not packing:
+            return
+        signature, slots = shape_signature(bins)
+        by_slot = None
+        if feasible:
+            by_slot = [[] for _ in slots]
+            for i, s in enumerate(slots):
+                by_slot[s] = list(packing[i])
+        grid = grid_size if self.kind in _GRID_KINDS else None
+        self._facts.setdefault(signature, []).append((self.kind, grid, feasible, by_slot, (self.owner, frozenset(combo))))
+        if self.persistent is not None:
+            self.persistent.add(signature, self.kind, grid, feasible, by_slot)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "Lookups": self.hits + self.misses,
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Feasible Hits": self.feasible_hits,
+            "Infeasible Hits": self.infeasible_hits,
+            "Duplicate-Shape Hits": self.shape_hits,
+            "Persistent Hits": self.store_hits,
+        }
@@ -0,0 +1,200 @@
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from ortools.sat.python import cp_model
+
+from .pruning import Pruner
+
+# Feasibility oracle over a set of keys: True, False, or None if undecided
+# (e.g. a solver time-out). Feasibility must be monotone: subsets of a
+# feasible set are feasible. Instead of False it may return ``(False, core)``
+# with ``core`` an infeasible subset of the items (e.g. a CP-SAT core).
+Oracle = Callable[[List[str]], bool | None | Tuple[bool, List[str]]]
+
+
+class _OutOfTime(Exception):
+    """``time_limit`` passed before an oracle call."""
+
+
+class MisSearch:
+    """Enumerates the minimal infeasible subsets (MIS) and maximal feasible
+    subsets (MSS) of ``keys`` with as few oracle calls as possible.
+
+    MARCO-style: a CP-SAT "map" over one literal per key holds what is already
+    explored (no superset of a found MIS, no subset of a found MSS). Each
+    unexplored seed is grown to a maximal set in the map; if the oracle finds it
+    feasible it is an MSS, otherwise it is shrunk to an MIS by QuickXplain
+    (or plain deletion), starting from the oracle's core when it gave one.
+    The search ends when the map has no model left.
+    Seeds are first looked for greedily, which is much cheaper than solving the
+    map once it holds thousands of clauses.
+
+    With ``max_size`` only sets of at most that many keys are considered, so
+    the MSS are maximal among those. Undecided oracle answers count as feasible:
+    every reported MIS is proven infeasible, but its minimality and the
+    completeness of the lists only hold if nothing was undecided.
+
+    With ``time_limit`` (seconds) the search stops early and ``complete`` is
+    False; the sets found so far are still minimal / maximal. The limit is
+    checked before every oracle call, so a shrink in progress stops as well
+    (its set is dropped).
+    """
+
+    def __init__(self, keys: List[str], oracle: Oracle, max_size: int | None = None, shrink: str = 'quickxplain',
+                 time_limit: float | None = None) -> None:
+        if shrink not in SHRINKERS:
+            raise ValueError(f"Unknown shrink method: {shrink}")
+        self.keys = list(keys)
+        self.oracle = oracle
+        self.max_size = len(self.keys) if max_size is None else max_size
+        self._shrink = SHRINKERS[shrink]
+        self.time_limit = time_limit
+        self._deadline: float | None = None
+        self.complete = False
+        self.mis: List[List[str]] = []
+        self.mss: List[List[str]] = []
+        self.oracle_calls = 0
+        self.inferred = 0
+        self.undecided = 0
+        self._failed = Pruner()
+        self._feasible: List[int] = []
+        self._bit = {k: 1 << i for i, k in enumerate(self.keys)}
+        self._answers: Dict[int, bool] = {}
+        self._mss_masks: set = set()
+        self._cores: List[Tuple[int, List[str]]] = []
+        self._rng = random.Random(0)
+
+        self._map = cp_model.CpModel()
+        self._x = [self._map.NewBoolVar(k) for k in self.keys]
+        if self.max_size < len(self.keys):
+            self._map.Add(sum(self._x) <= self.max_size)
+        self._solver = cp_model.CpSolver()
+        self._solver.parameters.num_workers = 1
+        self._solver.parameters.cp_model_presolve = False
+
+    def _mask(self, items: List[str]) -> int:
+        mask = 0
+        for k in items:
+            mask |= self._bit[k]
+        return mask
+
+    def feasible(self, items: List[str]) -> bool:
+        """Oracle answer for ``items``, inferred from what is known where possible."""
+        if not items:
+            return True
+        if self._failed.should_prune(items):
+            self.inferred += 1
+            return False
+        mask = self._mask(items)
+        if mask in self._answers or any(mask & f == mask for f in self._feasible):
+            self.inferred += 1
+            return self._answers.get(mask, True)
+        if self._deadline is not None and time.time() >= self._deadline:
+            raise _OutOfTime
+        self.oracle_calls += 1
+        answer = self.oracle(items)
+        if isinstance(answer, tuple):
+            answer, core = answer
+            # known infeasible, so later calls on supersets are inferred
+            self._failed.add_failed(core)
+            self._cores.append((self._mask(core), core))
+        if answer is None:
+            self.undecided += 1
+        self._answers[mask] = answer is not False
+        return answer is not False
+
+    def _grow(self, seed: List[str], order: List[str]) -> List[str]:
+        # adding keys keeps every MSS clause satisfied; stop before an MIS or the size cap
+        for k in order:
+            if len(seed) >= self.max_size:
+                break
+            if k not in seed and not self._failed.should_prune(seed + [k]):
+                seed = seed + [k]
+        return sorted(seed, key=self.keys.index)
+
+    def _seed(self, tries: int = 8) -> List[str] | None:
+        """An unexplored set, grown to a maximal one in the map."""
+        # a set maximal w.r.t. the known MIS lies in no other known MSS, so it
+        # is unexplored unless it is one of them
+        for _ in range(tries):
+            order = self._rng.sample(self.keys, len(self.keys))
+            seed = self._grow([], order)
+            if self._mask(seed) not in self._mss_masks:
+                return seed
+        if self._solver.Solve(self._map) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+        return self._grow([k for k, x in zip(self.keys, self._x) if self._solver.Value(x)], self.keys)
+
+    def _core(self, items: List[str]) -> List[str]:
+        # smallest oracle core inside ``items``; grown seeds avoid every known
+        # core, but the map can still hand out one that contains a core
+        mask = self._mask(items)
+        cores = [core for m, core in self._cores if m & mask == m]
+        return min(cores, key=len) if cores else items
+
+    def _block_up(self, mis: List[str]) -> None:
+        self.mis.append(mis)
+        self._failed.add_failed(mis)
+        self._map.AddBoolOr([self._x[self.keys.index(k)].Not() for k in mis])
+
+    def _block_down(self, mss: List[str]) -> None:
+        self.mss.append(mss)
+        self._feasible.append(self._mask(mss))
+        self._mss_masks.add(self._mask(mss))
+        # empty when all keys fit together, which leaves nothing to explore
+        self._map.AddBoolOr([x for k, x in zip(self.keys, self._x) if k not in mss])
+
+    def run(self) -> Tuple[List[List[str]], List[List[str]]]:
+        if self.time_limit is not None:
+            self._deadline = time.time() + self.time_limit
+        try:
+            while self._deadline is None or time.time() < self._deadline:
+                seed = self._seed()
+                if seed is None:
+                    self.complete = True
+                    break
+                if self.feasible(seed):
+                    self._block_down(seed)
+                else:
+                    self._block_up(self._shrink(self, self._core(seed)))
+        except _OutOfTime:
+            pass
+        order = {k: i for i, k in enumerate(self.keys)}
+        for sets in (self.mis, self.mss):
+            sets.sort(key=lambda s: (len(s), [order[k] for k in s]))
+        return self.mis, self.mss
+
+
+def _quickxplain(search: MisSearch, items: List[str]) -> List[str]:
+    # Junker's QuickXplain with "consistent" = feasible: about k * log(n / k)
+    # oracle calls for an MIS of k out of n items
+    def qx(background: List[str], delta: bool, candidates: List[str]) -> List[str]:
+        if delta and not search.feasible(background):
+            return []
+        if len(candidates) == 1:
+            return candidates
+        half = len(candidates) // 2
+        c1, c2 = candidates[:half], candidates[half:]
+        d2 = qx(background + c1, True, c2)
+        d1 = qx(background + d2, bool(d2), c1)
+        return d1 + d2
+
+    order = {k: i for i, k in enumerate(search.keys)}
+    return sorted(qx([], False, items), key=order.get)
+
+
+def _deletion(search: MisSearch, items: List[str]) -> List[str]:
+    # drop every item whose removal keeps the set infeasible: len(items) calls
+    core = list(items)
+    for k in list(items):
+        rest = [c for c in core if c != k]
+        if not search.feasible(rest):
+            core = rest
+    return core
+
+
+SHRINKERS: Dict[str, Callable[[MisSearch, List[str]], List[str]]] = {
+    'quickxplain': _quickxplain,
+    'deletion': _deletion,
+}
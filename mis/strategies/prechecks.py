@@ -0,0 +1,184 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .feasibility import model_kind
+from ..utils.scaling import compute_scale_factor
+
+# A filter returns (IsFeasible, PackingSol) when it can decide the combo
+# without CP-SAT, or None to pass it on to the next filter / the solver.
+Verdict = Tuple[bool, Dict[int, List[float]] | None] | None
+
+# The original grid model only forbids positions overlapped by all other bins
+# (a relaxation for 3+ bins), so geometric bounds would change its answers;
+# it runs without pre-checks.
+DEFAULT_PRECHECKS: Dict[str, Tuple[str, ...]] = {
+    'continuous': ('fit', 'area', 'pairs', 'dff', 'skyline'),
+    'grid-compact': ('fit', 'area', 'pairs', 'dff', 'skyline'),
+    'grid': (),
+}
+
+
+def prechecks_depend_on_grid(solver: str) -> bool:
+    # the continuous models ignore the grid size: one Prechecks serves every resolution
+    return model_kind(solver) != 'continuous'
+
+
+class Prechecks:
+    """Cheap feasibility tests run before ``solver.solve`` for one machine (and
+    resolution, for the grid models). Dimensions are scaled to integers once,
+    so the bounds are exact.
+
+    Rotation is allowed for the continuous models only; for grid models the
+    skyline packer snaps every placement to the grid.
+    """
+
+    def __init__(self, solver: str, L: float, W: float, bins_info: Dict[str, Tuple[float, float]],
+                 grid_size: float | None = None, names: Sequence[str] | None = None) -> None:
+        kind = model_kind(solver)
+        self.rotation = kind == 'continuous'
+        values = [L, W] + [v for dims in bins_info.values() for v in dims]
+        if kind != 'continuous' and grid_size is not None:
+            values.append(grid_size)
+        self.scale = compute_scale_factor(values)
+        self.L = int(round(L * self.scale))
+        self.W = int(round(W * self.scale))
+        self.grid = int(round(grid_size * self.scale)) if kind != 'continuous' and grid_size else 1
+        self.keys = list(bins_info)
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        self.dims = [(int(round(l * self.scale)), int(round(w * self.scale))) for l, w in bins_info.values()]
+        self.orients = [self._orientations(l, w) for l, w in self.dims]
+
+        if names is None:
+            names = DEFAULT_PRECHECKS.get(kind, ())
+        self.filters: List[Tuple[str, Callable[['Prechecks', List[int]], Verdict]]] = [(n, PRECHECKS[n]) for n in names]
+        self.counts: Dict[str, int] = {n: 0 for n in names}
+        self._conflicts: np.ndarray | None = None
+        self._dff: Tuple[np.ndarray, np.ndarray] | None = None
+
+    def _orientations(self, l: int, w: int) -> List[Tuple[int, int]]:
+        options = [(l, w), (w, l)] if self.rotation and l != w else [(l, w)]
+        return [(a, b) for a, b in options if a <= self.L and b <= self.W]
+
+    def check(self, combo: List[str]) -> Tuple[str, bool, Dict[int, List[float]] | None] | None:
+        """Name of the deciding filter and its verdict, or None if undecided."""
+        items = [self.index[k] for k in combo]
+        for name, fn in self.filters:
+            verdict = fn(self, items)
+            if verdict is not None:
+                self.counts[name] += 1
+                return (name,) + verdict
+        return None
+
+
+def _fit(stage: Prechecks, items: List[int]) -> Verdict:
+    # an item that fits in no orientation
+    if any(not stage.orients[i] for i in items):
+        return False, None
+    return None
+
+
+def _area(stage: Prechecks, items: List[int]) -> Verdict:
+    if sum(stage.dims[i][0] * stage.dims[i][1] for i in items) > stage.L * stage.W:
+        return False, None
+    return None
+
+
+def _pairs(stage: Prechecks, items: List[int]) -> Verdict:
+    # two items that can be neither side by side nor stacked in any orientation
+    if stage._conflicts is None:
+        n = len(stage.dims)
+        conflicts = np.zeros((n, n), dtype=bool)
+        for i in range(n):
+            for j in range(i + 1, n):
+                conflicts[i, j] = conflicts[j, i] = all(
+                    a[0] + b[0] > stage.L and a[1] + b[1] > stage.W
+                    for a in stage.orients[i] for b in stage.orients[j]
+                )
+        stage._conflicts = conflicts
+    idx = np.asarray(items)
+    if stage._conflicts[np.ix_(idx, idx)].any():
+        return False, None
+    return None
+
+
+def _dff_family(dims: List[int], cap: int) -> List[Tuple[int, Callable[[int], int]]]:
+    """Dual-feasible functions on one axis as (denominator, scaled function):
+    the identity, u^(k) for k = 1..3 and f_0^eps for the largest item sizes
+    up to cap / 2 (Fekete & Schepers)."""
+    family: List[Tuple[int, Callable[[int], int]]] = [(1, lambda x: x)]
+    for k in (1, 2, 3):
+        # u^(k)(x) = x if (k+1)x/C is integral, else floor((k+1)x/C) * C/k; scaled by k
+        family.append((k, lambda x, k=k: k * x if (k + 1) * x % cap == 0 else ((k + 1) * x // cap) * cap))
+    for eps in sorted({d for d in dims if 0 < d <= cap // 2}, reverse=True)[:3]:
+        family.append((1, lambda x, eps=eps: cap if x > cap - eps else (0 if x < eps else x)))
+    return family
+
+
+def _dff(stage: Prechecks, items: List[int]) -> Verdict:
+    # sum_i f1(l_i) * f2(w_i) <= f1(L) * f2(W) for any pair of dual-feasible functions
+    if stage._dff is None:
+        fx = _dff_family([o[0] for ors in stage.orients for o in ors], stage.L)
+        fy = _dff_family([o[1] for ors in stage.orients for o in ors], stage.W)
+        pairs = [(dx, gx, dy, gy) for dx, gx in fx for dy, gy in fy]
+        cap = np.asarray([dx * stage.L * dy * stage.W for dx, _, dy, _ in pairs], dtype=np.int64)
+        table = np.zeros((len(stage.dims), len(pairs)), dtype=np.int64)
+        for i, ors in enumerate(stage.orients):
+            for p, (_, gx, _, gy) in enumerate(pairs):
+                # with rotation, the bound must hold for the cheapest orientation
+                table[i, p] = min((gx(a) * gy(b) for a, b in ors), default=0)
+        stage._dff = table, cap
+    table, cap = stage._dff
+    if (table[items].sum(axis=0) > cap).any():
+        return False, None
+    return None
+
+
+def _skyline(stage: Prechecks, items: List[int]) -> Verdict:
+    """Bottom-left skyline packing, tallest items first. A success is a proof
+    of feasibility and its packing is returned like a solver's."""
+    g = stage.grid
+
+    def snap(v: int) -> int:
+        return -(-v // g) * g
+
+    order = sorted(range(len(items)), key=lambda p: max(stage.dims[items[p]]), reverse=True)
+    # skyline segments [x_start, x_end) at height y, left to right
+    sky: List[Tuple[int, int, int]] = [(0, stage.L, 0)]
+    packing: Dict[int, List[float]] = {}
+    for p in order:
+        best = None
+        for w, h in stage.orients[items[p]]:
+            for x0, _, _ in sky:
+                x = snap(x0)
+                if x + w > stage.L:
+                    continue
+                y = snap(max((sy for sx, ex, sy in sky if sx < x + w and ex > x), default=0))
+                if y + h <= stage.W and (best is None or (y, x) < (best[1], best[0])):
+                    best = (x, y, w, h)
+        if best is None:
+            return None
+        x, y, w, h = best
+        top = y + h
+        new_sky: List[Tuple[int, int, int]] = []
+        for sx, ex, sy in sky:
+            if ex <= x or sx >= x + w:
+                new_sky.append((sx, ex, sy))
+                continue
+            if sx < x:
+                new_sky.append((sx, x, sy))
+            if ex > x + w:
+                new_sky.append((x + w, ex, sy))
+        new_sky.append((x, x + w, top))
+        sky = sorted(new_sky)
+        packing[p] = [x / stage.scale, y / stage.scale]
+    return True, {p: packing[p] for p in range(len(items))}
+
+
+PRECHECKS: Dict[str, Callable[[Prechecks, List[int]], Verdict]] = {
+    'fit': _fit,
+    'area': _area,
+    'pairs': _pairs,
+    'dff': _dff,
+    'skyline': _skyline,
+}
@@ -1,17 +1,99 @@
-from typing import FrozenSet, Iterable, List, Set
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+class _SetTrieNode:
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self) -> None:
+        self.children: Dict[int, '_SetTrieNode'] = {}
+        self.terminal = False
 
 
 class Pruner:
+    """Keeps the minimal failed combinations in a set-trie.
+
+    Items are ranked on first sight and every failed set is stored as a sorted
+    path of ranks, so a subset query only walks branches whose items all occur in
+    the candidate combination instead of scanning every recorded failure.
+    """
+
     def __init__(self) -> None:
         self.failed: Set[FrozenSet[str]] = set()
+        self._rank: Dict[str, int] = {}
+        self._root = _SetTrieNode()
 
-    def should_prune(self, combo: List[str]) -> bool:
-        combo_set = frozenset(combo)
-        for failed in self.failed:
-            if failed.issubset(combo_set):
+    def __len__(self) -> int:
+        return len(self.failed)
+
+    def _ranks(self, combo: Iterable[str], register: bool = False) -> List[int]:
+        ranks: List[int] = []
+        for item in set(combo):
+            r = self._rank.get(item)
+            if r is None:
+                if not register:
+                    continue
+                r = self._rank[item] = len(self._rank)
+            ranks.append(r)
+        ranks.sort()
+        return ranks
+
+    def _has_subset(self, node: _SetTrieNode, ranks: List[int], start: int) -> bool:
+        if node.terminal:
+            return True
+        children = node.children
+        for i in range(start, len(ranks)):
+            child = children.get(ranks[i])
+            if child is not None and self._has_subset(child, ranks, i + 1):
                 return True
         return False
 
+    def _remove_supersets(self, node: _SetTrieNode, ranks: List[int], i: int, path: List[int], removed: List[List[int]]) -> None:
+        for key in sorted(node.children):
+            if i < len(ranks) and key > ranks[i]:
+                break
+            child = node.children[key]
+            path.append(key)
+            nxt = i + 1 if i < len(ranks) and key == ranks[i] else i
+            if nxt == len(ranks):
+                # every set below this child contains all of ``ranks``
+                self._collect(child, path, removed)
+                del node.children[key]
+            else:
+                self._remove_supersets(child, ranks, nxt, path, removed)
+                if not child.terminal and not child.children:
+                    del node.children[key]
+            path.pop()
+
+    def _collect(self, node: _SetTrieNode, path: List[int], out: List[List[int]]) -> None:
+        if node.terminal:
+            out.append(list(path))
+        for key, child in node.children.items():
+            path.append(key)
+            self._collect(child, path, out)
+            path.pop()
+
+    def should_prune(self, combo: List[str]) -> bool:
+        if not self.failed:
+            return False
+        return self._has_subset(self._root, self._ranks(combo), 0)
+
     def add_failed(self, combo: List[str]) -> None:
-        self.failed.add(frozenset(combo))
+        ranks = self._ranks(combo, register=True)
+        if self._has_subset(self._root, ranks, 0):
+            return
 
+        removed: List[List[int]] = []
+        self._remove_supersets(self._root, ranks, 0, [], removed)
+        if removed:
+            items = list(self._rank)
+            for path in removed:
+                self.failed.discard(frozenset(items[r] for r in path))
+
+        node = self._root
+        for r in ranks:
+            child = node.children.get(r)
+            if child is None:
+                child = node.children[r] = _SetTrieNode()
+            node = child
+        node.terminal = True
+        self.failed.add(frozenset(combo))
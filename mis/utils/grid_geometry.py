@@ -0,0 +1,89 @@
+from typing import List, Tuple
+
+import numpy as np
+
+# Array-backed counterpart of ``geometry.py`` for the grid model. The platform
+# grid is the product ``xs x ys`` and dot ``ID = ix * len(ys) + iy`` (the order
+# of ``discretize_platform``), so every per-dot region is an outer product of
+# one mask over ``xs`` and one over ``ys``.
+
+
+def _axis(length: float, grid_size: float) -> np.ndarray:
+    # same accumulate-and-round recurrence as discretize_platform
+    coords: List[float] = []
+    v = 0.0
+    while v <= length:
+        coords.append(v)
+        v = round(v + grid_size, 10)
+    return np.asarray(coords, dtype=float)
+
+
+def discretize_axes(L: float, W: float, grid_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    return _axis(L, grid_size), _axis(W, grid_size)
+
+
+def _normal_axis(length: float, sizes: List[float], grid_size: float) -> np.ndarray:
+    coords = _axis(length, grid_size)
+    if not sizes:
+        return coords
+    # grid steps an item of each size spans: on a grid, a part pushed against
+    # another one starts at the next grid point after its end
+    steps = np.searchsorted(coords, np.asarray(sizes, dtype=float) - 1e-9).tolist()
+    limit = int(np.searchsorted(coords, length - min(sizes) + 1e-9))
+    mask = (1 << limit) - 1
+    reach = 1
+    for s in steps:
+        if s < limit:
+            reach |= (reach << s) & mask
+    return coords[[k for k in range(limit) if reach >> k & 1]]
+
+
+def normal_axes(L: float, W: float, bins: List[Tuple[float, float]], grid_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Normal patterns of ``bins`` on the grid of ``discretize_axes``: the grid
+    points that are sums of (grid-rounded) part lengths, up to the last start at
+    which the smallest part still fits.
+
+    Pushing every part left and down until it touches the plate or another part
+    keeps a grid packing valid and moves each part onto such a point, so any
+    packing on the full grid has a counterpart on this subset.
+    """
+    return (_normal_axis(L, [b[0] for b in bins], grid_size),
+            _normal_axis(W, [b[1] for b in bins], grid_size))
+
+
+def dot_coordinates(xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    X, Y = np.meshgrid(xs, ys, indexing='ij')
+    return X.ravel(), Y.ravel()
+
+
+def inner_fit_masks(xs: np.ndarray, ys: np.ndarray, bins: List[Tuple[float, float]], L: float, W: float) -> np.ndarray:
+    """Boolean ``(n_bins, n_dots)`` array: bin j can be placed at dot d."""
+    ls = np.asarray([b[0] for b in bins], dtype=float)
+    ws = np.asarray([b[1] for b in bins], dtype=float)
+    fx = xs[None, :] + ls[:, None] <= L
+    fy = ys[None, :] + ws[:, None] <= W
+    return (fx[:, :, None] & fy[:, None, :]).reshape(len(bins), -1)
+
+
+def phi_axis_masks(coords: np.ndarray, size_j: float, others: List[float]) -> np.ndarray:
+    """``(n, n)`` mask along one axis: ``[a, b]`` is True when every other bin
+    placed at ``coords[b]`` overlaps bin j placed at ``coords[a]`` on this axis.
+
+    Overlap with bin i means ``c_b < c_a + size_j`` and ``c_b + size_i > c_a``;
+    across all i the second test is decided by the smallest ``size_i``.
+    """
+    if not others:
+        return np.ones((len(coords), len(coords)), dtype=bool)
+    start = coords[:, None]
+    other = coords[None, :]
+    return (other < start + size_j) & (other + min(others) > start)
+
+
+def phi_masks(xs: np.ndarray, ys: np.ndarray, bins: List[Tuple[float, float]], j: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Separable form of ``get_Phi_jd`` for every dot: Phi[j, (a, b)] is
+    ``outer(mx[a], my[b])`` flattened."""
+    others = [b for i, b in enumerate(bins) if i != j]
+    l_j, w_j = bins[j]
+    mx = phi_axis_masks(xs, l_j, [b[0] for b in others])
+    my = phi_axis_masks(ys, w_j, [b[1] for b in others])
+    return mx, my
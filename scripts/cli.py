@@ -10,7 +10,7 @@ def main():
     sub = parser.add_subparsers(dest='command', required=True)
 
     run_p = sub.add_parser('run', help='Run feasibility on instances')
-    run_p.add_argument('--solver', choices=['grid', 'interval', 'disjunctive'], default='grid')
+    run_p.add_argument('--solver', choices=['grid', 'grid-compact', 'interval', 'disjunctive'], default='grid')
     run_p.add_argument('--strategy', choices=['all', 'bfs', 'dfs'], default='all')
     run_p.add_argument('--instances', nargs='+', default=['n15'])
     run_p.add_argument('--instances-dir', default=None, help='Override TestInstances subdir, absolute or relative')
@@ -28,7 +28,7 @@ def main():
         else:
             instance_dirs = [os.path.join(default_parent, name) for name in args.instances]
 
-        cfg = RunConfig(solver=args.solver, strategy=args.strategy, code_name='CLI')
+        cfg = RunConfig(solver=args.solver, strategy=args.strategy, code_name='CLI', timeout=args.timeout)
         num_run = log_run(code_name='CLI')
         for d in instance_dirs:
             run_instances(d, num_run=num_run, config=cfg, processes=args.processes)
@@ -2,23 +2,26 @@
 import argparse
 import json
 import os
-from typing import List
+from typing import Dict, List
 
+from mis.io.binary import ComboPackWriter, write_batch
 from mis.strategies.combinations import bfs_order, dfs_order, all_subsets
 
 
-def export_combos(instances: List[str], strategy: str, max_comb_size: int, out_dir: str | None):
+def export_combos(instances: List[str], strategy: str, max_comb_size: int, out_dir: str | None, fmt: str = 'json',
+                  shard_by_size: bool = False) -> int:
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     instances_parent = os.path.join(base_dir, 'TestInstances')
     out_root = out_dir or os.path.join(base_dir, 'exports')
     os.makedirs(out_root, exist_ok=True)
+    total = 0
 
     def gen(keys: List[str]):
         if strategy == 'bfs':
-            return bfs_order(keys)
+            return bfs_order(keys, max_size=max_comb_size)
         if strategy == 'dfs':
-            return dfs_order(keys)
-        return all_subsets(keys)
+            return dfs_order(keys, max_size=max_comb_size)
+        return all_subsets(keys, max_size=max_comb_size)
 
     for name in instances:
         inst_dir = os.path.join(instances_parent, name)
@@ -36,50 +39,69 @@ def export_combos(instances: List[str], strategy: str, max_comb_size: int, out_d
                 original = json.load(f)
 
             # expand parts by num_part into keys pid-k
-            expanded = []
+            part_of: Dict[str, Dict] = {}
             for part in original.get('parts', []):
                 pid = part.get('part_id')
                 count = int(part.get('num_part', 1))
                 for k in range(1, count + 1):
-                    expanded.append({'key': f"{pid}-{k}", 'part': part})
-
-            keys = [e['key'] for e in expanded]
-            combos_written = 0
-            for combo in gen(keys):
-                if max_comb_size is not None and len(combo) > max_comb_size:
-                    continue
-
-                selected = []
-                for key in combo:
-                    e = next(x for x in expanded if x['key'] == key)
-                    p = e['part']
-                    selected.append({
-                        'part_id': 0,
-                        'num_part': 1,
-                        'num_orientation': p.get('num_orientation', 1),
-                        'volume': p.get('volume', 0.0),
-                        'orientations': p.get('orientations', [])
-                    })
-                for idx, p in enumerate(selected, start=1):
-                    p['part_id'] = idx
-
-                out_json = {
-                    'machines': original.get('machines', []),
-                    'parts': selected,
-                    'types_machine': len(original.get('machines', [])),
-                    'types_parts': len(selected),
-                    'num_machine': sum(m.get('num_machine', 1) for m in original.get('machines', [])),
-                    'num_parts': len(selected)
-                }
-
-                base = os.path.splitext(file)[0]
-                out_name = f"{base}_{strategy}_{len(combo)}_{combos_written+1}.json"
-                out_path = os.path.join(out_sub, out_name)
-                with open(out_path, 'w') as out_f:
-                    json.dump(out_json, out_f, ensure_ascii=False, indent=2)
-                combos_written += 1
+                    part_of[f"{pid}-{k}"] = part
+
+            keys = list(part_of)
+            base = os.path.splitext(file)[0]
+
+            def combos():
+                for n, combo in enumerate(gen(keys), start=1):
+                    selected = []
+                    for idx, key in enumerate(combo, start=1):
+                        p = part_of[key]
+                        selected.append({
+                            'part_id': idx,
+                            'num_part': 1,
+                            'num_orientation': p.get('num_orientation', 1),
+                            'volume': p.get('volume', 0.0),
+                            'orientations': p.get('orientations', [])
+                        })
+
+                    out_json = {
+                        'machines': original.get('machines', []),
+                        'parts': selected,
+                        'types_machine': len(original.get('machines', [])),
+                        'types_parts': len(selected),
+                        'num_machine': sum(m.get('num_machine', 1) for m in original.get('machines', [])),
+                        'num_parts': len(selected)
+                    }
+                    yield f"{base}_{strategy}_{len(combo)}_{n}", out_json
+
+            if fmt == 'pack':
+                # bitmask rows over the instance's own parts table, streamed to
+                # one file per instance (or per combo size with shard_by_size)
+                writers: Dict[int | None, ComboPackWriter] = {}
+                for combo in gen(keys):
+                    size = len(combo) if shard_by_size else None
+                    writer = writers.get(size)
+                    if writer is None:
+                        suffix = f"_{size}" if shard_by_size else ""
+                        writer = writers[size] = ComboPackWriter(
+                            os.path.join(out_sub, f"{base}_{strategy}{suffix}.mcp"), keys,
+                            original.get('machines', []), original.get('parts', []),
+                            meta={'instance': base, 'strategy': strategy, 'size': size},
+                        )
+                    writer.write(combo)
+                combos_written = sum(w.close() for w in writers.values())
+            elif fmt == 'misb':
+                # one memory-mappable batch per source instance instead of a file per combo
+                combos_written = write_batch(os.path.join(out_sub, f"{base}_{strategy}.misb"), combos())
+            else:
+                combos_written = 0
+                for out_name, out_json in combos():
+                    out_path = os.path.join(out_sub, f"{out_name}.json")
+                    with open(out_path, 'w') as out_f:
+                        json.dump(out_json, out_f, ensure_ascii=False, indent=2)
+                    combos_written += 1
 
             print(f"Exported {combos_written} combos for {file} into {out_sub}")
+            total += combos_written
+    return total
 
 
 def main():
@@ -88,9 +110,12 @@ def main():
     parser.add_argument('--instances', nargs='+', required=True)
     parser.add_argument('--max-comb-size', type=int, default=5)
     parser.add_argument('--out-dir', default=None)
+    parser.add_argument('--format', choices=['json', 'misb', 'pack'], default='json',
+                        help='misb: one binary batch per instance; pack: one bitmask row per combo (see mis/io/binary.py)')
+    parser.add_argument('--shard-by-size', action='store_true', help='pack: one file per combo size')
     args = parser.parse_args()
 
-    export_combos(args.instances, args.strategy, args.max_comb_size, args.out_dir)
+    export_combos(args.instances, args.strategy, args.max_comb_size, args.out_dir, args.format, args.shard_by_size)
 
 
 if __name__ == '__main__':
@@ -2,13 +2,25 @@
 import argparse
 import json
 import os
-from typing import List
+from typing import Dict, Iterable, List
 
-from mis.io.reader import read_instance
+from mis.io.reader import instance_name, list_instances, read_instance
+from mis.io.shards import TaskShardWriter
 from mis.strategies.combinations import bfs_order, dfs_order, all_subsets
 
 
-def generate_tasks(instances: List[str], strategy: str, max_comb_size: int | None) -> None:
+def _dump_array(items: Iterable[Dict], out) -> None:
+    # same text as json.dump(list(items), out, ensure_ascii=False, indent=2),
+    # written one item at a time
+    first = True
+    for item in items:
+        out.write('[\n  ' if first else ',\n  ')
+        out.write(json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+        first = False
+    out.write('[]' if first else '\n]')
+
+
+def generate_tasks(instances: List[str], strategy: str, max_comb_size: int | None, shards: int | None = None) -> None:
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     instances_parent = os.path.join(base_dir, 'TestInstances')
     tasks_dir = os.path.join(base_dir, 'tasks')
@@ -16,19 +28,26 @@ def generate_tasks(instances: List[str], strategy: str, max_comb_size: int | Non
 
     def gen(keys: List[str]):
         if strategy == 'bfs':
-            return bfs_order(keys)
+            return bfs_order(keys, max_size=max_comb_size)
         if strategy == 'dfs':
-            return dfs_order(keys)
-        return all_subsets(keys)
+            return dfs_order(keys, max_size=max_comb_size)
+        return all_subsets(keys, max_size=max_comb_size)
 
     for name in instances:
         inst_dir = os.path.join(instances_parent, name)
         if not os.path.isdir(inst_dir):
             print(f"Skip {name}: not a directory under TestInstances")
             continue
-        for file in os.listdir(inst_dir):
-            if not file.endswith('.json'):
-                continue
+        writer = None
+        if shards:
+            # one directory per instance folder: manifest.json + shard-i-of-N.jsonl
+            task_dir = os.path.join(tasks_dir, f"{name}_{strategy}")
+            writer = TaskShardWriter(task_dir, shards, {
+                'Instances Dir': os.path.abspath(inst_dir),
+                'Strategy': strategy,
+                'Max Comb Size': max_comb_size,
+            })
+        for file in list_instances(inst_dir):
             json_path = os.path.join(inst_dir, file)
             result = read_instance(json_path)
             if result is None:
@@ -36,22 +55,28 @@ def generate_tasks(instances: List[str], strategy: str, max_comb_size: int | Non
                 continue
             _, machines_info, bins_info = result
             keys = list(bins_info.keys())
-            task_path = os.path.join(tasks_dir, f"{os.path.splitext(file)[0]}_{strategy}.json")
-            tasks = []
-            for machine_id, L, W in machines_info:
-                for combo in gen(keys):
-                    if max_comb_size is not None and len(combo) > max_comb_size:
-                        continue
-                    tasks.append({
-                        'instance': file,
-                        'machine_id': machine_id,
-                        'L': L,
-                        'W': W,
-                        'combination': combo
-                    })
+            tasks = (
+                {
+                    'instance': file,
+                    'machine_id': machine_id,
+                    'L': L,
+                    'W': W,
+                    'combination': combo
+                }
+                for machine_id, L, W in machines_info
+                for combo in gen(keys)
+            )
+            if writer is not None:
+                for task in tasks:
+                    writer.write(task)
+                continue
+            task_path = os.path.join(tasks_dir, f"{instance_name(file)}_{strategy}.json")
             with open(task_path, 'w') as out:
-                json.dump(tasks, out, ensure_ascii=False, indent=2)
+                _dump_array(tasks, out)
             print(f"Wrote tasks: {task_path}")
+        if writer is not None:
+            writer.close()
+            print(f"Wrote {sum(writer.counts)} tasks in {shards} shards: {writer.task_dir}")
 
 
 def main():
@@ -59,9 +84,11 @@ def main():
     parser.add_argument('--strategy', choices=['bfs', 'dfs', 'all'], default='bfs')
     parser.add_argument('--instances', nargs='+', required=True, help='Subfolders under TestInstances (e.g., n15 n20)')
     parser.add_argument('--max-comb-size', type=int, default=None, help='Optional: limit maximum combination size (e.g., 5)')
+    parser.add_argument('--shards', type=int, default=None,
+                        help='Write line-delimited task shards (one directory per instance folder) for main.py worker')
     args = parser.parse_args()
 
-    generate_tasks(args.instances, args.strategy, args.max_comb_size)
+    generate_tasks(args.instances, args.strategy, args.max_comb_size, args.shards)
 
 
 if __name__ == '__main__':
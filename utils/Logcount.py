@@ -2,7 +2,7 @@ import logging
 import os
 
 
-def log_run(log_path='log/', code_name='test'):
+def log_run(log_path='log/', code_name='test', resume=None):
     # Configure the logger
     log_path = log_path + code_name
     log_name = code_name + '.log'
@@ -14,6 +14,12 @@ def log_run(log_path='log/', code_name='test'):
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     """Logs the total number of code executions, timestamp, and returns the total run count."""
+    # Continue an earlier run: keep its number and leave the count alone
+    if resume is not None:
+        logging.info(f"{resume} (resumed)")
+        print(resume)
+        return resume
+
     # Check if a file to keep track of the run count exists
     count_file = os.path.join(log_path, "run_count.txt")
 
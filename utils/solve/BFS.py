@@ -6,7 +6,7 @@ from utils.Logcount import log_run
 
 def main():
     parser = argparse.ArgumentParser(description='BFS feasibility checker')
-    parser.add_argument('--solver', choices=['grid', 'interval', 'disjunctive'], default='grid')
+    parser.add_argument('--solver', choices=['grid', 'grid-compact', 'interval', 'disjunctive'], default='grid')
     parser.add_argument('--instances', default='n15', help='TestInstances subfolder name (e.g., n15, n20)')
     args = parser.parse_args()
 
@@ -6,7 +6,7 @@ from utils.Logcount import log_run
 
 def main():
     parser = argparse.ArgumentParser(description='DFS feasibility checker')
-    parser.add_argument('--solver', choices=['grid', 'interval', 'disjunctive'], default='grid')
+    parser.add_argument('--solver', choices=['grid', 'grid-compact', 'interval', 'disjunctive'], default='grid')
     parser.add_argument('--instances', default='10', help='TestInstances subfolder name (e.g., 10, n15, n20)')
     args = parser.parse_args()
 
@@ -5,7 +5,7 @@ from utils.Logcount import log_run
 
 def main():
     parser = argparse.ArgumentParser(description='Repetition feasibility checker')
-    parser.add_argument('--solver', choices=['grid', 'interval', 'disjunctive'], default='grid')
+    parser.add_argument('--solver', choices=['grid', 'grid-compact', 'interval', 'disjunctive'], default='grid')
     parser.add_argument('--instances', nargs='+', default=['10', '15', 'inst', '20'])
     args = parser.parse_args()
 